@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from asyncio import get_running_loop
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Type, cast
 
@@ -11,6 +13,9 @@ from ipv8.overlay import Overlay, SettingsClass
 from ipv8.peerdiscovery.discovery import DiscoveryStrategy, RandomWalk
 from ipv8.taskmanager import TaskManager
 
+from tribler.core.database.executor import Priority
+from tribler.core.database.store import AUTO_COMPLETE_UPDATE_INTERVAL, WAL_CHECKPOINT_INTERVAL
+
 if TYPE_CHECKING:
     from ipv8.bootstrapping.bootstrapper_interface import Bootstrapper
     from ipv8.peer import Peer
@@ -118,6 +123,7 @@ class ContentDiscoveryComponent(BaseLauncher):
         When we are done launching, register our REST API.
         """
         session.rest_manager.get_endpoint("/api/search").content_discovery_community = community
+        session.rest_manager.get_endpoint("/api/statistics").content_discovery_community = community
 
     def get_endpoints(self) -> list[RESTEndpoint]:
         """
@@ -153,7 +159,8 @@ class DatabaseComponent(ComponentLauncher):
             mds_path,
             session.ipv8.keys["anonymous id"].key,
             notifier=session.notifier,
-            disable_sync=False
+            disable_sync=False,
+            wal_mode=session.config.get("database/wal_mode")
         )
         session.notifier.add(Notification.torrent_metadata_added, session.mds.TorrentMetadata.add_ffa_from_dict)
 
@@ -161,6 +168,21 @@ class DatabaseComponent(ComponentLauncher):
         """
         When we are done launching, register our REST API.
         """
+        community.register_task("Fill knowledge subject index", get_running_loop().run_in_executor, None,
+                                session.db.knowledge.fill_subject_index)
+        community.register_task("Fill auto-complete index",
+                                partial(session.mds.run_threaded_readonly, priority=Priority.INGESTION),
+                                session.mds.fill_auto_complete_index)
+        community.register_task("Update auto-complete weights",
+                                partial(session.mds.run_threaded_readonly, priority=Priority.INGESTION),
+                                session.mds.update_auto_complete_weights,
+                                interval=AUTO_COMPLETE_UPDATE_INTERVAL, delay=AUTO_COMPLETE_UPDATE_INTERVAL)
+        if session.mds.wal_mode:
+            community.register_task("Checkpoint metadata WAL",
+                                    partial(session.mds.run_threaded, priority=Priority.INGESTION),
+                                    session.mds.checkpoint,
+                                    interval=WAL_CHECKPOINT_INTERVAL, delay=WAL_CHECKPOINT_INTERVAL)
+
         session.rest_manager.get_endpoint("/api/downloads").mds = session.mds
         session.rest_manager.get_endpoint("/api/statistics").mds = session.mds
 
@@ -266,6 +288,7 @@ class TorrentCheckerComponent(ComponentLauncher):
         """
         community.register_task("Start torrent checker", session.torrent_checker.initialize)
         session.rest_manager.get_endpoint("/api/metadata").torrent_checker = session.torrent_checker
+        session.rest_manager.get_endpoint("/api/statistics").torrent_checker = session.torrent_checker
 
 
 @set_in_session("dht_discovery_community")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from binascii import hexlify
 from typing import TYPE_CHECKING, Callable
 
@@ -32,6 +33,7 @@ class SelectRequest(RandomNumberCache):
         self.packets_limit = 10
 
         self.peer = peer
+        self.sent_at = time.time()
         # Indicate if at least a single packet was returned by the queried peer.
         self.peer_responded = False
 
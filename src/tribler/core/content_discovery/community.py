@@ -4,7 +4,6 @@ import json
 import random
 import sys
 import time
-import uuid
 from binascii import hexlify, unhexlify
 from itertools import count
 from typing import TYPE_CHECKING, Any, Callable, Sequence
@@ -23,20 +22,29 @@ from tribler.core.content_discovery.payload import (
     VersionRequest,
     VersionResponse,
 )
+from tribler.core.content_discovery.response_cache import DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL, ResponseCache
+from tribler.core.content_discovery.scheduler import QueryScheduler, estimate_cost
+from tribler.core.content_discovery.search import RemoteSearch
+from tribler.core.database.executor import Priority
 from tribler.core.database.layers.knowledge import ResourceType
 from tribler.core.database.orm_bindings.torrent_metadata import LZ4_EMPTY_ARCHIVE, entries_to_chunk
-from tribler.core.database.store import MetadataStore, ObjState, ProcessingResult
 from tribler.core.knowledge.community import is_valid_resource
 from tribler.core.notifier import Notification, Notifier
 from tribler.core.torrent_checker.dataclasses import HealthInfo
 
 if TYPE_CHECKING:
+    import uuid
+
     from ipv8.types import Peer
 
     from tribler.core.database.orm_bindings.torrent_metadata import TorrentMetadata
+    from tribler.core.database.store import MetadataStore, ProcessingResult
     from tribler.core.database.tribler_database import TriblerDatabase
     from tribler.core.torrent_checker.torrent_checker import TorrentChecker
 
+DEFAULT_PEER_LATENCY = 1.0  # seconds, the assumed response time of peers that we have not queried yet
+MAX_PEER_LATENCIES = 1000  # The number of peers to remember the response time of
+
 
 class ContentDiscoverySettings(CommunitySettings):
     """
@@ -46,8 +54,18 @@ class ContentDiscoverySettings(CommunitySettings):
     random_torrent_interval: float = 5  # seconds
     random_torrent_count: int = 10
     max_query_peers: int = 20
+    search_wave_size: int = 5  # The number of peers that are queried at once during a remote search
+    search_wave_interval: float = 0.5  # seconds, the time after which more peers are queried if we need more results
+    max_search_results: int = 200  # The number of results after which a remote search stops querying peers
     maximum_payload_size: int = 1300
     max_response_size: int = 100  # Max number of entries returned by SQL query
+    query_rate: float = 10  # The query cost that every peer may spend per second, see scheduler.estimate_cost
+    query_burst: float = 50  # The query cost that every peer may spend at once
+    max_concurrent_queries: int = 2
+    max_queued_queries: int = 32
+    max_query_wait: float = 5  # seconds, queued queries are dropped afterwards
+    response_cache_size: int = DEFAULT_CACHE_SIZE  # Max number of remote select responses to keep compressed
+    response_cache_ttl: float = DEFAULT_CACHE_TTL  # seconds
 
     binary_fields: Sequence[str] = ("infohash", "channel_pk")
     deprecated_parameters: Sequence[str] = ("subscribed", "attribute_ranges", "complete_channel")
@@ -84,8 +102,14 @@ class ContentDiscoveryCommunity(Community):
         self.deprecated_message_names[209] = "RemoteSelectPayloadEva"
 
         self.request_cache = RequestCache()
-
-        self.remote_queries_in_progress = 0
+        self.response_cache = ResponseCache(size=self.composition.response_cache_size,
+                                            ttl=self.composition.response_cache_ttl)
+
+        self.query_scheduler = QueryScheduler(rate=self.composition.query_rate, burst=self.composition.query_burst,
+                                              max_concurrent=self.composition.max_concurrent_queries,
+                                              max_queued=self.composition.max_queued_queries,
+                                              max_wait=self.composition.max_query_wait)
+        self.peer_latencies: dict[bytes, float] = {}  # The average response time of peers, by their mid
         self.next_remote_query_num = count().__next__  # generator of sequential numbers, for logging & debug purposes
 
         self.logger.info("Content Discovery Community initialized (peer mid %s)", hexlify(self.my_peer.mid))
@@ -177,24 +201,19 @@ class ContentDiscoveryCommunity(Community):
         health_list = [HealthInfo(infohash, last_check=last_check, seeders=seeders, leechers=leechers)
                        for infohash, seeders, leechers, last_check in health_tuples]
 
-        for health_info in health_list:
-            # Get a single result per infohash to avoid duplicates
-            with db_session:
-                self.composition.metadata_store.process_torrent_health(health_info)
-            infohash = hexlify(health_info.infohash).decode()
-            self.send_remote_select(peer=peer, infohash=infohash, last=1)
+        for infohash in sorted(self.process_torrents_health(health_list)):
+            # Get a single result per infohash to avoid duplicates. Older peers do not understand infohash sets, so
+            # every unknown torrent is resolved with a select of its own.
+            self.send_remote_select(peer=peer, infohash=hexlify(infohash).decode(), last=1)
 
     @db_session
     def process_torrents_health(self, health_list: list[HealthInfo]) -> set[bytes]:
         """
-        Get the infohashes that we did not know about before from the given health list.
+        Store the given health list in a single transaction and get the infohashes that we have no metadata for.
         """
-        infohashes_to_resolve = set()
-        for health in health_list:
-            added = self.composition.metadata_store.process_torrent_health(health)
-            if added:
-                infohashes_to_resolve.add(health.infohash)
-        return infohashes_to_resolve
+        metadata_store = self.composition.metadata_store
+        metadata_store.process_torrent_health_batch(health_list)
+        return metadata_store.get_unknown_infohashes({health.infohash for health in health_list})
 
     @lazy_wrapper(PopularTorrentsRequest)
     async def on_popular_torrents_request(self, peer: Peer, payload: PopularTorrentsRequest) -> None:
@@ -223,31 +242,66 @@ class ContentDiscoveryCommunity(Community):
         all_peers = self.get_peers()
         return random.sample(all_peers, min(sample_size or len(all_peers), len(all_peers)))
 
+    def get_search_peers(self, sample_size: int) -> list[Peer]:
+        """
+        Sample peers to search, preferring the peers that answered our previous queries the fastest.
+
+        Peers that we have not queried before are ranked as if they have the default latency.
+        """
+        peers = self.get_random_peers()
+        peers.sort(key=lambda peer: self.peer_latencies.get(peer.mid, DEFAULT_PEER_LATENCY))
+        return peers[:sample_size]
+
     def send_search_request(self, **kwargs) -> tuple[uuid.UUID, list[Peer]]:
         """
-        Send a remote query request to multiple random peers to search for some terms.
+        Send a remote query request to multiple peers to search for some terms.
+
+        The peers are queried in waves: if the first peers do not give us enough results, more peers are queried.
+        The new results are reported as soon as they arrive.
+
+        :return: the search id and the peers of the first wave.
         """
-        request_uuid = uuid.uuid4()
+        search = RemoteSearch(kwargs, self.composition.max_search_results)
 
         def notify_gui(request: SelectRequest, processing_results: list[ProcessingResult]) -> None:
-            results = [
-                r.md_obj.to_simple_dict()
-                for r in processing_results
-                if r.obj_state == ObjState.NEW_OBJECT
-            ]
+            results = search.add_results(processing_results)
+            if search.finished:
+                self.stop_search(search)
             if self.composition.notifier:
                 self.composition.notifier.notify(Notification.remote_query_results,
                                                  query=kwargs.get("txt_filter"),
                                                  results=results,
-                                                 uuid=str(request_uuid),
+                                                 uuid=str(search.uuid),
                                                  peer=hexlify(request.peer.mid).decode())
 
-        peers_to_query = self.get_random_peers(self.composition.max_query_peers)
+        peers_to_query = self.get_search_peers(self.composition.max_query_peers)
+        self.extend_search(search, peers_to_query, notify_gui)
+        return search.uuid, search.peers
 
-        for p in peers_to_query:
-            self.send_remote_select(p, **kwargs, processing_callback=notify_gui)
+    def extend_search(self, search: RemoteSearch, peers: list[Peer],
+                      processing_callback: Callable[[SelectRequest, list[ProcessingResult]], None]) -> None:
+        """
+        Query the next wave of peers for the given search, unless it already has enough results.
+        """
+        if search.finished:
+            return
+        wave_size = self.composition.search_wave_size
+        for peer in peers[:wave_size]:
+            search.add_request(self.send_remote_select(peer, **search.request_kwargs,
+                                                       processing_callback=processing_callback))
+        search.waves += 1
+        if peers[wave_size:]:
+            # The next wave is registered from the task of the current wave, so every wave needs a name of its own
+            self.register_task(f"Extend search {search.uuid} wave {search.waves}", self.extend_search, search,
+                               peers[wave_size:], processing_callback, delay=self.composition.search_wave_interval)
 
-        return request_uuid, peers_to_query
+    def stop_search(self, search: RemoteSearch) -> None:
+        """
+        Stop waiting for the responses to the given search.
+        """
+        for request in search.requests:
+            if self.request_cache.has(request.prefix, request.number):
+                self.request_cache.pop(request.prefix, request.number)
 
     @lazy_wrapper(VersionRequest)
     async def on_version_request(self, peer: Peer, _: VersionRequest) -> None:
@@ -276,31 +330,27 @@ class ContentDiscoveryCommunity(Community):
         self.ez_send(peer, RemoteSelectPayload(request.number, self.convert_to_json(kwargs).encode()))
         return request
 
-    def should_limit_rate_for_query(self, sanitized_parameters: dict[str, Any]) -> bool:
+    async def process_rpc_query_rate_limited(self, peer: Peer, sanitized_parameters: dict[str, Any]) -> list:
         """
-        Don't allow too many queries with potentially heavy database load.
-        """
-        return "txt_filter" in sanitized_parameters
-
-    async def process_rpc_query_rate_limited(self, sanitized_parameters: dict[str, Any]) -> list:
-        """
-        Process the given query and return results.
+        Process the given query of the given peer and return results, if the query scheduler admits it.
         """
         query_num = self.next_remote_query_num()
-        if self.remote_queries_in_progress and self.should_limit_rate_for_query(sanitized_parameters):
-            self.logger.warning("Ignore remote query %d as another one is already processing. The ignored query: %s",
-                                query_num, sanitized_parameters)
-            return []
 
-        self.logger.info("Process remote query %d: %s", query_num, sanitized_parameters)
-        self.remote_queries_in_progress += 1
-        t = time.time()
-        try:
-            return await self.process_rpc_query(sanitized_parameters)
-        finally:
-            self.remote_queries_in_progress -= 1
-            self.logger.info("Remote query %d processed in %f seconds: %s",
-                             query_num, time.time() - t, sanitized_parameters)
+        async def process() -> list:
+            self.logger.info("Process remote query %d: %s", query_num, sanitized_parameters)
+            t = time.time()
+            try:
+                return await self.process_rpc_query(sanitized_parameters)
+            finally:
+                self.logger.info("Remote query %d processed in %f seconds: %s",
+                                 query_num, time.time() - t, sanitized_parameters)
+
+        results = await self.query_scheduler.run(peer.mid, estimate_cost(sanitized_parameters), process)
+        if results is None:
+            self.logger.warning("Ignore remote query %d as the peer is querying too much or we are too busy. "
+                                "The ignored query: %s", query_num, sanitized_parameters)
+            return []
+        return results
 
     async def process_rpc_query(self, sanitized_parameters: dict[str, Any]) -> list:
         """
@@ -321,7 +371,8 @@ class ContentDiscoveryCommunity(Community):
             # exclude_deleted should be extracted because `get_entries_threaded` doesn't expect it as a parameter
             sanitized_parameters.pop("exclude_deleted", None)
 
-        return await self.composition.metadata_store.get_entries_threaded(**sanitized_parameters)
+        return await self.composition.metadata_store.get_entries_threaded(priority=Priority.REMOTE,
+                                                                          **sanitized_parameters)
 
     @db_session
     def search_for_tags(self, tags: list[str] | None) -> set[str] | None:
@@ -338,21 +389,28 @@ class ContentDiscoveryCommunity(Community):
             case_sensitive=False
         )
 
-    def send_db_results(self, peer: Peer, request_payload_id: int, db_results: list[TorrentMetadata]) -> None:
+    def get_response_chunks(self, db_results: list[TorrentMetadata]) -> list[bytes]:
         """
-        Send the given results to the given peer.
+        Compress the given results into chunks that each fit into a single response.
         """
         # Special case of empty results list - sending empty lz4 archive
         if len(db_results) == 0:
-            self.ez_send(peer, SelectResponsePayload(request_payload_id, LZ4_EMPTY_ARCHIVE))
-            return
+            return [LZ4_EMPTY_ARCHIVE]
 
+        chunks = []
         index = 0
         while index < len(db_results):
             transfer_size = self.composition.maximum_payload_size
             data, index = entries_to_chunk(db_results, transfer_size, start_index=index, include_health=True)
-            payload = SelectResponsePayload(request_payload_id, data)
-            self.ez_send(peer, payload)
+            chunks.append(data)
+        return chunks
+
+    def send_chunks(self, peer: Peer, request_payload_id: int, chunks: list[bytes]) -> None:
+        """
+        Send the given response chunks to the given peer.
+        """
+        for data in chunks:
+            self.ez_send(peer, SelectResponsePayload(request_payload_id, data))
 
     @lazy_wrapper(RemoteSelectPayload)
     async def on_remote_select(self, peer: Peer, request_payload: RemoteSelectPayload) -> None:
@@ -366,9 +424,18 @@ class ContentDiscoveryCommunity(Community):
                 self.logger.warning("Remote select with deprecated parameters: %s", str(sanitized_parameters))
                 self.ez_send(peer, SelectResponsePayload(request_payload.id, LZ4_EMPTY_ARCHIVE))
                 return
-            db_results = await self.process_rpc_query_rate_limited(sanitized_parameters)
-
-            self.send_db_results(peer, request_payload.id, db_results)
+            # Identical queries are answered from the cache, as long as no entries were added in the meantime
+            watermark = self.composition.metadata_store.get_watermark()
+            chunks = self.response_cache.get(sanitized_parameters, watermark)
+            if chunks is None:
+                # The query parameters are modified while processing, so we keep the original ones for the cache
+                db_results = await self.process_rpc_query_rate_limited(peer, dict(sanitized_parameters))
+                chunks = self.get_response_chunks(db_results)
+                # Empty results are not cached, as they are also given for queries that were ignored
+                if db_results:
+                    self.response_cache.put(sanitized_parameters, watermark, chunks)
+
+            self.send_chunks(peer, request_payload.id, chunks)
         except (OperationalError, TypeError, ValueError) as error:
             self.logger.exception("Remote select error: %s. Request content: %s",
                                   str(error), repr(request_payload.json))
@@ -399,6 +466,13 @@ class ContentDiscoveryCommunity(Community):
         else:
             self.request_cache.pop(hexlify(peer.mid).decode(), response_payload.id)
 
+        # Remember that at least a single packet was received from the queried peer.
+        if isinstance(request, SelectRequest):
+            if not request.peer_responded:
+                # The latency is taken on arrival, as the time it takes to process the response is our own
+                self.update_peer_latency(peer, time.time() - request.sent_at)
+            request.peer_responded = True
+
         processing_results = await self.composition.metadata_store.process_compressed_mdblob_threaded(
             response_payload.raw_blob
         )
@@ -407,12 +481,18 @@ class ContentDiscoveryCommunity(Community):
         if isinstance(request, SelectRequest) and request.processing_callback:
             request.processing_callback(request, processing_results)
 
-        # Remember that at least a single packet was received from the queried peer.
-        if isinstance(request, SelectRequest):
-            request.peer_responded = True
-
         return processing_results
 
+    def update_peer_latency(self, peer: Peer, latency: float) -> None:
+        """
+        Update the moving average of the time that a peer takes to answer our queries.
+        """
+        average = self.peer_latencies.pop(peer.mid, None)
+        self.peer_latencies[peer.mid] = latency if average is None else (average + latency) / 2
+        if len(self.peer_latencies) > MAX_PEER_LATENCIES:
+            # Forget about the peer that we have not heard from for the longest time
+            self.peer_latencies.pop(next(iter(self.peer_latencies)))
+
     def _on_query_timeout(self, request_cache: SelectRequest) -> None:
         """
         Remove a peer if it failed to respond to our select request.
@@ -425,6 +505,7 @@ class ContentDiscoveryCommunity(Community):
                 str(request_cache.request_kwargs),
             )
             self.network.remove_peer(request_cache.peer)
+            self.peer_latencies.pop(request_cache.peer.mid, None)
 
     def send_ping(self, peer: Peer) -> None:
         """
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_CACHE_SIZE = 64  # The number of distinct queries to remember
+DEFAULT_CACHE_BYTES = 4 * 1024 * 1024  # The total size of the cached chunks
+DEFAULT_CACHE_TTL = 30  # seconds, this bounds how outdated the health info in a cached response can be
+
+
+@dataclass
+class CachedResponse:
+    """
+    The compressed chunks of a response and the database state they were created for.
+    """
+
+    watermark: int
+    created: float
+    chunks: list[bytes]
+
+    @property
+    def size(self) -> int:
+        """
+        The total size of the chunks of this response.
+        """
+        return sum(len(chunk) for chunk in self.chunks)
+
+
+class ResponseCache:
+    """
+    An LRU cache of ready-to-send remote select response chunks, keyed on the sanitized query parameters.
+
+    Cached responses are invalidated when new entries are added to the database (the database watermark changes) or
+    when they are older than the time-to-live. The least recently used responses are evicted when the cache holds too
+    many responses or too many bytes.
+    """
+
+    def __init__(self, size: int = DEFAULT_CACHE_SIZE, max_bytes: int = DEFAULT_CACHE_BYTES,
+                 ttl: float = DEFAULT_CACHE_TTL) -> None:
+        """
+        Create a new cache for, at most, the given number of responses and bytes.
+        """
+        self.size = size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.responses: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(parameters: dict[str, Any]) -> str:
+        """
+        Convert the given query parameters to a hashable key.
+
+        The parameters come from other peers and may contain (nested) unhashable values, so we use their representation.
+        The representation of a set depends on its iteration order, so sets are sorted first.
+        """
+        return repr(sorted((name, sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value)
+                           for name, value in parameters.items()))
+
+    def get(self, parameters: dict[str, Any], watermark: int) -> list[bytes] | None:
+        """
+        Get the response chunks for the given query parameters, if they are cached and still valid.
+        """
+        key = self.make_key(parameters)
+        response = self.responses.get(key)
+        if response is None or response.watermark != watermark or time.time() - response.created > self.ttl:
+            if response is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self.responses.move_to_end(key)
+        self.hits += 1
+        return response.chunks
+
+    def put(self, parameters: dict[str, Any], watermark: int, chunks: list[bytes]) -> None:
+        """
+        Store the response chunks for the given query parameters.
+        """
+        response = CachedResponse(watermark, time.time(), chunks)
+        if response.size > self.max_bytes:
+            return
+        key = self.make_key(parameters)
+        if key in self.responses:
+            self._remove(key)
+        self.responses[key] = response
+        self.bytes += response.size
+        while len(self.responses) > self.size or self.bytes > self.max_bytes:
+            self._remove(next(iter(self.responses)))
+
+    def _remove(self, key: str) -> None:
+        """
+        Remove the response for the given key.
+        """
+        self.bytes -= self.responses.pop(key).size
+
+    def get_statistics(self) -> dict[str, int | float]:
+        """
+        Get the hit and miss counters of this cache.
+        """
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self.responses), "bytes": self.bytes}
@@ -84,6 +84,8 @@ class SearchEndpoint(RESTEndpoint):
             query += f" {t_filter}"
         fts = to_fts_query(query)
         sanitized["txt_filter"] = fts
+        # Continuation tokens refer to our own database, they are meaningless to other peers
+        sanitized.pop("continuation_token", None)
         self._logger.info("Parameters: %s", str(sanitized))
         self._logger.info("FTS: %s", fts)
 
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import time
+from asyncio import CancelledError, Future, get_running_loop
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+from tribler.core.token_bucket import TokenBucket
+
+T = TypeVar("T")
+
+COST_FTS = 10.0  # Full-text searches rank up to a thousand candidates
+COST_TAGS = 5.0  # Tag intersections query the knowledge database first
+COST_INFOHASH = 1.0  # Infohash lookups use an index
+COST_INFOHASH_SET_ITEM = 0.1  # Every additional infohash of an infohash set
+COST_DEFAULT = 3.0  # Other queries, e.g., browsing by sort order
+
+MAX_BUCKETS = 1000  # Idle token buckets are forgotten once this many peers are tracked
+
+
+def estimate_cost(parameters: dict[str, Any]) -> float:
+    """
+    Estimate the database load of a sanitized remote query, by its shape.
+    """
+    cost = 0.0
+    if parameters.get("txt_filter"):
+        cost += COST_FTS
+    if parameters.get("tags"):
+        cost += COST_TAGS
+    if parameters.get("infohash_set"):
+        cost += COST_INFOHASH + COST_INFOHASH_SET_ITEM * len(parameters["infohash_set"])
+    if parameters.get("infohash"):
+        cost += COST_INFOHASH
+    return cost or COST_DEFAULT
+
+
+@dataclass
+class QueuedQuery:
+    """
+    A query that waits for one of the execution slots.
+    """
+
+    future: Future[bool]
+    deadline: float
+
+
+class QueryScheduler:
+    """
+    Admission control for incoming remote queries.
+
+    Every peer has a token bucket, from which the estimated cost of its queries is taken: peers that query too much
+    have their queries rejected. Admitted queries run in a limited number of slots. If all slots are taken, the queries
+    wait in a bounded queue in which peers are served round-robin, so a single peer cannot monopolize the queue.
+    Queries that waited longer than the maximum wait time are shed, as the querying peer has likely given up on them.
+    """
+
+    def __init__(self, rate: float, burst: float, max_concurrent: int, max_queued: int, max_wait: float) -> None:
+        """
+        Create a new scheduler.
+
+        :param rate: the number of cost units that every peer earns per second.
+        :param burst: the maximum number of cost units that a peer can save up.
+        :param max_concurrent: the number of queries that can be processed at the same time.
+        :param max_queued: the number of queries that can wait for processing.
+        :param max_wait: the time in seconds after which waiting queries are shed.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.max_wait = max_wait
+
+        self.buckets: dict[bytes, TokenBucket] = {}
+        self.queues: OrderedDict[bytes, deque[QueuedQuery]] = OrderedDict()
+        self.queued = 0
+        self.running = 0
+
+        self.processed = 0
+        self.rejected_rate = 0
+        self.rejected_full = 0
+        self.shed = 0
+        self.total_wait = 0.0
+
+    def get_bucket(self, peer_id: bytes) -> TokenBucket:
+        """
+        Get the token bucket of a peer.
+        """
+        bucket = self.buckets.get(peer_id)
+        if bucket is None:
+            if len(self.buckets) >= MAX_BUCKETS:
+                now = time.time()
+                for other in [other for other, b in self.buckets.items()
+                              if b.tokens + (now - b.updated) * b.rate >= b.burst]:
+                    self.buckets.pop(other)
+            bucket = self.buckets[peer_id] = TokenBucket(self.rate, self.burst, self.burst)
+        return bucket
+
+    async def run(self, peer_id: bytes, cost: float, func: Callable[[], Awaitable[T]]) -> T | None:
+        """
+        Run the given query function for a peer, if it is admitted, and get its result.
+
+        :return: the result of the query or None if the query was rejected or shed.
+        """
+        now = time.time()
+        if not self.get_bucket(peer_id).consume(cost, now):
+            self.rejected_rate += 1
+            return None
+
+        if self.running < self.max_concurrent and not self.queued:
+            self.running += 1
+            return await self._execute(func)
+
+        if self.queued >= self.max_queued:
+            self.rejected_full += 1
+            return None
+
+        query = QueuedQuery(get_running_loop().create_future(), now + self.max_wait)
+        self.queues.setdefault(peer_id, deque()).append(query)
+        self.queued += 1
+        try:
+            if not await query.future:
+                return None
+        except CancelledError:
+            # Give back the slot if it was already handed to us
+            if query.future.done() and not query.future.cancelled() and query.future.result():
+                self.running -= 1
+                self._schedule()
+            raise
+        self.total_wait += time.time() - now
+        return await self._execute(func)
+
+    async def _execute(self, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a query in the slot that was reserved for it.
+        """
+        try:
+            return await func()
+        finally:
+            self.running -= 1
+            self.processed += 1
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """
+        Hand the free slots to the queued queries, taking one query of every peer in turn.
+        """
+        while self.running < self.max_concurrent and self.queued:
+            peer_id, queue = next(iter(self.queues.items()))
+            query = queue.popleft()
+            self.queued -= 1
+            if queue:
+                self.queues.move_to_end(peer_id)
+            else:
+                del self.queues[peer_id]
+
+            if query.future.done():
+                continue
+            if time.time() > query.deadline:
+                self.shed += 1
+                query.future.set_result(False)
+                continue
+            self.running += 1
+            query.future.set_result(True)
+
+    def get_statistics(self) -> dict[str, int | float]:
+        """
+        Get the admission counters and the average time (in seconds) that processed queries waited for a slot.
+        """
+        return {"processed": self.processed, "rejected_rate": self.rejected_rate,
+                "rejected_full": self.rejected_full, "shed": self.shed, "queued": self.queued,
+                "running": self.running,
+                "average_wait": self.total_wait / self.processed if self.processed else 0.0}
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import time
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from tribler.core.database.ranks import torrent_ranks
+from tribler.core.database.store import ObjState
+
+if TYPE_CHECKING:
+    from ipv8.types import Peer
+
+    from tribler.core.content_discovery.cache import SelectRequest
+    from tribler.core.database.store import ProcessingResult
+
+
+class RemoteSearch:
+    """
+    A single search of the content of other peers, of which the results arrive incrementally.
+
+    The peers are queried in waves, until enough results are in. The results of all peers are merged: every torrent
+    is only reported once, and the number of peers that gave it is kept as a measure of its availability.
+    """
+
+    def __init__(self, request_kwargs: dict[str, Any], max_results: int) -> None:
+        """
+        Create a new search for the given query parameters.
+
+        :param request_kwargs: the query parameters that are sent to the peers.
+        :param max_results: the number of results after which no more peers are queried.
+        """
+        self.uuid = uuid.uuid4()
+        self.request_kwargs = request_kwargs
+        self.max_results = max_results
+
+        self.waves = 0
+        self.peers: list[Peer] = []
+        self.requests: list[SelectRequest] = []
+        self.sources: dict[bytes, int] = {}
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether we have enough results.
+        """
+        return len(self.sources) >= self.max_results
+
+    def add_request(self, request: SelectRequest) -> None:
+        """
+        Register a select request that was sent for this search.
+        """
+        self.peers.append(request.peer)
+        self.requests.append(request)
+
+    def add_results(self, processing_results: list[ProcessingResult]) -> list[dict]:
+        """
+        Merge the results of a single response and get the new torrents, best ranked first.
+        """
+        new_entries = []
+        for result in processing_results:
+            infohash = result.md_obj.infohash
+            if infohash in self.sources:
+                self.sources[infohash] += 1
+            elif result.obj_state == ObjState.NEW_OBJECT:
+                self.sources[infohash] = 1
+                new_entries.append(result.md_obj.to_simple_dict())
+
+        now = time.time()
+        ranks = torrent_ranks(self.request_kwargs.get("txt_filter") or "",
+                              [(entry["name"], entry["num_seeders"], entry["num_leechers"], now - entry["created"])
+                               for entry in new_entries])
+        return [entry for _, entry in sorted(zip(ranks, new_entries), key=lambda pair: pair[0], reverse=True)]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from bisect import insort
+from typing import Iterable
+
+MAX_TERM_WORDS = 2  # Terms are single title words and pairs of consecutive title words
+MAX_TERM_LENGTH = 64  # Longer terms are not useful as suggestions
+MAX_TERMS = 1_000_000  # Once the index holds this many terms, the terms with the lowest weights are evicted
+EVICTION_FRACTION = 0.1  # The fraction of the terms that is (at least) evicted when the index is full
+TOP_PREFIX_LENGTH = 3  # Prefixes up to this length keep a precomputed list of their best terms
+TOP_SIZE = 16  # The number of best terms that is kept for every short prefix
+BUCKET_PREFIX_LENGTH = TOP_PREFIX_LENGTH + 1  # Longer terms are grouped by their prefix of this length
+
+
+class AutoCompleteIndex:
+    """
+    An in-memory index of title terms for auto-completion, weighted by the seeders of the titles they appear in.
+
+    The index is updated incrementally when titles are added and when the seeders of a title change. Short prefixes
+    keep a list of their best terms, which is exact as long as weights increase. When a weight decreases, the term
+    keeps its place until other terms gain weight. Longer prefixes are looked up in a bucket of the terms that share
+    their first few characters, which only has to consider the (few) terms in that bucket.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a new empty index.
+        """
+        self.weights: dict[str, int] = {}
+        self.buckets: dict[str, list[str]] = {}
+        self.top: dict[str, list[tuple[int, str]]] = {}  # The sort keys of the best terms per short prefix
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_terms(words: list[str]) -> set[str]:
+        """
+        Get the terms of a tokenized title.
+        """
+        return {term for n in range(1, MAX_TERM_WORDS + 1) for i in range(len(words) - n + 1)
+                if len(term := " ".join(words[i:i + n])) <= MAX_TERM_LENGTH}
+
+    def add_words(self, words: list[str], seeders: int = 0) -> None:
+        """
+        Add the words of a tokenized title, see ``ranks.tokenize_title``.
+        """
+        self.change_weight(words, 1 + max(seeders or 0, 0))
+
+    def change_weight(self, words: list[str], delta: int) -> None:
+        """
+        Change the weight of the terms of a tokenized title, e.g., when its number of seeders changed.
+
+        Unknown terms are added if the weight increases.
+        """
+        with self.lock:
+            for term in self.get_terms(words):
+                weight = self.weights.get(term, 0)
+                if weight == 0:
+                    if delta <= 0:
+                        continue
+                    if len(self.weights) >= MAX_TERMS:
+                        self._evict()
+                    if len(term) >= BUCKET_PREFIX_LENGTH:
+                        self.buckets.setdefault(term[:BUCKET_PREFIX_LENGTH], []).append(term)
+                self.weights[term] = max(weight + delta, 1)
+                old_key, new_key = (-weight, term), self._order(term)
+                for length in range(1, min(len(term), TOP_PREFIX_LENGTH) + 1):
+                    self._update_top(term[:length], old_key, new_key)
+
+    def _order(self, term: str) -> tuple[int, str]:
+        """
+        Get the sort key of a term: the highest weight first and, for equal weights, alphabetically.
+        """
+        return -self.weights[term], term
+
+    def _update_top(self, prefix: str, old_key: tuple[int, str], new_key: tuple[int, str]) -> None:
+        """
+        Update the best terms of a prefix after the weight of a term changed.
+
+        :param old_key: the sort key of the term before its weight changed.
+        :param new_key: the sort key of the term after its weight changed.
+        """
+        top = self.top.get(prefix)
+        if top is None:
+            top = self.top[prefix] = []
+        if old_key in top:
+            top.remove(old_key)
+        elif new_key >= old_key or (len(top) >= TOP_SIZE and top[-1] <= new_key):
+            return
+        insort(top, new_key)
+        del top[TOP_SIZE:]
+
+    def _evict(self) -> None:
+        """
+        Remove the terms with the lowest weights, to make room for new terms.
+
+        All terms with a weight up to that of the lowest ``EVICTION_FRACTION`` of the terms are removed, so that the
+        remaining terms all outweigh the removed ones and the best terms of every prefix stay exact.
+        """
+        count = max(int(len(self.weights) * EVICTION_FRACTION), 1)
+        threshold = heapq.nsmallest(count, self.weights.values())[-1]
+        evicted = {term for term, weight in self.weights.items() if weight <= threshold}
+        for term in evicted:
+            del self.weights[term]
+        for prefix in {term[:BUCKET_PREFIX_LENGTH] for term in evicted if len(term) >= BUCKET_PREFIX_LENGTH}:
+            self.buckets[prefix] = [term for term in self.buckets[prefix] if term not in evicted]
+            if not self.buckets[prefix]:
+                del self.buckets[prefix]
+        for prefix in {term[:length] for term in evicted for length in range(1, min(len(term), TOP_PREFIX_LENGTH) + 1)}:
+            self.top[prefix] = [key for key in self.top[prefix] if key[1] not in evicted]
+            if not self.top[prefix]:
+                del self.top[prefix]
+
+    def _iter_terms(self, prefix: str) -> Iterable[str]:
+        """
+        Iterate over all terms that start with the given prefix, which should be longer than ``TOP_PREFIX_LENGTH``.
+        """
+        return (term for term in self.buckets.get(prefix[:BUCKET_PREFIX_LENGTH], []) if term.startswith(prefix))
+
+    def complete(self, prefix: str, max_terms: int) -> list[str]:
+        """
+        Get the terms with the highest weight that start with the given prefix, excluding the prefix itself.
+        """
+        with self.lock:
+            if len(prefix) <= TOP_PREFIX_LENGTH:
+                candidates: Iterable[str] = [term for _, term in self.top.get(prefix, [])]
+            else:
+                candidates = heapq.nsmallest(max_terms + 1, self._iter_terms(prefix), key=self._order)
+            return [term for term in candidates if term != prefix][:max_terms]
+
+    def suggest(self, words: list[str], max_terms: int) -> list[str]:
+        """
+        Get the auto-completions of the given query words.
+
+        The last two words are completed first, so that suggestions follow the titles that the query was taken from.
+        Completions of only the last word are used to fill up the remaining suggestions.
+        """
+        result: list[str] = []
+        for n in range(min(len(words), MAX_TERM_WORDS), 0, -1):
+            head = words[:-n]
+            for term in self.complete(" ".join(words[-n:]), max_terms):
+                suggestion = " ".join([*head, term])
+                if suggestion not in result:
+                    result.append(suggestion)
+            if len(result) >= max_terms:
+                break
+        return result[:max_terms]
+
+    def __len__(self) -> int:
+        """
+        Get the number of terms in the index.
+        """
+        return len(self.weights)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from pony.orm import Database
+
+
+class CommitHooks:
+    """
+    Callbacks that are called once the current transaction of a database is committed.
+
+    Pony has no hook for commits, so the commit and rollback of the database provider are wrapped. The callbacks are
+    kept per session cache, which Pony creates for every transaction of every thread. The callbacks of a transaction
+    that is rolled back are dropped, unless they were added with ``on_rollback``.
+    """
+
+    def __init__(self, db: Database) -> None:
+        """
+        Create new hooks for the given database, which does not have to be bound yet.
+        """
+        self.db = db
+        self.callbacks: WeakKeyDictionary[Any, list[tuple[Callable[[], None], bool]]] = WeakKeyDictionary()
+        self.installed = False
+        self.lock = threading.Lock()
+
+    def add(self, callback: Callable[[], None], on_rollback: bool = False) -> None:
+        """
+        Call the given callback after the current transaction is committed, in the order the callbacks were added.
+
+        :param on_rollback: whether to also call the callback after the current transaction is rolled back, e.g., to
+                            drop cached data that may be based on the changes of the transaction.
+        """
+        self.db.get_connection()  # Without a connection, a rollback does not reach the provider
+        cache = self.db._get_cache()  # noqa: SLF001
+        with self.lock:
+            if not self.installed:
+                self.install()
+            self.callbacks.setdefault(cache, []).append((callback, on_rollback))
+
+    def install(self) -> None:
+        """
+        Wrap the commit and rollback of the database provider.
+        """
+        provider = self.db.provider
+        commit = provider.commit
+        rollback = provider.rollback
+
+        def commit_and_call(connection: Any, cache: Any = None) -> None:  # noqa: ANN401
+            commit(connection, cache)
+            for callback, _ in self.pop(cache):
+                callback()
+
+        def rollback_and_drop(connection: Any, cache: Any = None) -> None:  # noqa: ANN401
+            callbacks = self.pop(cache)
+            rollback(connection, cache)
+            for callback, on_rollback in callbacks:
+                if on_rollback:
+                    callback()
+
+        provider.commit = commit_and_call
+        provider.rollback = rollback_and_drop
+        self.installed = True
+
+    def pop(self, cache: Any) -> list[tuple[Callable[[], None], bool]]:  # noqa: ANN401
+        """
+        Remove and get the callbacks of the given session cache.
+        """
+        if cache is None:
+            return []
+        with self.lock:
+            return self.callbacks.pop(cache, [])
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from enum import IntEnum
+from queue import PriorityQueue
+from typing import Any, Callable
+
+
+class Priority(IntEnum):
+    """
+    The lanes of a priority executor, in order of precedence.
+    """
+
+    INTERACTIVE = 0  # Requests of the local user, e.g., searches
+    REMOTE = 1  # Requests of other peers, e.g., remote selects
+    INGESTION = 2  # Processing of data that we received, e.g., gossip
+
+
+# Workers only stop once all lanes are empty: the stop markers are queued after all calls in the lowest lane
+SHUTDOWN_PRIORITY = max(Priority)
+
+
+class PriorityExecutor:
+    """
+    A size-limited thread pool that runs the queued calls with the highest priority (lowest value) first.
+
+    Calls with the same priority are run in the order in which they were submitted.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str) -> None:
+        """
+        Create a new executor that uses, at most, the given number of threads.
+        """
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self.queue: PriorityQueue[tuple[Priority, int, tuple | None]] = PriorityQueue()
+        self.counter = itertools.count()
+        self.threads: list[threading.Thread] = []
+        self.lock = threading.Lock()
+        self.shutting_down = False
+
+        self.queued = dict.fromkeys(Priority, 0)
+        self.processed = dict.fromkeys(Priority, 0)
+        self.total_wait = dict.fromkeys(Priority, 0.0)
+        self.max_wait = dict.fromkeys(Priority, 0.0)
+
+    def submit(self, priority: Priority, fn: Callable, *args: Any, **kwargs) -> Future:  # noqa: ANN401
+        """
+        Schedule a call in the lane of the given priority.
+
+        :raises RuntimeError: if the executor was shut down.
+        """
+        future: Future = Future()
+        with self.lock:
+            if self.shutting_down:
+                msg = "Cannot schedule new calls after shutdown"
+                raise RuntimeError(msg)
+            self.queued[priority] += 1
+            self.queue.put((priority, next(self.counter), (future, time.time(), fn, args, kwargs)))
+            if len(self.threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, name=f"{self.thread_name_prefix}_{len(self.threads)}",
+                                          daemon=True)
+                self.threads.append(thread)
+                thread.start()
+        return future
+
+    def _work(self) -> None:
+        """
+        Run queued calls until the executor is shut down.
+        """
+        while True:
+            priority, _, item = self.queue.get()
+            if item is None:
+                return
+            future, enqueued_at, fn, args, kwargs = item
+            wait = time.time() - enqueued_at
+            with self.lock:
+                self.queued[priority] -= 1
+                self.processed[priority] += 1
+                self.total_wait[priority] += wait
+                self.max_wait[priority] = max(self.max_wait[priority], wait)
+
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def get_statistics(self) -> dict[str, dict[str, int | float]]:
+        """
+        Get the queue depth, the number of processed calls and the wait times (in seconds) of every lane.
+        """
+        with self.lock:
+            return {priority.name.lower(): {"queued": self.queued[priority],
+                                            "processed": self.processed[priority],
+                                            "average_wait": (self.total_wait[priority] / self.processed[priority]
+                                                             if self.processed[priority] else 0.0),
+                                            "max_wait": self.max_wait[priority]}
+                    for priority in Priority}
+
+    def shutdown(self, cancel_futures: bool = False, wait: bool = True) -> None:
+        """
+        Stop the worker threads, after they have run the queued calls (unless these are cancelled).
+
+        :param cancel_futures: whether to cancel the calls that did not start yet.
+        :param wait: whether to wait until the worker threads have stopped.
+        """
+        with self.lock:
+            self.shutting_down = True
+            if cancel_futures:
+                while not self.queue.empty():
+                    priority, _, item = self.queue.get_nowait()
+                    if item is not None:
+                        self.queued[priority] -= 1
+                        item[0].cancel()
+            for _ in self.threads:
+                self.queue.put((SHUTDOWN_PRIORITY, next(self.counter), None))
+        if wait:
+            for thread in self.threads:
+                if thread is not threading.current_thread():
+                    thread.join()
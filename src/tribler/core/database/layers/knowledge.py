@@ -2,16 +2,21 @@ from __future__ import annotations
 
 import datetime
 import logging
+import random
+from collections import OrderedDict
 from dataclasses import dataclass
 from enum import IntEnum
-from typing import TYPE_CHECKING, Callable, Iterator, List, Set
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator, List, Set
 
 from pony import orm
 from pony.orm import raw_sql
 from pony.orm.core import Database, Entity, Query, select
 from pony.utils import between
 
+from tribler.core.database.commit_hooks import CommitHooks
 from tribler.core.database.layers.layer import EntityImpl, Layer
+from tribler.core.database.subject_index import IndexChange, SubjectIndex
 from tribler.core.knowledge.payload import StatementOperation
 
 CLOCK_START_VALUE = 0
@@ -21,6 +26,12 @@ PUBLIC_KEY_FOR_AUTO_GENERATED_OPERATIONS = b"auto_generated"
 SHOW_THRESHOLD = 1  # how many operation needed for showing a knowledge graph statement in the UI
 HIDE_THRESHOLD = -2  # how many operation needed for hiding a knowledge graph statement in the UI
 
+STATEMENT_CACHE_SIZE = 1024  # how many subjects to keep the simple statements of in memory
+MAX_SUBJECTS_PER_QUERY = 500  # stay well below the SQLite limit on the number of query parameters
+
+SAMPLE_ROUNDS = 5  # how many times to draw random operation ids before giving up on finding enough operations
+SAMPLE_OVERSAMPLING = 4  # how many ids to initially draw per missing operation, doubled in every following round
+
 if TYPE_CHECKING:
     import dataclasses
 
@@ -47,15 +58,20 @@ if TYPE_CHECKING:
         def get_for_update(public_key: bytes) -> Peer | None: ...  # noqa: D102
 
 
+    class IterStatement(type):  # noqa: D101
+
+        def __iter__(cls) -> Iterator[Statement]: ...  # noqa: D105
+
+
     @dataclasses.dataclass
-    class Statement(EntityImpl):
+    class Statement(EntityImpl, metaclass=IterStatement):
         """
         Database type for a statement.
         """
 
         id: int
         subject: Resource
-        object: Resource
+        object: Resource  # noqa: A003
         operations: set[StatementOp]
         added_count: int
         removed_count: int
@@ -83,7 +99,7 @@ if TYPE_CHECKING:
 
         id: int
         name: str
-        type: int
+        type: int  # noqa: A003
         subject_statements: set[Statement]
         object_statements: set[Statement]
         torrent_healths: set[TorrentHealth]
@@ -98,8 +114,13 @@ if TYPE_CHECKING:
         def get_for_update(name: str, type: int) -> Resource | None: ...  # noqa: D102, A002
 
 
+    class IterStatementOp(type):  # noqa: D101
+
+        def __iter__(cls) -> Iterator[StatementOp]: ...  # noqa: D105
+
+
     @dataclasses.dataclass
-    class StatementOp(EntityImpl):
+    class StatementOp(EntityImpl, metaclass=IterStatementOp):
         """
         Database type for a statement operation.
         """
@@ -179,12 +200,19 @@ class KnowledgeDataAccessLayer(Layer):
     A database layer for knowledge.
     """
 
-    def __init__(self, instance: orm.Database) -> None:
+    def __init__(self, instance: orm.Database, statement_cache_size: int = STATEMENT_CACHE_SIZE) -> None:
         """
         Create a new knowledge database layer.
+
+        :param instance: the database to bind to.
+        :param statement_cache_size: the number of subjects to cache the simple statements of, 0 to disable caching.
         """
         self.logger = logging.getLogger(self.__class__.__name__)
         self.instance = instance
+        self.statement_cache_size = statement_cache_size
+        self.statement_cache: OrderedDict[tuple[int, str], list[SimpleStatement]] = OrderedDict()
+        self.subject_index = SubjectIndex()
+        self.commit_hooks = CommitHooks(self.instance)
         self.Peer, self.Statement, self.Resource, self.StatementOp = self.define_binding(self.instance)
 
     @staticmethod
@@ -313,15 +341,77 @@ class KnowledgeDataAccessLayer(Layer):
         statement = self.get_or_create(self.Statement, subject=subject, object=obj)
         op = self.StatementOp.get_for_update(statement=statement, peer=peer)
 
+        return self._apply_operation(operation, signature, peer, statement, op, is_local_peer=is_local_peer,
+                                     is_auto_generated=is_auto_generated, counter_increment=counter_increment) is not None
+
+    def add_operations(self, operations: list[tuple[StatementOperation, bytes]]) -> list[bool]:
+        """
+        Add many remote operations at once.
+
+        Instead of looking up the peer, resources, statement and previous operation of every operation separately, as
+        ``add_operation`` does, all of them are looked up with one query per entity type.
+
+        :param operations: the operations and their signatures, in the order they should be applied.
+        :returns: for every operation, True if it has been added/updated, False otherwise.
+        """
+        public_keys = {operation.creator_public_key for operation, _ in operations}
+        peers = {peer.public_key: peer for peer in self.Peer.select(lambda p: p.public_key in public_keys)}
+        for public_key in public_keys - peers.keys():
+            peers[public_key] = self.Peer(public_key=public_key)
+
+        names = ({operation.subject for operation, _ in operations}
+                 | {operation.object for operation, _ in operations})
+        resources = {(resource.name, resource.type): resource
+                     for resource in select(r for r in self.Resource if r.name in names)}
+        for operation, _ in operations:
+            for key in ((operation.subject, operation.subject_type), (operation.object, operation.predicate)):
+                if key not in resources:
+                    resources[key] = self.Resource(name=key[0], type=key[1])
+
+        subjects = [resources[(operation.subject, operation.subject_type)] for operation, _ in operations]
+        statements = {(statement.subject, statement.object): statement
+                      for statement in self.Statement.select(lambda s: s.subject in subjects)}
+        statement_ops = {(op.statement, op.peer): op
+                         for op in self.StatementOp.select(lambda o: o.statement in statements.values())}
+
+        results = []
+        for operation, signature in operations:
+            self.logger.debug('Add operation. %s "%s" %s',
+                              str(operation.subject), str(operation.predicate), str(operation.object))
+            peer = peers[operation.creator_public_key]
+            key = (resources[(operation.subject, operation.subject_type)],
+                   resources[(operation.object, operation.predicate)])
+            statement = statements.get(key)
+            if statement is None:
+                statement = statements[key] = self.Statement(subject=key[0], object=key[1])
+
+            op = self._apply_operation(operation, signature, peer, statement, statement_ops.get((statement, peer)))
+            if op is not None:
+                statement_ops[(statement, peer)] = op
+            results.append(op is not None)
+        return results
+
+    def _apply_operation(self, operation: StatementOperation, signature: bytes,  # noqa: PLR0913, PLR0917
+                         peer: Peer, statement: Statement, op: StatementOp | None, is_local_peer: bool = False,
+                         is_auto_generated: bool = False, counter_increment: int = 1) -> StatementOp | None:
+        """
+        Apply an operation to its statement, given the previous operation of the same peer on that statement.
+
+        :returns: the inserted or updated operation entity, or None if the operation is older than the previous one.
+        """
+        self._invalidate_simple_statements(operation.subject_type, operation.subject)
+        was_shown = self._show_condition(statement)
+
         if not op:  # then insert
-            self.StatementOp(statement=statement, peer=peer, operation=operation.operation,
-                             clock=operation.clock, signature=signature, auto_generated=is_auto_generated)
+            op = self.StatementOp(statement=statement, peer=peer, operation=operation.operation,
+                                  clock=operation.clock, signature=signature, auto_generated=is_auto_generated)
             statement.update_counter(operation.operation, increment=counter_increment, is_local_peer=is_local_peer)
-            return True
+            self._update_subject_index(statement, was_shown)
+            return op
 
         # if it is a message from the past, then return
         if operation.clock <= op.clock:
-            return False
+            return None
 
         # To prevent endless incrementing of the operation, we apply the following logic:
 
@@ -329,11 +419,55 @@ class KnowledgeDataAccessLayer(Layer):
         statement.update_counter(op.operation, increment=-counter_increment, is_local_peer=is_local_peer)
         # 2. Increment new operation
         statement.update_counter(operation.operation, increment=counter_increment, is_local_peer=is_local_peer)
+        self._update_subject_index(statement, was_shown)
 
         # 3. Update the operation entity
         op.set(operation=operation.operation, clock=operation.clock, signature=signature,
                updated_at=datetime.datetime.utcnow(), auto_generated=is_auto_generated)  # noqa: DTZ003
-        return True
+        return op
+
+    def _invalidate_simple_statements(self, subject_type: int, subject: str) -> None:
+        """
+        Forget the cached simple statements of a subject that is changed by the current transaction.
+
+        They are dropped right away, for the reads of the transaction itself, and again once the transaction is
+        committed or rolled back, for anything that was cached meanwhile.
+        """
+        forget = partial(self.statement_cache.pop, (subject_type, subject), None)
+        forget()
+        self.commit_hooks.add(forget, on_rollback=True)
+
+    def _update_subject_index(self, statement: Statement, was_shown: bool) -> None:
+        """
+        Add a statement to the subject index if it is now shown, or remove it if it is no longer shown.
+
+        The index is only changed once the transaction is committed, so it stays in line with the database if the
+        transaction is rolled back.
+        """
+        is_shown = self._show_condition(statement)
+        if is_shown == was_shown:
+            return
+        if statement.subject.id is None or statement.object.id is None:
+            orm.flush()  # Assign the ids of new resources
+        change = IndexChange(predicate=statement.object.type, name=statement.object.name,
+                             object_id=statement.object.id, subject_id=statement.subject.id, shown=is_shown)
+        self.commit_hooks.add(partial(self.subject_index.update, change))
+
+    def fill_subject_index(self) -> None:
+        """
+        Add all shown statements in the database to the subject index.
+        """
+        with orm.db_session:
+            cursor = self.instance.get_connection().cursor()
+            cursor.execute("""
+                SELECT "obj"."type", "obj"."name", "obj"."id", "s"."subject"
+                FROM "Statement" "s"
+                JOIN "Resource" "obj" ON "obj"."id" = "s"."object"
+                WHERE "s"."local_operation" = ?
+                OR ("s"."local_operation" = 0 OR "s"."local_operation" IS NULL)
+                    AND ("s"."added_count" - "s"."removed_count") >= ?
+            """, (Operation.ADD.value, SHOW_THRESHOLD))
+            self.subject_index.fill(cursor)
 
     def add_auto_generated_operation(self, subject_type: ResourceType, subject: str, predicate: ResourceType,
                                      obj: str) -> bool:
@@ -447,6 +581,65 @@ class KnowledgeDataAccessLayer(Layer):
                                 object=s.object.name)
                 for s in statements]
 
+    def get_simple_statements_for_subjects(self, subject_type: ResourceType,
+                                           subjects: Iterable[str]) -> dict[str, list[SimpleStatement]]:
+        """
+        Get the simple statements of many subjects of the same type at once.
+
+        Unlike ``get_simple_statements``, which queries the statements of each subject separately, the statements of
+        all subjects that are not cached are fetched in a single query. The subject names are matched case-sensitively.
+
+        :param subject_type: the type of all given subjects.
+        :param subjects: the names of the subjects.
+        :returns: a mapping of every given subject name to its statements, highest score first.
+        """
+        statements = {}
+        missing = []
+        for subject in subjects:
+            cached = self.statement_cache.get((subject_type, subject))
+            if cached is None:
+                missing.append(subject)
+            else:
+                self.statement_cache.move_to_end((subject_type, subject))
+                statements[subject] = cached
+
+        for i in range(0, len(missing), MAX_SUBJECTS_PER_QUERY):
+            found = self._select_simple_statements(subject_type, missing[i:i + MAX_SUBJECTS_PER_QUERY])
+            for subject in missing[i:i + MAX_SUBJECTS_PER_QUERY]:
+                statements[subject] = found.get(subject, [])
+                self._cache_simple_statements(subject_type, subject, statements[subject])
+
+        return statements
+
+    def _select_simple_statements(self, subject_type: ResourceType,
+                                  subjects: list[str]) -> dict[str, list[SimpleStatement]]:
+        """
+        Query the shown statements of the given subjects, grouped by subject name and ordered by score.
+        """
+        add_operation = Operation.ADD.value
+        query = select((s.subject.name, s.object.type, s.object.name, s.added_count - s.removed_count)
+                       for s in self.Statement
+                       if s.subject.type == subject_type.value and s.subject.name in subjects
+                       and (s.local_operation == add_operation
+                            or (not s.local_operation and s.added_count - s.removed_count >= SHOW_THRESHOLD)))
+
+        statements: dict[str, list[SimpleStatement]] = {}
+        for subject, predicate, obj, _ in sorted(query, key=lambda row: row[3], reverse=True):
+            statements.setdefault(subject, []).append(SimpleStatement(subject_type=subject_type, subject=subject,
+                                                                      predicate=predicate, object=obj))
+        return statements
+
+    def _cache_simple_statements(self, subject_type: ResourceType, subject: str,
+                                 statements: list[SimpleStatement]) -> None:
+        """
+        Remember the simple statements of a subject, forgetting the least recently used subject if the cache is full.
+        """
+        if self.statement_cache_size <= 0:
+            return
+        self.statement_cache[(subject_type, subject)] = statements
+        if len(self.statement_cache) > self.statement_cache_size:
+            self.statement_cache.popitem(last=False)
+
     def get_suggestions(self, subject_type: ResourceType | None = None, subject: str | None = "",
                         predicate: ResourceType | None = None, case_sensitive: bool = True) -> List[str]:
         """
@@ -474,17 +667,32 @@ class KnowledgeDataAccessLayer(Layer):
                                   case_sensitive: bool = True) -> Set[str]:
         """
         Get all subjects that have a certain predicate.
+
+        If the subject index is filled, the subjects of every object are looked up in memory and intersected.
+        Otherwise, the intersection is queried from the database.
         """
         if not objects:
             return set()
 
+        if self.subject_index.ready and predicate is not None:
+            subject_ids = self.subject_index.intersect(predicate.value, objects, case_sensitive)
+            cursor = self.instance.get_connection().cursor()
+            names: set[str] = set()
+            for i in range(0, len(subject_ids), MAX_SUBJECTS_PER_QUERY):
+                chunk = subject_ids[i:i + MAX_SUBJECTS_PER_QUERY]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f'SELECT "name" FROM "Resource" WHERE "type" = ? AND "id" IN ({placeholders})',  # noqa: S608
+                               (subjects_type.value, *chunk))
+                names.update(name for name, in cursor)
+            return names
+
         if case_sensitive:
             name_condition = '"obj"."name" = $obj_name'
         else:
             name_condition = 'py_lower("obj"."name") = py_lower($obj_name)'
         query = select(r.name for r in self.Resource if r.type == subjects_type.value)
         for obj_name in objects:
-            query = query.filter(raw_sql("""
+            query = query.filter(raw_sql(f"""
     r.id IN (
         SELECT "s"."subject"
         FROM "Statement" "s"
@@ -495,9 +703,9 @@ class KnowledgeDataAccessLayer(Layer):
             AND ("s"."added_count" - "s"."removed_count") >= $SHOW_THRESHOLD
         ) AND "s"."object" IN (
             SELECT "obj"."id" FROM "Resource" "obj"
-            WHERE "obj"."type" = $(predicate.value) AND $name_condition
+            WHERE "obj"."type" = $(predicate.value) AND {name_condition}
         )
-    )"""), globals={"obj_name": obj_name, "name_condition": name_condition, "SHOW_THRESHOLD": SHOW_THRESHOLD})
+    )"""), globals={"obj_name": obj_name, "SHOW_THRESHOLD": SHOW_THRESHOLD})  # noqa: S608
         return set(query)
 
     def get_clock(self, operation: StatementOperation) -> int:
@@ -528,27 +736,42 @@ class KnowledgeDataAccessLayer(Layer):
             count=count
         )
 
+    def _get_max_operation_id(self) -> int:
+        """
+        Get the highest id of all operations, or 0 if there are none.
+        """
+        return select(so.id for so in self.StatementOp).max() or 0
+
     def _get_random_operations_by_condition(self, condition: Callable[[Entity], bool], count: int = 5,
-                                            attempts: int = 100) -> set[Entity]:
+                                            attempts: int = SAMPLE_ROUNDS) -> set[Entity]:
         """
         Get `count` random operations that satisfy the given condition.
 
-        This method were introduce as an fast alternative for native Pony `random` method.
+        Random ids are drawn from the range of operation ids, and the ids of the operations that exist and satisfy the
+        condition are selected in a single query. More ids are drawn than needed: if that still does not give enough
+        operations, twice as many ids are drawn in the next round, for at most ``attempts`` rounds. Only the chosen
+        operations are loaded as entities.
 
         :param condition: the condition by which the entities will be queried.
         :param count: the amount of entities to return.
-        :param attempts: maximum attempt count for requesting the DB.
+        :param attempts: maximum number of rounds of drawing random ids.
         :returns: a set of random operations
         """
-        operations: set[Entity] = set()
-        for _ in range(attempts):
-            if len(operations) == count:
-                return operations
-
-            random_operations_list = self.StatementOp.select_random(1)
-            if random_operations_list:
-                operation = random_operations_list[0]
-                if condition(operation):
-                    operations.add(operation)
-
-        return operations
+        chosen: set[int] = set()
+        drawn: set[int] = set()
+        max_id = self._get_max_operation_id()
+        for attempt in range(attempts):
+            missing = count - len(chosen)
+            if missing <= 0 or len(drawn) >= max_id:
+                break
+
+            sample_size = min(missing * SAMPLE_OVERSAMPLING * 2 ** attempt, MAX_SUBJECTS_PER_QUERY)
+            ids = list({random.randint(1, max_id) for _ in range(sample_size)} - drawn)
+            drawn.update(ids)
+            found = list(select(so.id for so in self.StatementOp.select(condition) if so.id in ids))
+            chosen.update(random.sample(found, min(missing, len(found))))
+
+        if not chosen:
+            return set()
+        ids = list(chosen)
+        return set(self.StatementOp.select(lambda so: so.id in ids))
@@ -4,15 +4,17 @@ import random
 from binascii import hexlify, unhexlify
 from datetime import datetime
 from struct import unpack
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
 
 from lz4.frame import LZ4FrameCompressor
 from pony import orm
 from pony.orm import Database, db_session
+from pony.utils import datetime2timestamp
 from typing_extensions import Self
 
 from tribler.core.database.serialization import (
     EPOCH,
+    NULL_SIG,
     REGULAR_TORRENT,
     HealthItemsPayload,
     TorrentMetadataPayload,
@@ -66,6 +68,7 @@ if TYPE_CHECKING:
         id_: int
         timestamp: int
         signature: bytes | None
+        signed_blob: bytes | None
         added_on: datetime | None
         status: int | None
         xxx: float | None
@@ -76,8 +79,13 @@ if TYPE_CHECKING:
 
         def serialized(self, key: bytes | None = None) -> bytes: ...  # noqa: D102
 
+        def serialize(self, key: bytes | None = None) -> bytes: ...  # noqa: D102
+
         def to_simple_dict(self) -> dict[str, str | bytes | float | None]: ...  # noqa: D102
 
+        @classmethod
+        def insert_many(cls: type[Self], entries: list[dict]) -> list[Self]: ...  # noqa: D102
+
 
 def infohash_to_id(infohash: bytes) -> int:
     """
@@ -138,11 +146,13 @@ def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, star
         raise Exception(msg, metadata_list, chunk_size, start_index)
 
     compressor = LZ4FrameCompressor(auto_flush=True)
-    metadata_buffer = compressor.begin()
-    health_buffer = b''
+    header = compressor.begin()
+    # The parts are joined at the end, as growing a bytes object for every entry is quadratic in the chunk size
+    metadata_parts = [header]
+    health_parts = []
 
     index = 0
-    size = len(metadata_buffer) + LZ4_END_MARK_SIZE
+    size = len(header) + LZ4_END_MARK_SIZE
     if include_health:
         size += HEALTH_ITEM_HEADER_SIZE
 
@@ -157,24 +167,42 @@ def entries_to_chunk(metadata_list: list[TorrentMetadata], chunk_size: int, star
             # This lets higher levels to decide what to do in this case, e.g. send it through EVA protocol.
             break
 
-        metadata_buffer += metadata_bytes
+        metadata_parts.append(metadata_bytes)
         if include_health:
-            health_buffer += health_bytes
+            health_parts.append(health_bytes)
         index = count
 
-    result = metadata_buffer + compressor.flush()
+    metadata_parts.append(compressor.flush())
     if include_health:
-        result += HealthItemsPayload(health_buffer).serialize()
+        metadata_parts.append(HealthItemsPayload(b''.join(health_parts)).serialize())
 
-    return result, index + 1
+    return b''.join(metadata_parts), index + 1
 
 
 def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
-                   tag_processor_version: int) -> type[TorrentMetadata]:
+                   tag_processor_version: int,
+                   on_insert: Callable[[TorrentMetadata], None] | None = None,
+                   on_update: Callable[[TorrentMetadata, set[str]], None] | None = None) -> type[TorrentMetadata]:
     """
     Define the torrent metadata binding.
+
+    :param db: the database to bind to.
+    :param notifier: the notifier to inform of newly created entries.
+    :param tag_processor_version: the tag processor version to assign to newly created entries.
+    :param on_insert: an optional callback that receives every inserted entry.
+    :param on_update: an optional callback that receives every updated entry and the names of its changed fields.
     """
 
+    def execute_many(sql: str, rows: list[tuple]) -> None:
+        """
+        Execute the given statement for all given rows, e.g., to insert them at once.
+        """
+        # Anything that Pony still holds in memory has to be written before the statement is executed
+        orm.flush()
+        db.get_connection().cursor().executemany(sql, rows)
+        # Pony does not see the changes of the statement, so it should not reuse the results of earlier queries
+        db._get_cache().query_results.clear()  # noqa: SLF001
+
     class TorrentMetadata(db.Entity):
         """
         This ORM binding class is intended to store Torrent objects, i.e. infohashes along with some related metadata.
@@ -203,6 +231,9 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
         # NULLs are not checked for uniqueness and not indexed.
         # This is necessary to store unsigned signatures without violating the uniqueness constraints.
         signature = orm.Optional(bytes, unique=True, nullable=True, default=None)
+        # The serialized form of this entry, including its signature, as it is sent to other peers.
+        # This is stored on creation, so that responses to remote queries do not have to serialize the entries again.
+        signed_blob = orm.Optional(bytes, nullable=True, default=None)
 
         orm.composite_key(public_key, id_)
         orm.composite_index(public_key, origin_id)
@@ -242,6 +273,9 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
 
             super().__init__(*args, **kwargs)
 
+            if "signed_blob" not in kwargs:
+                self.signed_blob = self.serialize()
+
             if 'tracker_info' in kwargs:
                 self.add_tracker(kwargs["tracker_info"])
 
@@ -256,8 +290,30 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
                 tracker = db.TrackerState.get_for_update(url=sanitized_url) or db.TrackerState(url=sanitized_url)
                 self.health.trackers.add(tracker)
 
+        def get_changed_fields(self) -> set[str]:
+            """
+            Get the names of the fields that were changed since this entry was last loaded from or saved to the database.
+            """
+            return {attr.name for attr, value in self._vals_.items()
+                    if not attr.is_collection and (attr not in self._dbvals_ or self._dbvals_[attr] != value)}
+
         def before_update(self) -> None:
             self.add_tracker(self.tracker_info)
+            changed = self.get_changed_fields()
+            if "signed_blob" not in changed and self.is_serialization_changed(changed):
+                self.signed_blob = self.serialize()
+            if on_update:
+                on_update(self, changed)
+
+        def is_serialization_changed(self, changed: set[str]) -> bool:
+            """
+            Whether any of the given changed fields is part of the serialized form of this entry.
+            """
+            return "signature" in changed or not changed.isdisjoint(self.payload_class.names)
+
+        def after_insert(self) -> None:
+            if on_insert:
+                on_insert(self)
 
         def get_magnet(self) ->  str:
             return f"magnet:?xt=urn:btih:{hexlify(self.infohash).decode()}&dn={self.title}" + (
@@ -286,14 +342,15 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
             Return a basic dictionary with information about the channel.
             """
             epoch = datetime.utcfromtimestamp(0)  # noqa: DTZ004
+            health = self.health
             return {
                 "name": self.title,
                 "category": self.tags,
                 "infohash": hexlify(self.infohash).decode(),
                 "size": self.size,
-                "num_seeders": self.health.seeders,
-                "num_leechers": self.health.leechers,
-                "last_tracker_check": self.health.last_check,
+                "num_seeders": health.seeders if health else 0,
+                "num_leechers": health.leechers if health else 0,
+                "last_tracker_check": health.last_check if health else 0,
                 "created": int((self.torrent_date - epoch).total_seconds()),
                 "tag_processor_version": self.tag_processor_version,
                 "type": self.get_type(),
@@ -314,6 +371,80 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
         def from_dict(cls: type[Self], dct: dict) -> Self:
             return cls(**dct)
 
+        @classmethod
+        def insert_many(cls: type[Self], entries: list[dict]) -> list[Self]:
+            """
+            Insert new entries, and their missing torrent states, with a single statement each.
+
+            Unlike the constructor, this does not create and flush every entry separately. The SQL triggers still
+            maintain the search index and the entry counts, the other side effects of the constructor are applied to
+            the inserted entries afterward.
+
+            :param entries: the fields of the new entries, e.g., as produced by ``TorrentMetadataPayload.to_dict``.
+            :return: the inserted entries, in the same order as the given fields.
+            """
+            if not entries:
+                return []
+            healths = cls.get_or_insert_torrent_states({fields["infohash"] for fields in entries})
+            now = datetime.utcnow()  # noqa: DTZ003
+            rows = []
+            for fields in entries:
+                public_key = fields.get("public_key", b"")
+                signature = fields.get("signature") if public_key != b"" else None
+                signed_blob = fields.get("signed_blob")
+                if signed_blob is None:
+                    payload = cls.payload_class.from_dict(**dict(fields, public_key=public_key))
+                    signed_blob = payload.serialized() + (signature or NULL_SIG)
+                rows.append((REGULAR_TORRENT, fields.get("reserved_flags", 0), fields.get("origin_id", 0), public_key,
+                             fields["id_"], fields.get("timestamp", 0), signature, signed_blob, fields["infohash"],
+                             fields.get("size", 0), datetime2timestamp(fields.get("torrent_date") or now),
+                             fields.get("title", ""), fields.get("tags", ""), fields.get("tracker_info", ""),
+                             datetime2timestamp(now), fields.get("status", COMMITTED),
+                             healths[fields["infohash"]].rowid, tag_processor_version if notifier else 0))
+            execute_many("""
+                INSERT INTO ChannelNode (metadata_type, reserved_flags, origin_id, public_key, id_, timestamp,
+                                         signature, signed_blob, infohash, size, torrent_date, title, tags,
+                                         tracker_info, added_on, status, xxx, health, tag_processor_version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0, ?, ?)
+            """, rows)
+            for health in healths.values():
+                # Pony did not see the inserted entries, so the entries that it loaded for a torrent state are outdated
+                loaded = health._vals_.get(db.TorrentState.metadata)  # noqa: SLF001
+                if loaded is not None:
+                    loaded.is_fully_loaded = False
+                    loaded.count = None
+
+            public_keys = {row[3] for row in rows}
+            ids = {row[4] for row in rows}
+            inserted = {(node.public_key, node.id_): node for node
+                        in cls.select(lambda g: g.public_key in public_keys and g.id_ in ids)}
+            nodes = [inserted[(row[3], row[4])] for row in rows]
+            for node in nodes:
+                node.add_tracker(node.tracker_info)
+                if notifier:
+                    notifier.notify(Notification.new_torrent_metadata_created, infohash=node.infohash,
+                                    title=node.title)
+                if on_insert:
+                    on_insert(node)
+            return nodes
+
+        @staticmethod
+        def get_or_insert_torrent_states(infohashes: set[bytes]) -> dict[bytes, TorrentState]:
+            """
+            Get the torrent states of the given infohashes, inserting the missing ones with a single statement.
+
+            The inserted torrent states are empty, so they are not passed to the ``on_change`` callback of the torrent
+            states.
+            """
+            healths = {state.infohash: state for state in db.TorrentState.select(lambda s: s.infohash in infohashes)}
+            missing = infohashes - healths.keys()
+            if missing:
+                execute_many("INSERT INTO TorrentState (infohash, seeders, leechers, last_check, self_checked) "
+                             "VALUES (?, 0, 0, 0, 0)", [(infohash,) for infohash in missing])
+                healths.update((state.infohash, state) for state
+                               in db.TorrentState.select(lambda s: s.infohash in missing))
+            return healths
+
         @classmethod
         @db_session
         def get_with_infohash(cls: type[Self], infohash: bytes) -> Self:
@@ -335,6 +466,21 @@ def define_binding(db: Database, notifier: Notifier | None,  # noqa: C901
             """
             Serializes the object and returns the result with added signature (blob output).
 
+            The stored signed blob is used if it is still up-to-date, i.e., if it ends with the current signature and
+            none of the serialized fields were changed since it was stored.
+
+            :param key: private key to sign object with
+            :return: serialized_data+signature binary string
+            """
+            if (key is None and self.signed_blob and self.signed_blob[-len(NULL_SIG):] == (self.signature or NULL_SIG)
+                    and not self.is_serialization_changed(self.get_changed_fields())):
+                return self.signed_blob
+            return self.serialize(key)
+
+        def serialize(self, key: bytes | None = None) -> bytes:
+            """
+            Serializes the object from its current fields and returns the result with added signature (blob output).
+
             :param key: private key to sign object with
             :return: serialized_data+signature binary string
             """
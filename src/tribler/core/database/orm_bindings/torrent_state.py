@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
 from pony import orm
 from typing_extensions import Self
@@ -42,9 +42,15 @@ if TYPE_CHECKING:
         def get_for_update(infohash: bytes) -> TorrentState | None: ...  # noqa: D102
 
 
-def define_binding(db: Database) -> type[TorrentState]:
+def define_binding(db: Database, on_change: Callable[[TorrentState], None] | None = None,
+                   on_seeders_change: Callable[[TorrentState, int], None] | None = None) -> type[TorrentState]:
     """
     Define the tracker state binding.
+
+    :param db: the database to bind to.
+    :param on_change: an optional callback that receives every inserted or updated torrent state.
+    :param on_seeders_change: an optional callback that receives every updated torrent state of which the number of
+                              seeders changed, and its previous number of seeders.
     """
 
     class TorrentState(db.Entity):
@@ -70,4 +76,18 @@ def define_binding(db: Database) -> type[TorrentState]:
         def to_health(self) -> HealthInfo:
             return HealthInfo(self.infohash, self.seeders, self.leechers, self.last_check, self.self_checked)
 
+        def after_insert(self) -> None:
+            if on_change:
+                on_change(self)
+
+        def before_update(self) -> None:
+            if on_seeders_change:
+                old_seeders = self._dbvals_.get(TorrentState.seeders)
+                if old_seeders != self.seeders:
+                    on_seeders_change(self, old_seeders or 0)
+
+        def after_update(self) -> None:
+            if on_change:
+                on_change(self)
+
     return TorrentState
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable, NamedTuple
+
+
+class PopularEntry(NamedTuple):
+    """
+    The health of a popular torrent, see ``PopularTorrents``.
+    """
+
+    seeders: int
+    leechers: int
+    last_check: int
+
+    @property
+    def score(self) -> tuple[int, int, int]:
+        """
+        The key by which popular torrents are ordered, best first when sorted in descending order.
+        """
+        return self.seeders, self.leechers, self.last_check
+
+
+class PopularTorrents:
+    """
+    A precomputed list of the most popular torrent states: the ``size`` healthiest torrents that were recently checked.
+
+    The list is computed by a database query once and then kept up-to-date by the health updates of torrents. An
+    update can only be applied without querying the database if it does not make room for a torrent that we do not
+    know of: e.g., when a member of a full list becomes less healthy, the next best torrent may be any torrent in the
+    database. In that case, the list is marked stale and recomputed by the next reader.
+    """
+
+    def __init__(self, size: int, freshness_period: int, refresh_interval: int) -> None:
+        """
+        Create a new (stale) popular list.
+
+        :param size: the number of torrents in the list.
+        :param freshness_period: the time in seconds after which a check no longer counts toward popularity.
+        :param refresh_interval: the time in seconds after which the list is recomputed anyway.
+        """
+        self.size = size
+        self.freshness_period = freshness_period
+        self.refresh_interval = refresh_interval
+
+        self.entries: dict[int, PopularEntry] = {}
+        self.stale = True
+        self.refreshed_at = 0
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def is_popular(self, entry: PopularEntry, now: int) -> bool:
+        """
+        Whether the given health qualifies a torrent for the popular list at all.
+        """
+        return entry.last_check >= now - self.freshness_period and (entry.seeders > 0 or entry.leechers > 0)
+
+    def get(self, now: int) -> list[int] | None:
+        """
+        Get the torrent state rowids of the popular torrents, most popular first, or None if the list is stale.
+        """
+        with self.lock:
+            if self.stale or now - self.refreshed_at > self.refresh_interval:
+                return None
+            expired = [rowid for rowid, entry in self.entries.items() if not self.is_popular(entry, now)]
+            if expired:
+                if len(self.entries) >= self.size:
+                    self.stale = True  # The next best torrents are not known to us
+                    return None
+                for rowid in expired:
+                    self.entries.pop(rowid)
+            return sorted(self.entries, key=lambda rowid: self.entries[rowid].score, reverse=True)
+
+    def start_refresh(self) -> int:
+        """
+        Get the version of the list before querying the database for a refresh.
+        """
+        with self.lock:
+            return self.version
+
+    def refresh(self, rows: Iterable[tuple[int, int, int, int]], now: int, version: int) -> None:
+        """
+        Replace the list by the result of a database query.
+
+        :param rows: the (rowid, seeders, leechers, last_check) tuples of the most popular torrent states.
+        :param now: the time at which the query was performed.
+        :param version: the version of the list before the query, see ``start_refresh``.
+        """
+        with self.lock:
+            self.entries = {rowid: PopularEntry(seeders or 0, leechers or 0, last_check or 0)
+                            for rowid, seeders, leechers, last_check in rows}
+            self.refreshed_at = now
+            # Updates that happened during the query may or may not be part of its result
+            self.stale = version != self.version
+
+    def update(self, rowid: int, entry: PopularEntry, now: int) -> None:
+        """
+        Process the new health of a torrent state.
+        """
+        with self.lock:
+            self.version += 1
+            if self.stale:
+                return
+
+            full = len(self.entries) >= self.size
+            if not self.is_popular(entry, now):
+                if self.entries.pop(rowid, None) is not None and full:
+                    self.stale = True
+                return
+
+            if rowid in self.entries:
+                if full and entry.score < self.entries[rowid].score:
+                    self.stale = True
+                self.entries[rowid] = entry
+            elif not full:
+                # A list that is not full holds all popular torrents, so this one is the only one we did not know of
+                self.entries[rowid] = entry
+            else:
+                worst = min(self.entries, key=lambda other: self.entries[other].score)
+                if entry.score > self.entries[worst].score:
+                    self.entries.pop(worst)
+                    self.entries[rowid] = entry
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+import json
 import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from dataclasses import dataclass, field
+from typing import Any
 
 fts_query_re = re.compile(r"\w+", re.UNICODE)
 
@@ -29,3 +32,29 @@ def to_fts_query(text: str | None) -> str | None:
         return None
 
     return " ".join(words)
+
+
+def encode_continuation_token(sort_key: Any, rowid: int) -> str:  # noqa: ANN401
+    """
+    Create an opaque token that marks the position of the last entry of a page of results.
+
+    :param sort_key: the (JSON-serializable) value of the sort column of the last entry.
+    :param rowid: the rowid of the last entry, which breaks ties between entries with the same sort key.
+    """
+    return urlsafe_b64encode(json.dumps([sort_key, rowid]).encode()).decode()
+
+
+def decode_continuation_token(token: str) -> tuple[Any, int]:
+    """
+    Get the sort key and rowid that were encoded in a continuation token.
+
+    :raises ValueError: if the token is malformed.
+    """
+    try:
+        sort_key, rowid = json.loads(urlsafe_b64decode(token.encode()))
+        if not isinstance(rowid, int):
+            raise TypeError
+    except (AttributeError, TypeError, ValueError) as e:
+        msg = f"Invalid continuation token: {token!r}"
+        raise ValueError(msg) from e
+    return sort_key, rowid
@@ -14,7 +14,7 @@ from pony.orm import db_session
 from typing_extensions import Self, TypeAlias
 
 from tribler.core.database.layers.knowledge import ResourceType
-from tribler.core.database.queries import to_fts_query
+from tribler.core.database.queries import decode_continuation_token, to_fts_query
 from tribler.core.database.restapi.schema import MetadataSchema, SearchMetadataParameters, TorrentSchema
 from tribler.core.database.serialization import REGULAR_TORRENT
 from tribler.core.notifier import Notification
@@ -122,6 +122,9 @@ class DatabaseEndpoint(RESTEndpoint):
             sanitized["channel_pk"] = unhexlify(parameters["channel_pk"])
         if "origin_id" in parameters:
             sanitized["origin_id"] = int(parameters["origin_id"])
+        if "continuation_token" in parameters:
+            decode_continuation_token(parameters["continuation_token"])
+            sanitized["continuation_token"] = parameters["continuation_token"]
         return sanitized
 
     @db_session
@@ -133,13 +136,13 @@ class DatabaseEndpoint(RESTEndpoint):
             self._logger.error("Cannot add statements to metadata list: tribler_db is not set in %s",
                                self.__class__.__name__)
             return
-        for torrent in contents_list:
-            if torrent["type"] == REGULAR_TORRENT:
-                raw_statements = self.tribler_db.knowledge.get_simple_statements(
-                    subject_type=ResourceType.TORRENT,
-                    subject=torrent["infohash"]
-                )
-                torrent["statements"] = [asdict(stmt) for stmt in raw_statements]
+        torrents = [torrent for torrent in contents_list if torrent["type"] == REGULAR_TORRENT]
+        statements = self.tribler_db.knowledge.get_simple_statements_for_subjects(
+            subject_type=ResourceType.TORRENT,
+            subjects={torrent["infohash"] for torrent in torrents}
+        )
+        for torrent in torrents:
+            torrent["statements"] = [asdict(stmt) for stmt in statements[torrent["infohash"]]]
 
     @docs(
         tags=["Metadata"],
@@ -254,6 +257,8 @@ class DatabaseEndpoint(RESTEndpoint):
                         "sort_by": String(),
                         "sort_desc": Integer(),
                         "total": Integer(),
+                        "is_estimate": Boolean(),
+                        "continuation_token": String(),
                     }
                 )
             }
@@ -286,20 +291,26 @@ class DatabaseEndpoint(RESTEndpoint):
 
         mds: MetadataStore = request.context[0]
 
-        def search_db() -> tuple[list[dict], int, int]:
+        page_size = typing.cast("int", sanitized["last"]) - typing.cast("int", sanitized["first"]) + 1
+
+        def search_db() -> tuple[list[dict], int, bool, int, str | None]:
             with db_session:
                 pony_query = mds.get_entries(**sanitized)
                 search_results = [r.to_simple_dict() for r in pony_query]
+                continuation_token = (mds.get_continuation_token(pony_query[-1],
+                                                                 typing.cast("str | None", sanitized["sort_by"]),
+                                                                 typing.cast("bool | None", sanitized.get("popular")))
+                                      if len(pony_query) == page_size else None)
                 if include_total:
-                    total = mds.get_total_count(**sanitized)
+                    total, is_estimate = mds.estimate_total_count(**sanitized)
                     max_rowid = mds.get_max_rowid()
                 else:
-                    total = max_rowid = None
+                    total = is_estimate = max_rowid = None
             if self.download_manager is not None:
                 self.download_manager.notifier.notify(Notification.local_query_results,
                                                       query=request.query.get("fts_text"),
                                                       results=list(search_results))
-            return search_results, total, max_rowid
+            return search_results, total, is_estimate, max_rowid, continuation_token
 
         try:
             with db_session:
@@ -312,7 +323,8 @@ class DatabaseEndpoint(RESTEndpoint):
                     if infohash_set:
                         sanitized["infohash_set"] = {bytes.fromhex(s) for s in infohash_set}
 
-            search_results, total, max_rowid = await mds.run_threaded(search_db)
+            db_results = await mds.run_threaded_readonly(search_db)
+            search_results, total, is_estimate, max_rowid, continuation_token = db_results
         except Exception as e:
             self._logger.exception("Error while performing DB search: %s: %s", type(e).__name__, e)
             return RESTResponse(status=HTTP_BAD_REQUEST)
@@ -325,9 +337,10 @@ class DatabaseEndpoint(RESTEndpoint):
             "last": sanitized["last"],
             "sort_by": sanitized["sort_by"],
             "sort_desc": sanitized["sort_desc"],
+            "continuation_token": continuation_token,
         }
         if include_total:
-            response_dict.update(total=total, max_rowid=max_rowid)
+            response_dict.update(total=total, is_estimate=is_estimate, max_rowid=max_rowid)
 
         return RESTResponse(response_dict)
 
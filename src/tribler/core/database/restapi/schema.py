@@ -23,9 +23,11 @@ class SearchMetadataParameters(MetadataParameters):
     The REST API schema for search parameters.
     """
 
-    include_total = Boolean(default=False, description="Include total rows found in query response, expensive if "
-                                                       "there is many rows")
+    include_total = Boolean(default=False, description="Include total rows found in query response, large totals "
+                                                       "are estimated (see is_estimate)")
     max_rowid = Integer(default=None, description="Only return results with rowid lesser than max_rowid")
+    continuation_token = String(default=None, description="Return the results that follow the previous page, as "
+                                                          "marked by its continuation_token (instead of first)")
 
 
 class MetadataSchema(Schema):
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_CACHE_SIZE = 32  # The number of distinct searches to remember
+
+
+@dataclass
+class CachedSearch:
+    """
+    The ranked results of a single search, and the database state they were computed for.
+    """
+
+    max_rowid: int
+    rowids: list[int]
+    infohashes: set[bytes] = field(default_factory=set)
+
+
+class SearchResultCache:
+    """
+    An LRU cache of ranked search results (rowid lists), keyed on the sanitized query parameters.
+
+    Cached results are invalidated when new entries are added to the database (their rowid exceeds the rowid
+    watermark of the cached search) or when the health of one of the ranked torrents changes. The metadata store
+    clears the cache when the searchable fields of an existing entry change.
+    """
+
+    def __init__(self, size: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        Create a new cache for, at most, the given number of searches.
+        """
+        self.size = size
+        self.searches: OrderedDict[tuple, CachedSearch] = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(parameters: dict[str, Any]) -> tuple:
+        """
+        Convert the given query parameters to a hashable key, ignoring the pagination.
+        """
+        return tuple(sorted((name, frozenset(value) if isinstance(value, (set, list)) else value)
+                            for name, value in parameters.items() if name not in ("first", "last")))
+
+    def get(self, parameters: dict[str, Any], max_rowid: int) -> list[int] | None:
+        """
+        Get the ranked rowids for the given query parameters, if they are cached and still valid.
+        """
+        key = self.make_key(parameters)
+        with self.lock:
+            search = self.searches.get(key)
+            if search is None or search.max_rowid != max_rowid:
+                self.searches.pop(key, None)
+                self.misses += 1
+                return None
+            self.searches.move_to_end(key)
+            self.hits += 1
+            return search.rowids
+
+    def peek(self, parameters: dict[str, Any], max_rowid: int) -> list[int] | None:
+        """
+        Get the ranked rowids for the given query parameters, like ``get``, without counting a hit or miss.
+        """
+        with self.lock:
+            search = self.searches.get(self.make_key(parameters))
+            return search.rowids if search is not None and search.max_rowid == max_rowid else None
+
+    def put(self, parameters: dict[str, Any], max_rowid: int, ranked: list[tuple[int, bytes]]) -> None:
+        """
+        Store the ranked (rowid, infohash) results for the given query parameters.
+        """
+        key = self.make_key(parameters)
+        with self.lock:
+            self.searches[key] = CachedSearch(max_rowid, [rowid for rowid, _ in ranked],
+                                              {infohash for _, infohash in ranked})
+            self.searches.move_to_end(key)
+            while len(self.searches) > self.size:
+                self.searches.popitem(last=False)
+
+    def invalidate_infohash(self, infohash: bytes) -> None:
+        """
+        Drop all cached searches that include the torrent with the given infohash.
+        """
+        with self.lock:
+            for key in [key for key, search in self.searches.items() if infohash in search.infohashes]:
+                del self.searches[key]
+
+    def clear(self) -> None:
+        """
+        Drop all cached searches.
+        """
+        with self.lock:
+            self.searches.clear()
+
+    def get_statistics(self) -> dict[str, int]:
+        """
+        Get the hit and miss counters of this cache.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.searches)}
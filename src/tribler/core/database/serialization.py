@@ -71,8 +71,10 @@ def read_payload_with_offset(data: bytes, offset: int = 0) -> tuple[TorrentMetad
     if metadata_type != REGULAR_TORRENT:
         raise UnknownBlobTypeException(metadata_type)
 
+    start = offset
     payload, offset = default_serializer.unpack_serializable(TorrentMetadataPayload, data, offset=offset)
     payload.signature = data[offset: offset + 64]
+    payload.signed_blob = data[start: offset + 64]
     return payload, offset + 64
 
 
@@ -88,6 +90,7 @@ class SignedPayload(VariablePayload):
     format_list = ["H", "H", "64s"]
 
     signature: bytes = NULL_SIG
+    signed_blob: bytes | None = None  # The exact serialized form, with signature, that this payload was read from
     metadata_type: int
     reserved_flags: int
     public_key: bytes
@@ -105,6 +108,7 @@ class SignedPayload(VariablePayload):
         """
         payload, offset = default_serializer.unpack_serializable(cls, serialized)
         payload.signature = serialized[offset:]
+        payload.signed_blob = serialized
         return payload
 
     def to_dict(self) -> dict:
@@ -3,8 +3,9 @@ from __future__ import annotations
 import enum
 import logging
 import re
+import sqlite3
 import threading
-from asyncio import get_running_loop
+from asyncio import wrap_future
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from os.path import getsize
@@ -13,14 +14,18 @@ from time import sleep, time
 from typing import TYPE_CHECKING, Any, Callable
 
 from lz4.frame import LZ4FrameDecompressor
-from pony import orm
-from pony.orm import Database, db_session, desc, left_join, raw_sql, select
+from pony.orm import Database, coalesce, db_session, desc, left_join, raw_sql, select
 from pony.orm.dbproviders.sqlite import keep_exception
 
+from tribler.core.database.autocomplete import AutoCompleteIndex
+from tribler.core.database.executor import Priority, PriorityExecutor
 from tribler.core.database.orm_bindings import misc, torrent_metadata, tracker_state
 from tribler.core.database.orm_bindings import torrent_state as torrent_state_
-from tribler.core.database.orm_bindings.torrent_metadata import NULL_KEY_SUBST
-from tribler.core.database.ranks import torrent_rank
+from tribler.core.database.orm_bindings.torrent_metadata import COMMITTED, NULL_KEY_SUBST, infohash_to_id
+from tribler.core.database.popular import PopularEntry, PopularTorrents
+from tribler.core.database.queries import decode_continuation_token, encode_continuation_token
+from tribler.core.database.ranks import tokenize_title, torrent_ranks
+from tribler.core.database.search_cache import SearchResultCache
 from tribler.core.database.serialization import (
     CHANNEL_TORRENT,
     COLLECTION_NODE,
@@ -29,7 +34,9 @@ from tribler.core.database.serialization import (
     HealthItemsPayload,
     TorrentMetadataPayload,
     read_payload_with_offset,
+    time2int,
 )
+from tribler.core.database.verification import SignatureVerifier
 from tribler.core.torrent_checker.dataclasses import HealthInfo
 
 if TYPE_CHECKING:
@@ -40,6 +47,7 @@ if TYPE_CHECKING:
 
     from tribler.core.database.layers.layer import EntityImpl
     from tribler.core.database.orm_bindings.torrent_metadata import TorrentMetadata
+    from tribler.core.database.orm_bindings.torrent_state import TorrentState
     from tribler.core.notifier import Notifier
 
 
@@ -77,6 +85,15 @@ MAX_BATCH_SIZE = 1000
 
 POPULAR_TORRENTS_FRESHNESS_PERIOD = 60 * 60 * 24  # Last day
 POPULAR_TORRENTS_COUNT = 100
+POPULAR_TORRENTS_REFRESH_INTERVAL = 60 * 10  # The precomputed popular torrents are recomputed at least this often
+TOTAL_COUNT_CAP = 1000  # Total counts above this number are estimated
+RANKED_FIELDS = {"title", "tags", "torrent_date"}  # The fields of an entry that determine its search results and rank
+AUTO_COMPLETE_UPDATE_INTERVAL = 60  # seconds between applying the changes in seeders to the auto-completion index
+DB_EXECUTOR_SIZE = 4  # The number of threads that run database work (see run_threaded)
+DB_THREAD_NAME_PREFIX = "MetadataStore"
+READER_POOL_SIZE = 4  # The number of persistent read-only connections in WAL mode
+READER_THREAD_NAME_PREFIX = "MetadataStoreReader"
+WAL_CHECKPOINT_INTERVAL = 300  # seconds
 
 # This table should never be used from ORM directly.
 # It is created as a VIRTUAL table by raw SQL and
@@ -86,22 +103,62 @@ sql_create_fts_table = """
         (title, content='ChannelNode', prefix = '2 3 4 5',
          tokenize='porter unicode61 remove_diacritics 1');"""
 
+# This table should never be used from ORM directly either.
+# It stores the normalized title words that are used for search ranking (see ranks.tokenize_title),
+# so that the titles of the search candidates do not have to be tokenized again for every query.
+# It is maintained by the FTS triggers, using the title_tokens() function that is registered for each connection.
+sql_create_title_tokens_table = """
+    CREATE TABLE IF NOT EXISTS TitleTokens
+        (rowid INTEGER PRIMARY KEY, tokens TEXT NOT NULL);"""
+
+# This table should never be used from ORM directly either.
+# It keeps the number of entries per metadata type, so that unfiltered counts do not have to scan the entire table.
+# It is maintained by SQL triggers.
+sql_create_entry_counts_table = """
+    CREATE TABLE IF NOT EXISTS EntryCounts
+        (metadata_type INTEGER PRIMARY KEY, count INTEGER NOT NULL);"""
+
+sql_add_counts_trigger_insert = """
+    CREATE TRIGGER IF NOT EXISTS counts_ai AFTER INSERT ON ChannelNode
+    BEGIN
+        INSERT INTO EntryCounts(metadata_type, count) VALUES (new.metadata_type, 1)
+            ON CONFLICT(metadata_type) DO UPDATE SET count = count + 1;
+    END;"""
+
+sql_add_counts_trigger_delete = """
+    CREATE TRIGGER IF NOT EXISTS counts_ad AFTER DELETE ON ChannelNode
+    BEGIN
+        UPDATE EntryCounts SET count = count - 1 WHERE metadata_type = old.metadata_type;
+    END;"""
+
+sql_add_counts_trigger_update = """
+    CREATE TRIGGER IF NOT EXISTS counts_au AFTER UPDATE OF metadata_type ON ChannelNode
+    WHEN old.metadata_type != new.metadata_type
+    BEGIN
+        UPDATE EntryCounts SET count = count - 1 WHERE metadata_type = old.metadata_type;
+        INSERT INTO EntryCounts(metadata_type, count) VALUES (new.metadata_type, 1)
+            ON CONFLICT(metadata_type) DO UPDATE SET count = count + 1;
+    END;"""
+
 sql_add_fts_trigger_insert = """
     CREATE TRIGGER IF NOT EXISTS fts_ai AFTER INSERT ON ChannelNode
     BEGIN
         INSERT INTO FtsIndex(rowid, title) VALUES (new.rowid, new.title);
+        INSERT OR REPLACE INTO TitleTokens(rowid, tokens) VALUES (new.rowid, title_tokens(new.title));
     END;"""
 
 sql_add_fts_trigger_delete = """
     CREATE TRIGGER IF NOT EXISTS fts_ad AFTER DELETE ON ChannelNode
     BEGIN
         DELETE FROM FtsIndex WHERE rowid = old.rowid;
+        DELETE FROM TitleTokens WHERE rowid = old.rowid;
     END;"""
 
 sql_add_fts_trigger_update = """
     CREATE TRIGGER IF NOT EXISTS fts_au AFTER UPDATE ON ChannelNode BEGIN
         DELETE FROM FtsIndex WHERE rowid = old.rowid;
         INSERT INTO FtsIndex(rowid, title) VALUES (new.rowid, new.title);
+        INSERT OR REPLACE INTO TitleTokens(rowid, tokens) VALUES (new.rowid, title_tokens(new.title));
     END;"""
 
 sql_add_torrentstate_trigger_after_insert = """
@@ -130,17 +187,20 @@ class MetadataStore:
     Storage of metadata for channels and torrents.
     """
 
-    def __init__(  # noqa: PLR0913
+    def __init__(  # noqa: PLR0913, PLR0915, PLR0917
             self,
             db_filename: str,
             private_key: PrivateKey,
             disable_sync: bool = False,
             notifier: Notifier | None = None,
             check_tables: bool = True,
-            db_version: int = CURRENT_DB_VERSION
+            db_version: int = CURRENT_DB_VERSION,
+            wal_mode: bool = False
     ) -> None:
         """
         Create a new metadata store.
+
+        :param wal_mode: use a write-ahead log, so that reads (see ``run_threaded_readonly``) do not block on writes.
         """
         self.notifier = notifier  # Reference to app-level notification service
         self.db_path = db_filename
@@ -152,6 +212,22 @@ class MetadataStore:
         self.batch_size = 10  # reasonable number, a little bit more than typically fits in a single UDP packet
         self.reference_timedelta = timedelta(milliseconds=100)
         self.sleep_on_external_thread = 0.05  # sleep this amount of seconds between batches executed on external thread
+        self.search_cache = SearchResultCache()
+        self.auto_complete = AutoCompleteIndex()
+        self.seeders_changes: dict[int, int] = {}  # Torrent state rowid to the change in seeders since it was indexed
+        self.seeders_changes_lock = threading.Lock()
+        self.max_rowid = 0  # The highest inserted row id, this serves as the watermark of the response caches
+        # Infohash to the (seeders, leechers, last check) of torrent states that changed, see ``pop_health_changes``
+        self.health_changes: dict[bytes, tuple[int, int, int]] | None = None
+        self.health_changes_lock = threading.Lock()
+        self.popular_torrents = PopularTorrents(POPULAR_TORRENTS_COUNT, POPULAR_TORRENTS_FRESHNESS_PERIOD,
+                                                POPULAR_TORRENTS_REFRESH_INTERVAL)
+        self.signature_verifier = SignatureVerifier()
+        # In-memory databases have no journal to speak of
+        self.wal_mode = wal_mode and db_filename != ":memory:"
+        self.executor = PriorityExecutor(DB_EXECUTOR_SIZE, DB_THREAD_NAME_PREFIX)
+        self.reader_executor = (PriorityExecutor(READER_POOL_SIZE, READER_THREAD_NAME_PREFIX)
+                                if self.wal_mode else None)
 
         # We have to dynamically define/init ORM-managed entities here to be able to support
         # multiple sessions in Tribler. ORM-managed classes are bound to the database instance
@@ -163,10 +239,13 @@ class MetadataStore:
         @self.db.on_connect
         def on_connect(_: Database, connection: Connection) -> None:
             cursor = connection.cursor()
-            cursor.execute("PRAGMA journal_mode = DELETE")
+            cursor.execute("PRAGMA journal_mode = WAL" if self.wal_mode else "PRAGMA journal_mode = DELETE")
             cursor.execute("PRAGMA synchronous = NORMAL")
             cursor.execute("PRAGMA temp_store = MEMORY")
             cursor.execute("PRAGMA foreign_keys = ON")
+            if threading.current_thread().name.startswith(READER_THREAD_NAME_PREFIX):
+                # The connections of the reader pool persist between calls and are only meant for queries
+                cursor.execute("PRAGMA query_only = ON")
 
             # Disable disk sync for special cases
             if disable_sync:
@@ -175,17 +254,19 @@ class MetadataStore:
                 cursor.execute("PRAGMA journal_mode = 0")
                 cursor.execute("PRAGMA synchronous = 0")
 
-            sqlite_rank = keep_exception(torrent_rank)
-            connection.create_function('search_rank', 5, sqlite_rank)
+            connection.create_function("title_tokens", 1, keep_exception(tokenize_title), deterministic=True)
 
         self.MiscData = misc.define_binding(self.db)
 
         self.TrackerState = tracker_state.define_binding(self.db)
-        self.TorrentState = torrent_state_.define_binding(self.db)
+        self.TorrentState = torrent_state_.define_binding(self.db, on_change=self.on_torrent_state_change,
+                                                          on_seeders_change=self.on_torrent_state_seeders_change)
         self.TorrentMetadata = torrent_metadata.define_binding(
             self.db,
             notifier=notifier,
-            tag_processor_version=0
+            tag_processor_version=0,
+            on_insert=self.on_torrent_metadata_insert,
+            on_update=self.on_torrent_metadata_update
         )
 
         if db_filename == ":memory:":
@@ -194,6 +275,8 @@ class MetadataStore:
         else:
             create_db = not Path(db_filename).exists()
             db_path_string = str(db_filename)
+            if not create_db:
+                self.add_signed_blob_column(db_path_string)
 
         self.db.bind(provider="sqlite", filename=db_path_string, create_db=create_db, timeout=120.0)
         self.db.generate_mapping(
@@ -202,13 +285,23 @@ class MetadataStore:
         if create_db:
             with db_session(ddl=True):
                 self.db.execute(sql_create_fts_table)
+                self.db.execute(sql_create_title_tokens_table)
+                self.db.execute(sql_create_entry_counts_table)
                 self.create_fts_triggers()
+                self.create_counts_triggers()
                 self.create_torrentstate_triggers()
+        else:
+            with db_session(ddl=True):
+                self.create_title_tokens_table()
+                self.create_entry_counts_table()
 
         if create_db:
             with db_session:
                 self.MiscData(name="db_version", value=str(db_version))
 
+        with db_session:
+            self.max_rowid = self.get_max_rowid()
+
     def set_value(self, key: str, value: str) -> None:
         """
         Set a generic key to a value.
@@ -274,6 +367,67 @@ class MetadataStore:
         cursor = self.db.get_connection().cursor()
         cursor.execute("insert into FtsIndex(rowid, title) select rowid, title from ChannelNode")
 
+    @staticmethod
+    def add_signed_blob_column(db_path: str) -> None:
+        """
+        Add the signed blob column to databases that were created before it existed.
+
+        This uses a separate connection, as Pony refuses to map the entities if one of their columns is missing.
+        The signed blobs of existing entries stay empty: these entries are serialized when they are sent.
+        """
+        connection = sqlite3.connect(db_path)
+        try:
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(ChannelNode)")}
+            if columns and "signed_blob" not in columns:
+                connection.execute("ALTER TABLE ChannelNode ADD COLUMN signed_blob BLOB")
+                connection.commit()
+        finally:
+            connection.close()
+
+    def create_title_tokens_table(self) -> None:
+        """
+        Create and fill the title tokens table for databases that were created before it existed.
+        """
+        cursor = self.db.get_connection().cursor()
+        cursor.execute("select name from sqlite_master where type='table' and name='TitleTokens'")
+        if cursor.fetchone():
+            return
+        cursor.execute(sql_create_title_tokens_table)
+        # The existing FTS triggers do not maintain the title tokens yet
+        self.drop_fts_triggers()
+        self.create_fts_triggers()
+        self.fill_title_tokens()
+
+    def fill_title_tokens(self) -> None:
+        """
+        Insert the title tokens.
+        """
+        cursor = self.db.get_connection().cursor()
+        cursor.execute("insert or replace into TitleTokens(rowid, tokens) select rowid, title_tokens(title) "
+                       "from ChannelNode")
+
+    def create_entry_counts_table(self) -> None:
+        """
+        Create and fill the entry counts table for databases that were created before it existed.
+        """
+        cursor = self.db.get_connection().cursor()
+        cursor.execute("select name from sqlite_master where type='table' and name='EntryCounts'")
+        if cursor.fetchone():
+            return
+        cursor.execute(sql_create_entry_counts_table)
+        self.create_counts_triggers()
+        cursor.execute("insert into EntryCounts(metadata_type, count) select metadata_type, count(*) "
+                       "from ChannelNode group by metadata_type")
+
+    def create_counts_triggers(self) -> None:
+        """
+        Create the entry counts triggers.
+        """
+        cursor = self.db.get_connection().cursor()
+        cursor.execute(sql_add_counts_trigger_insert)
+        cursor.execute(sql_add_counts_trigger_delete)
+        cursor.execute(sql_add_counts_trigger_update)
+
     def create_torrentstate_triggers(self) -> None:
         """
         Create the torrent state triggers.
@@ -287,14 +441,26 @@ class MetadataStore:
         Disconnect the connection to the database.
         """
         self._shutting_down = True
+        self.signature_verifier.shutdown()
+        self.executor.shutdown(cancel_futures=True)
+        if self.reader_executor is not None:
+            self.reader_executor.shutdown(cancel_futures=True)
         self.db.disconnect()
+        if self.wal_mode:
+            # The executors have stopped and we disconnected, so no transaction is left to block the checkpoint
+            self.checkpoint("TRUNCATE")
 
-    async def run_threaded(self, func: Callable, *args: Any, **kwargs) -> Any:  # noqa: ANN401
+    async def run_threaded(self, func: Callable, *args: Any,  # noqa: ANN401
+                           priority: Priority = Priority.INTERACTIVE, **kwargs) -> Any:  # noqa: ANN401
         """
         Run ``func`` threaded and close DB connection at the end of the execution.
 
+        The database work is queued in the lane of the given priority of our own executor. This way, database work does
+        not compete with other users of the default executor and, e.g., remote queries cannot starve local searches.
+
         :param func: the function to be executed threaded
         :param args: args for the function call
+        :param priority: the priority of the function call
         :param kwargs: kwargs for the function call
         :return: a result of the func call.
         """
@@ -307,14 +473,61 @@ class MetadataStore:
                 if not is_main_thread:
                     self.db.disconnect()
 
-        return await get_running_loop().run_in_executor(None, wrapper)
+        return await wrap_future(self.executor.submit(priority, wrapper))
+
+    async def run_threaded_readonly(self, func: Callable, *args: Any,  # noqa: ANN401
+                                    priority: Priority = Priority.INTERACTIVE, **kwargs) -> Any:  # noqa: ANN401
+        """
+        Run ``func``, which only reads from the database, in one of the threads of the reader pool.
+
+        In WAL mode, the reader threads keep their read-only database connection between calls and their queries are
+        not blocked by concurrent writes. Otherwise, this is the same as ``run_threaded``.
+
+        :param func: the function to be executed threaded
+        :param args: args for the function call
+        :param priority: the priority of the function call
+        :param kwargs: kwargs for the function call
+        :return: a result of the func call.
+        """
+        if self.reader_executor is None:
+            return await self.run_threaded(func, *args, priority=priority, **kwargs)
+        return await wrap_future(self.reader_executor.submit(priority, func, *args, **kwargs))
+
+    def get_executor_statistics(self) -> dict[str, dict[str, dict[str, int | float]]]:
+        """
+        Get the queue statistics of the lanes of our executors.
+        """
+        statistics = {"executor": self.executor.get_statistics()}
+        if self.reader_executor is not None:
+            statistics["reader_executor"] = self.reader_executor.get_statistics()
+        return statistics
+
+    def checkpoint(self, mode: str = "PASSIVE") -> tuple[int, int, int] | None:
+        """
+        Copy the content of the write-ahead log into the database file (only in WAL mode).
+
+        A passive checkpoint does not wait for readers or writers and is safe to schedule periodically. This uses a
+        separate connection, as Pony always has a transaction open, which prevents checkpoints.
+
+        :param mode: the checkpoint mode, one of PASSIVE, FULL, RESTART or TRUNCATE.
+        :return: whether the checkpoint was blocked, the number of frames in the log and the number of checkpointed
+                 frames. None if the database does not use a write-ahead log.
+        """
+        if not self.wal_mode:
+            return None
+        connection = sqlite3.connect(self.db_path)
+        try:
+            return connection.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        finally:
+            connection.close()
 
     async def process_compressed_mdblob_threaded(self, compressed_data: bytes, **kwargs) -> list[ProcessingResult]:
         """
         Decompress the given data in a thread and return a list of uncompressed results.
         """
         try:
-            return await self.run_threaded(self.process_compressed_mdblob, compressed_data, **kwargs)
+            return await self.run_threaded(self.process_compressed_mdblob, compressed_data,
+                                           priority=Priority.INGESTION, **kwargs)
         except Exception as e:
             self._logger.exception("DB transaction error when tried to process compressed mdblob: %s: %s",
                                    e.__class__.__name__, str(e), exc_info=e)
@@ -370,7 +583,31 @@ class MetadataStore:
 
         return False
 
-    def process_squashed_mdblob(self, chunk_data: bytes, external_thread: bool = False,  # noqa: C901
+    def process_torrent_health_batch(self, health_list: list[HealthInfo]) -> None:
+        """
+        Adds or updates information about the health of multiple torrents, see ``process_torrent_health``.
+
+        The existing torrent states of all given torrents are fetched with a single query.
+
+        :param health_list: the health infos of the torrents
+        """
+        for health in health_list:
+            if not health.is_valid():
+                self._logger.warning("Invalid health info ignored: %s", str(health))
+        health_list = [health for health in health_list if health.is_valid()]
+        infohashes = {health.infohash for health in health_list}
+        torrent_states = {state.infohash: state for state
+                          in self.TorrentState.select(lambda state: state.infohash in infohashes)}
+
+        for health in health_list:
+            torrent_state = torrent_states.get(health.infohash)
+            if torrent_state is None:
+                torrent_states[health.infohash] = self.TorrentState.from_health(health)
+            elif health.should_replace(torrent_state.to_health()):
+                torrent_state.set(seeders=health.seeders, leechers=health.leechers, last_check=health.last_check,
+                                  self_checked=False)
+
+    def process_squashed_mdblob(self, chunk_data: bytes, external_thread: bool = False,
                                 health_info: list[tuple[int, int, int]] | None = None,
                                 skip_personal_metadata_payload: bool = True) -> list[ProcessingResult]:
         """
@@ -393,11 +630,15 @@ class MetadataStore:
 
         if health_info and len(health_info) == len(payload_list):
             with db_session:
-                for payload, (seeders, leechers, last_check) in zip(payload_list, health_info):
-                    if hasattr(payload, "infohash"):
-                        health = HealthInfo(payload.infohash, last_check=last_check,
-                                            seeders=seeders, leechers=leechers)
-                        self.process_torrent_health(health)
+                self.process_torrent_health_batch([HealthInfo(payload.infohash, last_check=last_check,
+                                                              seeders=seeders, leechers=leechers)
+                                                   for payload, (seeders, leechers, last_check)
+                                                   in zip(payload_list, health_info)
+                                                   if hasattr(payload, "infohash")])
+
+        # Check the signatures before the database transactions start, so that the crypto does not hold the write lock
+        payload_list = self.signature_verifier.verify([payload for payload in payload_list
+                                                       if payload.metadata_type == REGULAR_TORRENT])
 
         result = []
         total_size = len(payload_list)
@@ -409,8 +650,7 @@ class MetadataStore:
 
             # We separate the sessions to minimize database locking.
             with db_session(immediate=True):
-                for payload in batch:
-                    result.extend(self.process_payload(payload, skip_personal_metadata_payload))
+                result.extend(self.process_payloads(batch, skip_personal_metadata_payload, check_signatures=False))
 
             # Batch size adjustment
             batch_end_time = datetime.now() - batch_start_time  # noqa: DTZ005
@@ -445,38 +685,97 @@ class MetadataStore:
         """
         Write a payload to our database (if necessary).
         """
-        # Don't process our own torrents
-        if skip_personal_metadata_payload and payload.public_key == self.my_public_key_bin:
-            return []
+        return self.process_payloads([payload], skip_personal_metadata_payload)
 
-        # Don't process unknown/deprecated payloads
-        if payload.metadata_type != REGULAR_TORRENT:
-            return []
-
-        # Don't process torrents with a bad signature
-        if payload.has_signature() and not payload.check_signature():
-            return []
+    def process_payloads(self, payloads: list[TorrentMetadataPayload], skip_personal_metadata_payload: bool = True,
+                         check_signatures: bool = True) -> list[ProcessingResult]:
+        """
+        Write a batch of payloads to our database (if necessary).
 
-        # Process unsigned torrents
-        if payload.public_key == NULL_KEY:
-            node = self.TorrentMetadata.add_ffa_from_dict(payload.to_dict())
-            return [ProcessingResult(md_obj=node, obj_state=ObjState.NEW_OBJECT)] if node else []
+        Instead of looking up every payload separately, the known entries and torrent states of the whole batch are
+        fetched with a single query each. The new entries and their missing torrent states are then inserted with a
+        single statement each, see ``TorrentMetadata.insert_many``. The results are in the same order as the given
+        payloads.
 
-        # Do we already know about this object? In that case, we keep the first one (i.e., no versioning).
-        node = self.TorrentMetadata.get_for_update(public_key=payload.public_key, id_=payload.id_)
-        if node:
-            return [ProcessingResult(md_obj=node, obj_state=ObjState.DUPLICATE_OBJECT)]
+        :param check_signatures: whether to check the signatures of the payloads, i.e., if they were not already
+                                 checked by the ``signature_verifier``.
+        """
+        payloads = [
+            payload for payload in payloads
+            # Don't process our own torrents
+            if not (skip_personal_metadata_payload and payload.public_key == self.my_public_key_bin)
+            # Don't process unknown/deprecated payloads
+            and payload.metadata_type == REGULAR_TORRENT
+            # Don't process torrents with a bad signature
+            and not (check_signatures and payload.has_signature() and not payload.check_signature())
+        ]
+        if not payloads:
+            return []
 
-        # Process signed torrents
-        obj = self.TorrentMetadata.from_payload(payload)
-        return [ProcessingResult(md_obj=obj, obj_state=ObjState.NEW_OBJECT)]
+        infohashes = {payload.infohash for payload in payloads}
+        ffa_ids = {infohash_to_id(payload.infohash) for payload in payloads if payload.public_key == NULL_KEY}
+        signed_pks = {payload.public_key for payload in payloads if payload.public_key != NULL_KEY}
+        signed_ids = {payload.id_ for payload in payloads if payload.public_key != NULL_KEY}
+
+        # Unsigned (free-for-all) torrents are only added if their infohash and id_ are unknown
+        known_infohashes = set(select(g.infohash for g in self.TorrentMetadata if g.infohash in infohashes))
+        known_ffa_ids = set(select(g.id_ for g in self.TorrentMetadata if g.public_key == b"" and g.id_ in ffa_ids)
+                            ) if ffa_ids else set()
+        # Signed torrents are only added if their public_key and id_ are unknown (i.e., no versioning)
+        nodes = {(node.public_key, node.id_): node for node in self.TorrentMetadata.select(
+            lambda g: g.public_key in signed_pks and g.id_ in signed_ids)} if signed_pks else {}
+
+        new_entries = []
+        new_keys = set()
+        results = []
+        for payload in payloads:
+            if payload.public_key == NULL_KEY:
+                id_ = infohash_to_id(payload.infohash)
+                if payload.infohash in known_infohashes or id_ in known_ffa_ids:
+                    continue
+                fields = dict(payload.to_dict(), public_key=b"", status=COMMITTED, id_=id_)
+                known_ffa_ids.add(id_)
+            else:
+                key = (payload.public_key, payload.id_)
+                if key in nodes or key in new_keys:
+                    results.append((key, ObjState.DUPLICATE_OBJECT))
+                    continue
+                fields = payload.to_dict()
+                if payload.signed_blob is not None:
+                    # Keep the exact bytes that were signed, serializing the entry again may not reproduce them
+                    fields["signed_blob"] = payload.signed_blob
+            new_entries.append(fields)
+            new_keys.add((fields["public_key"], fields["id_"]))
+            known_infohashes.add(payload.infohash)
+            results.append(((fields["public_key"], fields["id_"]), ObjState.NEW_OBJECT))
+
+        for node in self.TorrentMetadata.insert_many(new_entries):
+            nodes[(node.public_key, node.id_)] = node
+        return [ProcessingResult(md_obj=nodes[key], obj_state=obj_state) for key, obj_state in results]
+
+    def get_unknown_infohashes(self, infohashes: set[bytes]) -> set[bytes]:
+        """
+        Get the given infohashes that no entry exists for.
+        """
+        if not infohashes:
+            return set()
+        return infohashes - set(select(g.infohash for g in self.TorrentMetadata if g.infohash in infohashes))
 
     @db_session
     def get_num_torrents(self) -> int:
         """
         Get the number of torrents in the database.
         """
-        return orm.count(self.TorrentMetadata.select(lambda g: g.metadata_type == REGULAR_TORRENT))
+        return self.get_entry_count(REGULAR_TORRENT)
+
+    @db_session
+    def get_entry_count(self, metadata_type: int) -> int:
+        """
+        Get the number of entries of the given metadata type, as maintained by the entry counts triggers.
+        """
+        counts = self.db.select("count FROM EntryCounts WHERE metadata_type = $metadata_type",
+                                globals={"metadata_type": metadata_type})
+        return counts[0] if counts else 0
 
     def search_keyword(self, query: str, origin_id: int | None = None) -> Query:
         """
@@ -501,8 +800,7 @@ class MetadataStore:
             # of thousands of matching torrents. The ranking of this number of torrents may be very expensive: we need
             # to retrieve each matching torrent info and the torrent state from the database for proper ordering.
             # They are scattered randomly through the entire database file, so fetching all these torrents is slow.
-            # Also, the torrent_rank function used inside the final ORDER BY section is written in Python. It is about
-            # 30 times slower than a possible similar function written in C due to SQLite-Python communication cost.
+            # Also, the torrent_rank function used for the final ordering is written in Python.
             #
             # To speed up the query, we limit and filter search results in several iterations, and each time apply
             # a more expensive ranking algorithm:
@@ -512,11 +810,10 @@ class MetadataStore:
             #     matching torrents is not that big.
             #   * Then, we sort these 10000 torrents to prioritize torrents with seeders and restrict the number
             #     of torrents to just 1000.
-            #   * Finally, in the main query, we apply a slow ranking function to these 1000 torrents to show the most
-            #     relevant torrents at the top of the search result list.
+            #   * Finally, we fetch these 1000 torrents in a single pass and rank them in bulk outside of SQLite (see
+            #     the rank_entries method) to show the most relevant torrents at the top of the search result list.
             #
-            # This multistep sort+limit sequence allows speedup queries up to two orders of magnitude. To further
-            # speed up full-text search queries, we can rewrite the torrent_rank function to C one day.
+            # This multistep sort+limit sequence allows speedup queries up to two orders of magnitude.
             fts_ids = raw_sql("""
                 SELECT fts.rowid
                 FROM (
@@ -530,7 +827,7 @@ class MetadataStore:
         return left_join(g for g in self.TorrentMetadata if g.rowid in fts_ids)
 
     @db_session
-    def get_entries_query(  # noqa: C901, PLR0912, PLR0913
+    def get_entries_query(  # noqa: C901, PLR0913
             self,
             metadata_type: int | None = None,
             channel_pk: bytes | None = None,
@@ -547,10 +844,17 @@ class MetadataStore:
             self_checked_torrent: bool | None = None,
             health_checked_after: int | None = None,
             popular: bool | None = None,
+            continuation_token: str | None = None,
     ) -> Query:
         """
         This method implements REST-friendly way to get entries from the database.
 
+        Note that text search results (``txt_filter`` without ``sort_by``) are not ordered by relevance here: the
+        ranking is performed in bulk by ``rank_entries``, which ``get_entries`` applies to this query. For the same
+        reason, the ``continuation_token`` of such searches is applied by ``get_entries`` and ignored here.
+
+        :param continuation_token: only return the entries that follow the entry this token was created for, see
+                                   ``get_continuation_token``.
         :return: PonyORM query object corresponding to the given params.
         """
         # Warning! For Pony magic to work, iteration variable name (e.g. 'g') should be the same everywhere!
@@ -566,17 +870,8 @@ class MetadataStore:
                 msg = "With `popular=True`, only `metadata_type=REGULAR_TORRENT` is allowed"
                 raise TypeError(msg)
 
-            t = time() - POPULAR_TORRENTS_FRESHNESS_PERIOD
-            health_list = list(
-                select(
-                    health for health in self.TorrentState
-                    if health.has_data == 1  # The condition had to be written this way for the partial index to work
-                    and health.last_check >= t and (health.seeders > 0 or health.leechers > 0)
-                ).order_by(
-                    lambda health: (desc(health.seeders), desc(health.leechers), desc(health.last_check))
-                )[:POPULAR_TORRENTS_COUNT]
-            )
-            pony_query = pony_query.where(lambda g: g.health in health_list)
+            health_rowids = self.get_popular_health_rowids()
+            pony_query = pony_query.where(lambda g: g.health.rowid in health_rowids)
 
         if max_rowid is not None:
             pony_query = pony_query.where(lambda g: g.rowid <= max_rowid)
@@ -610,10 +905,11 @@ class MetadataStore:
         pony_query = pony_query.sort_by("desc(g.rowid)" if sort_desc else "g.rowid")
 
         if sort_by == "HEALTH":
+            # Entries without a torrent state sort as if they have no peers, like their continuation tokens
             pony_query = pony_query.sort_by(
-                "(desc(g.health.seeders), desc(g.health.leechers))"
+                (lambda g: (desc(coalesce(g.health.seeders, 0)), desc(coalesce(g.health.leechers, 0))))
                 if sort_desc
-                else "(g.health.seeders, g.health.leechers)"
+                else (lambda g: (coalesce(g.health.seeders, 0), coalesce(g.health.leechers, 0)))
             )
         elif sort_by == "size":
             # Remark: this can be optimized to skip cases where size field does not matter
@@ -624,73 +920,109 @@ class MetadataStore:
             sort_expression = raw_sql(f"g.{sort_by} COLLATE NOCASE" + (" DESC" if sort_desc else ""))
             pony_query = pony_query.sort_by(sort_expression)
 
-        if sort_by is None:
-            if txt_filter:
-                """
-                The following call of `sort_by` produces an ORDER BY expression that looks like this:
-
-                ORDER BY
-                    case when "g"."metadata_type" = $CHANNEL_TORRENT then 1
-                         when "g"."metadata_type" = $COLLECTION_NODE then 2
-                         else 3 end,
-
-                    search_rank(
-                        $QUERY_STRING,
-                        g.title,
-                        torrentstate.seeders,
-                        torrentstate.leechers,
-                        $CURRENT_TIME - strftime('%s', g.torrent_date)
-                    ) DESC,
-
-                    "torrentstate"."last_check" DESC,
-
-                So, the channel torrents and channel folders are always on top if they are not filtered out.
-                Then regular torrents are selected in order of their relevance according to a search_rank() result.
-                If two torrents have the same search rank, they are ordered by the last time they were checked.
-
-                The search_rank() function is called directly from the SQLite query, but is implemented in Python,
-                it is actually the torrent_rank() function from core/utilities/search_utils.py, wrapped with
-                keep_exception() to return possible exception from SQLite to Python.
-
-                The search_rank() function receives the following arguments:
-                  - the current query string (like "Big Buck Bunny");
-                  - the title of the current torrent;
-                  - the number of seeders;
-                  - the number of leechers;
-                  - the number of seconds since the torrent's creation time.
-                """
-
-                pony_query = pony_query.sort_by(
-                    f"""
-                    (1 if g.metadata_type == {CHANNEL_TORRENT} else 2 if g.metadata_type == {COLLECTION_NODE} else 3),
-                    raw_sql('''search_rank(
-                        $txt_filter, g.title, torrentstate.seeders, torrentstate.leechers,
-                        $int(time()) - strftime('%s', g.torrent_date)
-                    ) DESC'''),
-                    desc(g.health.last_check)  # just to trigger the TorrentState table inclusion into the left join
-                """
-                )
-            elif popular:
-                pony_query = pony_query.sort_by('(desc(g.health.seeders), desc(g.health.leechers))')
+        if sort_by is None and popular and not txt_filter:
+            pony_query = pony_query.sort_by(
+                lambda g: (desc(coalesce(g.health.seeders, 0)), desc(coalesce(g.health.leechers, 0))))
+
+        if continuation_token is not None and not (txt_filter and sort_by is None):
+            pony_query = self.seek_entries_query(pony_query, continuation_token, sort_by, sort_desc, popular)
 
         return pony_query
 
-    async def get_entries_threaded(self, **kwargs) -> list[TorrentMetadata]:
+    def seek_entries_query(self, pony_query: Query, continuation_token: str, sort_by: str | None = None,
+                           sort_desc: bool = True, popular: bool | None = None) -> Query:
+        """
+        Restrict a sorted query to the entries that follow the entry of the given continuation token.
+
+        Instead of skipping all preceding entries (OFFSET), this compares the (sort key, rowid) of every entry to that
+        of the last entry of the previous page, which allows SQLite to seek directly to the next page using an index.
+
+        :raises ValueError: if the continuation token is malformed.
+        """
+        # The local variables are referenced by name in the query strings below
+        sort_key, rowid = decode_continuation_token(continuation_token)  # noqa: RUF059
+        after = "<" if sort_desc else ">"
+        if sort_by is None and not popular:
+            return pony_query.where(f"g.rowid {after} rowid")
+        if sort_by in ("HEALTH", None):
+            if not (isinstance(sort_key, list) and len(sort_key) == 2 and all(isinstance(v, int) for v in sort_key)):
+                msg = f"Invalid continuation token for a sort by health: {continuation_token!r}"
+                raise ValueError(msg)
+            seeders, leechers = sort_key  # noqa: RUF059
+            health_after = after if sort_by else "<"  # Popular torrents are always sorted by descending health
+            return pony_query.where(f"coalesce(g.health.seeders, 0) {health_after} seeders"
+                                    f" or coalesce(g.health.seeders, 0) == seeders"
+                                    f" and (coalesce(g.health.leechers, 0) {health_after} leechers"
+                                    f" or coalesce(g.health.leechers, 0) == leechers and g.rowid {after} rowid)")
+        if not isinstance(sort_key, int if sort_by in ("size", "status") else str):
+            msg = f"Invalid continuation token for a sort by {sort_by}: {continuation_token!r}"
+            raise ValueError(msg)  # noqa: TRY004
+        if sort_by == "size":
+            return pony_query.where(f"g.size {after} sort_key or g.size == sort_key and g.rowid {after} rowid")
+        if sort_by == "infohash":
+            sort_key = bytes.fromhex(str(sort_key))
+        return pony_query.where(raw_sql(f'("g"."{sort_by}" COLLATE NOCASE, "g"."rowid") {after} ($sort_key, $rowid)'))
+
+    @staticmethod
+    def get_continuation_token(entry: TorrentMetadata, sort_by: str | None = None,
+                               popular: bool | None = None) -> str:
+        """
+        Create a continuation token to request the entries that follow the given entry, using the same sorting.
+        """
+        if sort_by == "HEALTH" or (sort_by is None and popular):
+            health = entry.health
+            sort_key = [health.seeders or 0, health.leechers or 0] if health else [0, 0]
+        elif sort_by == "torrent_date":
+            sort_key = entry.torrent_date.strftime("%Y-%m-%d %H:%M:%S.%f")  # The way the database stores it
+        elif sort_by == "infohash":
+            sort_key = entry.infohash.hex()
+        elif sort_by is not None:
+            sort_key = getattr(entry, sort_by)
+        else:
+            sort_key = None
+        return encode_continuation_token(sort_key, entry.rowid)
+
+    async def get_entries_threaded(self, priority: Priority = Priority.INTERACTIVE,
+                                   **kwargs) -> list[TorrentMetadata]:
         """
         Retrieve entries in a thread and return a list of results.
         """
-        return await self.run_threaded(self.get_entries, **kwargs)
+        return await self.run_threaded_readonly(self.get_entries, priority=priority, **kwargs)
 
     @db_session
-    def get_entries(self, first: int = 1, last: int | None = None, **kwargs) -> list[TorrentMetadata]:
+    def get_entries(self, first: int = 1, last: int | None = None, continuation_token: str | None = None,
+                    **kwargs) -> list[TorrentMetadata]:
         """
         Get some torrents. Optionally sort the results by a specific field, or filter the channels based
         on a keyword/whether you are subscribed to it.
 
+        If a continuation token is given, the (at most) ``last - first + 1`` entries that follow the entry of the token
+        are returned, instead of the entries at positions ``first`` to ``last``.
+
         :return: A list of class members
         """
-        pony_query = self.get_entries_query(**kwargs)
-        result = pony_query[(first or 1) - 1: last]
+        if continuation_token is not None:
+            count = None if last is None else max(last - (first or 1) + 1, 0)
+            first, last = 1, count
+        if kwargs.get("txt_filter") and kwargs.get("sort_by") is None:
+            # Ranked searches are cached, so that requesting the next page does not rank all candidates again
+            max_rowid = self.get_max_rowid()
+            ranked_rowids = self.search_cache.get(kwargs, max_rowid)
+            if ranked_rowids is None:
+                ranked = self.rank_entries(self.get_entries_query(**kwargs), kwargs["txt_filter"])
+                self.search_cache.put(kwargs, max_rowid, ranked)
+                ranked_rowids = [rowid for rowid, _ in ranked]
+            if continuation_token is not None:
+                # The token of a ranked search points into the ranking, which may have changed since the previous
+                # page. If the entry is gone altogether, there is no meaningful place to continue.
+                _, rowid = decode_continuation_token(continuation_token)
+                start = ranked_rowids.index(rowid) + 1 if rowid in ranked_rowids else len(ranked_rowids)
+                ranked_rowids = ranked_rowids[start:]
+            rowids = ranked_rowids[(first or 1) - 1: last]
+            entries = {entry.rowid: entry for entry in self.TorrentMetadata.select(lambda g: g.rowid in rowids)}
+            result = [entries[rowid] for rowid in rowids if rowid in entries]
+        else:
+            result = self.get_entries_query(continuation_token=continuation_token, **kwargs)[(first or 1) - 1: last]
         for entry in result:
             # ACHTUNG! This is necessary in order to load entry.health inside db_session,
             # to be able to perform successfully `entry.to_simple_dict()` later
@@ -698,20 +1030,70 @@ class MetadataStore:
         return result
 
     @db_session
-    def get_total_count(self, **kwargs) -> int | None:
+    def rank_entries(self, pony_query: Query, txt_filter: str) -> list[tuple[int, bytes]]:
         """
-        Get total count of torrents that would be returned if there would be no pagination/limits/sort.
+        Get the rowids and infohashes of the entries of a text search query, ordered by their search rank.
+
+        All candidates are fetched with their pre-tokenized title and health in a single pass and ranked at once.
+        Channels come first, then collections and then the other entries. Within these groups, entries are ordered by
+        their search rank, entries with the same search rank by the last time they were checked, and then by their
+        rowid (newest first).
+
+        :param pony_query: the query to rank the entries of, see ``get_entries_query``.
+        :param txt_filter: the text query the entries are ranked by.
+        :return: a list of (rowid, infohash) tuples, the most relevant entry first.
         """
-        for p in ["first", "last", "sort_by", "sort_desc"]:
+        candidates = list(left_join((g.rowid, g.infohash, g.title, g.health.seeders, g.health.leechers, g.torrent_date,
+                                     g.health.last_check,
+                                     raw_sql('(SELECT tt.tokens FROM TitleTokens tt WHERE tt.rowid = "g"."rowid")'),
+                                     g.metadata_type)
+                                    for g in pony_query))
+        now = int(time())
+        ranks = torrent_ranks(txt_filter, [(title if tokens is None else tokens.split(), seeders, leechers,
+                                            now - time2int(torrent_date) if torrent_date else None)
+                                           for _, _, title, seeders, leechers, torrent_date, _, tokens, _ in candidates])
+        type_order = {CHANNEL_TORRENT: 1, COLLECTION_NODE: 2}
+        ranked = sorted(zip(ranks, candidates),
+                        key=lambda item: (type_order.get(item[1][8], 3), -item[0], -(item[1][6] or 0), -item[1][0]))
+        return [(candidate[0], candidate[1]) for _, candidate in ranked]
+
+    @db_session
+    def estimate_total_count(self, cap: int = TOTAL_COUNT_CAP, **kwargs) -> tuple[int, bool]:
+        """
+        Get a cheap estimate of the total count of torrents that match the query, ignoring pagination.
+
+        Unfiltered counts come from the entry counts table and ranked searches that are cached are counted exactly.
+        Otherwise, at most ``cap + 1`` matching rowids are fetched, newest first. If there are more matches than
+        ``cap``, the total is extrapolated from the fraction of the rowid range that these matches span.
+
+        :return: the (estimated) count and whether it is an estimate.
+        """
+        for p in ["first", "last", "continuation_token"]:
+            kwargs.pop(p, None)
+        if kwargs.get("txt_filter") and kwargs.get("sort_by") is None:
+            ranked_rowids = self.search_cache.peek(kwargs, self.get_max_rowid())
+            if ranked_rowids is not None:
+                return len(ranked_rowids), False
+        for p in ["sort_by", "sort_desc"]:
             kwargs.pop(p, None)
-        return self.get_entries_query(**kwargs).count()
+
+        metadata_type = kwargs.pop("metadata_type", None)
+        if metadata_type is not None and all(value is None or value is False for value in kwargs.values()):
+            return self.get_entry_count(metadata_type), False
+
+        rowids = select(g.rowid for g in self.get_entries_query(metadata_type=metadata_type, **kwargs)
+                        ).order_by(desc(1))[:cap + 1]
+        if len(rowids) <= cap:
+            return len(rowids), False
+        top = kwargs.get("max_rowid") or self.get_max_rowid()
+        return max(cap + 1, round(len(rowids) * top / (top - rowids[-1] + 1))), True
 
     @db_session
     def get_entries_count(self, **kwargs) -> int | None:
         """
         Get the count of torrents that would be returned if there would be no pagination/limits.
         """
-        for p in ["first", "last"]:
+        for p in ["first", "last", "continuation_token"]:
             kwargs.pop(p, None)
         return self.get_entries_query(**kwargs).count()
 
@@ -722,46 +1104,161 @@ class MetadataStore:
         """
         return select(max(obj.rowid) for obj in self.TorrentMetadata).get() or 0
 
+    def get_popular_health_rowids(self) -> list[int]:
+        """
+        Get the rowids of the torrent states of the most popular torrents, most popular first.
+
+        The popular torrents are precomputed, see ``PopularTorrents``. They are only queried if the precomputed list
+        is stale.
+        """
+        now = int(time())
+        rowids = self.popular_torrents.get(now)
+        if rowids is not None:
+            return rowids
+
+        version = self.popular_torrents.start_refresh()
+        t = now - POPULAR_TORRENTS_FRESHNESS_PERIOD
+        rows = list(
+            select(
+                (health.rowid, health.seeders, health.leechers, health.last_check) for health in self.TorrentState
+                if health.has_data == 1  # The condition had to be written this way for the partial index to work
+                and health.last_check >= t and (health.seeders > 0 or health.leechers > 0)
+            ).order_by(-2, -3, -4)[:POPULAR_TORRENTS_COUNT]
+        )
+        self.popular_torrents.refresh(rows, now, version)
+        return [row[0] for row in rows]
+
+    def on_torrent_state_change(self, state: TorrentState) -> None:
+        """
+        Process a torrent state that was inserted or updated.
+        """
+        self.search_cache.invalidate_infohash(state.infohash)
+        self.popular_torrents.update(state.rowid, PopularEntry(state.seeders or 0, state.leechers or 0,
+                                                               state.last_check or 0), int(time()))
+        if state.has_data:
+            self.record_health_change(state)
+
+    def record_health_change(self, state: TorrentState) -> None:
+        """
+        Remember the health of a torrent state that changed, if the health changes are collected.
+        """
+        if self.health_changes is None:
+            return
+        with self.health_changes_lock:
+            self.health_changes[state.infohash] = (state.seeders or 0, state.leechers or 0, state.last_check or 0)
+
+    def pop_health_changes(self) -> dict[bytes, tuple[int, int, int]]:
+        """
+        Get and forget the health of the torrents with metadata that changed since the previous call.
+
+        This includes the health that other peers gave us. The health changes are only collected after the first call,
+        so that they do not pile up when nobody uses them.
+        """
+        with self.health_changes_lock:
+            changes = self.health_changes or {}
+            self.health_changes = {}
+        return changes
+
+    def on_torrent_metadata_update(self, entry: TorrentMetadata, changed: set[str]) -> None:
+        """
+        Process an entry that is about to be updated.
+
+        :param entry: the updated entry.
+        :param changed: the names of the changed fields of the entry.
+        """
+        if changed & RANKED_FIELDS:
+            # The entry may now match, or stop matching, any search
+            self.search_cache.clear()
+
+    def on_torrent_state_seeders_change(self, state: TorrentState, old_seeders: int) -> None:
+        """
+        Remember the change in seeders of a torrent state, to update the auto-completion index later.
+        """
+        delta = max(state.seeders or 0, 0) - max(old_seeders, 0)
+        with self.seeders_changes_lock:
+            self.seeders_changes[state.rowid] = self.seeders_changes.get(state.rowid, 0) + delta
+
     fts_keyword_search_re = re.compile(r'\w+', re.UNICODE)
 
+    def get_watermark(self) -> int:
+        """
+        Get the highest row id that was inserted, without querying the database.
+        """
+        return self.max_rowid
+
+    def on_torrent_metadata_insert(self, entry: TorrentMetadata) -> None:
+        """
+        Keep track of the highest row id, index the title and remember the health of a newly inserted entry.
+        """
+        self.max_rowid = max(self.max_rowid, entry.rowid)
+        self.add_to_auto_complete(entry)
+        if entry.health:
+            # The torrent state may have been added before its metadata
+            self.record_health_change(entry.health)
+
+    def add_to_auto_complete(self, entry: TorrentMetadata) -> None:
+        """
+        Add the title of a newly inserted entry to the auto-completion index.
+        """
+        self.auto_complete.add_words(tokenize_title(entry.title).split(), entry.health.seeders if entry.health else 0)
+
+    def fill_auto_complete_index(self) -> None:
+        """
+        Add the titles of all entries in the database to the auto-completion index.
+
+        This only uses ``db.select``, which (unlike ``db.execute``) does not start a write transaction, so that it can
+        run on the read-only connections of the reader pool.
+        """
+        with db_session:
+            rows = self.db.select("""
+                tt.tokens, coalesce(ts.seeders, 0)
+                FROM TitleTokens tt
+                JOIN ChannelNode cn ON cn.rowid = tt.rowid
+                LEFT JOIN TorrentState ts ON cn.health = ts.rowid
+            """)
+        for tokens, seeders in rows:
+            self.auto_complete.add_words(tokens.split(), seeders)
+
+    def update_auto_complete_weights(self) -> None:
+        """
+        Apply the changes in seeders of the torrent states to the weights of the titles in the auto-completion index.
+
+        Like ``fill_auto_complete_index``, this can run on the reader pool. If the titles cannot be read, the changes
+        are kept for the next update.
+        """
+        with self.seeders_changes_lock:
+            changes, self.seeders_changes = self.seeders_changes, {}
+        rowids = [rowid for rowid, delta in changes.items() if delta]
+        rows = []
+        try:
+            with db_session:
+                for i in range(0, len(rowids), MAX_BATCH_SIZE):
+                    batch = ",".join(str(int(rowid)) for rowid in rowids[i:i + MAX_BATCH_SIZE])
+                    rows.extend(self.db.select(f"""
+                        tt.tokens, cn.health
+                        FROM ChannelNode cn
+                        JOIN TitleTokens tt ON tt.rowid = cn.rowid
+                        WHERE cn.health IN ({batch})
+                    """))
+        except Exception:
+            with self.seeders_changes_lock:
+                for rowid, delta in changes.items():
+                    self.seeders_changes[rowid] = self.seeders_changes.get(rowid, 0) + delta
+            raise
+        for tokens, health_rowid in rows:
+            self.auto_complete.change_weight(tokens.split(), changes[health_rowid])
+
     def get_auto_complete_terms(self, text: str, max_terms: int) -> list[str]:
         """
         Get the auto-completion terms for a given query.
+
+        The terms are looked up in the in-memory auto-completion index, which does not query the database.
         """
         if not text:
             return []
 
-        words = self.fts_keyword_search_re.findall(text)
+        words = self.fts_keyword_search_re.findall(text.lower())
         if not words:
             return []
 
-        fts_query = '"{}"*'.format(" ".join(f"{word}" for word in words))
-        suggestion_pattern = r'\W+'.join(word for word in words) + r'(\W*)((?:[.-]?\w)*)'
-        suggestion_re = re.compile(suggestion_pattern, re.UNICODE)
-
-        with db_session:
-            titles = self.db.select("""
-                cn.title
-                FROM ChannelNode cn
-                LEFT JOIN TorrentState ts ON cn.health = ts.rowid
-                WHERE cn.rowid in (
-                    SELECT rowid FROM FtsIndex WHERE FtsIndex MATCH $fts_query ORDER BY rowid DESC LIMIT $max_terms
-                )
-                ORDER BY coalesce(ts.seeders, 0) DESC
-            """, globals={"fts_query": fts_query, "max_terms": max_terms})
-
-        result = []
-        for title in titles:
-            match = suggestion_re.search(title.lower())
-            if match:
-                # group(2) is the ending of the last word (if the word is not finished) or the next word
-                continuation = match.group(2)
-                if re.match(r'^.*\w$', text) and match.group(1):  # group(1) is non-word symbols (spaces, commas, etc.)
-                    continuation = match.group(1) + continuation
-                suggestion = text + continuation
-                if suggestion not in result:
-                    result.append(suggestion)
-                    if len(result) >= max_terms:
-                        break
-
-        return result
+        return self.auto_complete.suggest(words, max_terms)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from typing import Iterable, NamedTuple
+
+
+class IndexChange(NamedTuple):
+    """
+    A statement that started or stopped being shown, see ``SubjectIndex.update``.
+    """
+
+    predicate: int
+    name: str
+    object_id: int
+    subject_id: int
+    shown: bool
+
+
+def intersect_sorted(lists: list[list[int]]) -> list[int]:
+    """
+    Intersect sorted lists of unique numbers.
+
+    The shortest list is the initial candidate list, of which every candidate is looked up in the other lists by
+    bisection. The lower bound of the bisection only moves forward, so every list is passed through once at most.
+    """
+    if not lists:
+        return []
+    lists = sorted(lists, key=len)
+    candidates = lists[0]
+    for other in lists[1:]:
+        remaining = []
+        lo = 0
+        for value in candidates:
+            lo = bisect_left(other, value, lo)
+            if lo == len(other):
+                break
+            if other[lo] == value:
+                remaining.append(value)
+        candidates = remaining
+        if not candidates:
+            break
+    return candidates
+
+
+class SubjectIndex:
+    """
+    An in-memory inverted index from the objects of the shown statements (e.g., tags) to their subjects (e.g., torrents).
+
+    The index stores the resource ids of the subjects of every object as a sorted list. Objects are looked up by their
+    predicate and lower-cased name, so a case-insensitive lookup does not have to scan all names.
+
+    The index is filled from the database once, which can happen in a separate thread. Until then, changes are
+    collected and applied after the initial contents are in.
+    """
+
+    def __init__(self) -> None:
+        """
+        Create a new empty index.
+        """
+        self.subjects: dict[int, list[int]] = {}
+        self.objects: dict[tuple[int, str], dict[str, int]] = {}
+        self.ready = False
+        self.pending: list[IndexChange] = []
+        self.lock = threading.Lock()
+
+    def fill(self, statements: Iterable[tuple[int, str, int, int]]) -> None:
+        """
+        Fill the index with the initial shown statements and apply the changes that were made in the meantime.
+
+        :param statements: (predicate, object name, object id, subject id) tuples of all shown statements.
+        """
+        subjects: dict[int, list[int]] = {}
+        objects: dict[tuple[int, str], dict[str, int]] = {}
+        for predicate, name, object_id, subject_id in statements:
+            if object_id not in subjects:
+                subjects[object_id] = []
+                objects.setdefault((predicate, name.lower()), {})[name] = object_id
+            subjects[object_id].append(subject_id)
+        for subject_ids in subjects.values():
+            subject_ids.sort()
+
+        with self.lock:
+            self.subjects = subjects
+            self.objects = objects
+            for change in self.pending:
+                self._apply(change)
+            self.pending = []
+            self.ready = True
+
+    def update(self, change: IndexChange) -> None:
+        """
+        Add a statement that is now shown or remove a statement that is no longer shown.
+        """
+        with self.lock:
+            if self.ready:
+                self._apply(change)
+            else:
+                self.pending.append(change)
+
+    def _apply(self, change: IndexChange) -> None:
+        """
+        Apply a single change to the index, which may already contain it.
+        """
+        subject_ids = self.subjects.get(change.object_id, [])
+        i = bisect_left(subject_ids, change.subject_id)
+        found = i < len(subject_ids) and subject_ids[i] == change.subject_id
+        if change.shown and not found:
+            if not subject_ids:
+                self.subjects[change.object_id] = subject_ids
+                self.objects.setdefault((change.predicate, change.name.lower()), {})[change.name] = change.object_id
+            subject_ids.insert(i, change.subject_id)
+        elif not change.shown and found:
+            del subject_ids[i]
+            if not subject_ids:
+                self.subjects.pop(change.object_id)
+                names = self.objects[(change.predicate, change.name.lower())]
+                names.pop(change.name)
+                if not names:
+                    self.objects.pop((change.predicate, change.name.lower()))
+
+    def get_subject_ids(self, predicate: int, name: str, case_sensitive: bool = True) -> list[int]:
+        """
+        Get the sorted ids of the subjects of a single object. The returned list should not be modified.
+        """
+        object_ids = self.objects.get((predicate, name.lower()), {})
+        if case_sensitive:
+            return self.subjects[object_ids[name]] if name in object_ids else []
+        lists = [self.subjects[object_id] for object_id in object_ids.values()]
+        if len(lists) == 1:
+            return lists[0]
+        return sorted(set().union(*lists))
+
+    def intersect(self, predicate: int, names: Iterable[str], case_sensitive: bool = True) -> list[int]:
+        """
+        Get the sorted ids of the subjects that have all of the given objects.
+        """
+        with self.lock:
+            return list(intersect_sorted([self.get_subject_ids(predicate, name, case_sensitive) for name in names]))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tribler.core.database.serialization import SignedPayload
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class SignatureVerifier:
+    """
+    Check the signatures of incoming payloads in a thread pool, before they enter a database transaction.
+
+    The signature checks are performed by libsodium, which releases the GIL, so the threads verify in parallel.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS) -> None:
+        """
+        Create a new verifier that uses, at most, the given number of threads.
+        """
+        self.executor = ThreadPoolExecutor(max_workers, thread_name_prefix="SignatureVerifier")
+        self.lock = threading.Lock()
+
+        self.verified = 0
+        self.rejected = 0
+        self.seconds = 0.0
+
+    def verify(self, payloads: list[SignedPayload]) -> list[SignedPayload]:
+        """
+        Get the given payloads, without those that have an invalid signature. Unsigned payloads are kept.
+        """
+        signed = [payload for payload in payloads if payload.has_signature()]
+        start = time.time()
+        if len(signed) > 1:
+            valid = list(self.executor.map(lambda payload: payload.check_signature(), signed))
+        else:
+            valid = [payload.check_signature() for payload in signed]
+        duration = time.time() - start
+
+        rejected = {id(payload) for payload, is_valid in zip(signed, valid) if not is_valid}
+        with self.lock:
+            self.verified += len(signed) - len(rejected)
+            self.rejected += len(rejected)
+            self.seconds += duration
+        return [payload for payload in payloads if id(payload) not in rejected]
+
+    def get_statistics(self) -> dict[str, int | float]:
+        """
+        Get the verification counters and the verification throughput (in signatures per second).
+        """
+        checked = self.verified + self.rejected
+        return {"verified": self.verified, "rejected": self.rejected,
+                "per_second": checked / self.seconds if self.seconds else 0.0}
+
+    def shutdown(self) -> None:
+        """
+        Stop the verification threads.
+        """
+        self.executor.shutdown(wait=False)
@@ -1,15 +1,16 @@
+from __future__ import annotations
+
 import random
+from asyncio import CancelledError, get_running_loop
 from binascii import unhexlify
+from typing import TYPE_CHECKING
 
 from cryptography.exceptions import InvalidSignature
 from ipv8.community import Community, CommunitySettings
-from ipv8.keyvault.private.libnaclkey import LibNaCLSK
 from ipv8.lazy_community import lazy_wrapper
-from ipv8.types import Key, Peer
-from pony.orm import db_session
+from pony.orm import DBException, OrmError, db_session
 
 from tribler.core.database.layers.knowledge import Operation, ResourceType
-from tribler.core.database.tribler_database import TriblerDatabase
 from tribler.core.knowledge.operations_requests import OperationsRequests, PeerValidationError
 from tribler.core.knowledge.payload import (
     RawStatementOperationMessage,
@@ -19,6 +20,17 @@ from tribler.core.knowledge.payload import (
     StatementOperationSignature,
 )
 
+if TYPE_CHECKING:
+    from asyncio import Future
+
+    from ipv8.keyvault.private.libnaclkey import LibNaCLSK
+    from ipv8.types import Key, Peer
+    from typing_extensions import TypeAlias
+
+    from tribler.core.database.tribler_database import TriblerDatabase
+
+    ReceivedOperation: TypeAlias = tuple[StatementOperation, bytes, bytes]  # The operation, packed, and its signature
+
 REQUESTED_OPERATIONS_COUNT = 10
 CLEAR_ALL_REQUESTS_INTERVAL = 10 * 60  # 10 minutes
 
@@ -31,6 +43,8 @@ class KnowledgeCommunitySettings(CommunitySettings):
     db: TriblerDatabase
     key: LibNaCLSK
     request_interval: int = 5
+    ingestion_delay: float = 0.1  # Seconds to collect received operations, before they are verified and stored
+    max_ingestion_batch: int = 100  # The maximum number of received operations that is stored in one transaction
 
 
 class KnowledgeCommunity(Community):
@@ -49,6 +63,10 @@ class KnowledgeCommunity(Community):
         self.db = settings.db
         self.key = settings.key
         self.requests = OperationsRequests()
+        self.ingestion_delay = settings.ingestion_delay
+        self.max_ingestion_batch = settings.max_ingestion_batch
+        self.received_operations: list[ReceivedOperation] = []
+        self.ingestion_task: Future | None = None
 
         self.add_message_handler(RawStatementOperationMessage, self.on_message)
         self.add_message_handler(RequestStatementOperationMessage, self.on_request)
@@ -78,25 +96,97 @@ class KnowledgeCommunity(Community):
         signature, _ = self.serializer.unpack_serializable(StatementOperationSignature, raw.signature)
         self.logger.debug("<- message received: %s", str(operation))
         try:
-            remote_key = self.crypto.key_from_public_bin(operation.creator_public_key)
-
             self.requests.validate_peer(peer)
-            self.verify_signature(packed_message=raw.operation, key=remote_key, signature=signature.signature,
-                                  operation=operation)
             self.validate_operation(operation)
-
-            with db_session():
-                is_added = self.db.knowledge.add_operation(operation, signature.signature)
-                if is_added:
-                    s = f"+ operation added ({operation.object!r} \"{operation.predicate}\" {operation.subject!r})"
-                    self.logger.info(s)
-
         except PeerValidationError as e:  # peer has exhausted his response count
             self.logger.warning(e)
+            return
         except ValueError as e:  # validation error
             self.logger.warning(e)
-        except InvalidSignature as e:  # signature verification error
-            self.logger.warning(e)
+            return
+
+        self.received_operations.append((operation, raw.operation, signature.signature))
+        self.schedule_ingestion()
+
+    def schedule_ingestion(self) -> None:
+        """
+        Start processing the received operations after the ingestion delay, unless this is already scheduled.
+
+        Every run gets a task name of its own, as a run schedules the next one when it stops with operations left.
+        """
+        if self.ingestion_task is None or self.ingestion_task.done():
+            self.ingestion_task = self.register_anonymous_task("process_received_operations",
+                                                               self.process_received_operations,
+                                                               delay=self.ingestion_delay, ignore=(Exception,))
+
+    async def process_received_operations(self) -> None:
+        """
+        Verify the signatures of the received operations in a thread and store the valid operations.
+
+        The operations that arrive in bursts, e.g., as the response to a request, are stored in a single transaction.
+        If processing fails, the operations that are left are processed by a new run.
+        """
+        cancelled = False
+        try:
+            while self.received_operations:
+                batch = self.received_operations[:self.max_ingestion_batch]
+                self.received_operations = self.received_operations[self.max_ingestion_batch:]
+
+                valid = await get_running_loop().run_in_executor(None, self.verify_operations, batch)
+                if not valid:
+                    continue
+                results = self.store_operations(valid)
+                for (operation, _), is_added in zip(valid, results):
+                    if is_added:
+                        s = f"+ operation added ({operation.object!r} \"{operation.predicate}\" {operation.subject!r})"
+                        self.logger.info(s)
+        except CancelledError:
+            cancelled = True
+            raise
+        finally:
+            self.ingestion_task = None
+            if self.received_operations and not cancelled:
+                self.schedule_ingestion()
+
+    def store_operations(self, operations: list[tuple[StatementOperation, bytes]]) -> list[bool]:
+        """
+        Store the given operations in a single transaction and get, for every operation, whether it was added.
+
+        If the transaction fails, every operation is stored in a transaction of its own. That way, a single operation
+        that cannot be stored does not keep the others from being stored.
+        """
+        try:
+            with db_session():
+                return self.db.knowledge.add_operations(operations)
+        except (DBException, OrmError, ValueError) as e:
+            self.logger.warning("Failed to store a batch of %d operations: %s", len(operations), e)
+
+        results = []
+        for operation, signature in operations:
+            try:
+                with db_session():
+                    results.extend(self.db.knowledge.add_operations([(operation, signature)]))
+            except (DBException, OrmError, ValueError) as e:
+                self.logger.warning("Failed to store operation %s: %s", operation, e)
+                results.append(False)
+        return results
+
+    def verify_operations(self, operations: list[ReceivedOperation]) -> list[tuple[StatementOperation, bytes]]:
+        """
+        Get the operations that are correctly signed by their creator, with their signature.
+        """
+        valid = []
+        for operation, packed, signature in operations:
+            try:
+                remote_key = self.crypto.key_from_public_bin(operation.creator_public_key)
+                self.verify_signature(packed_message=packed, key=remote_key, signature=signature, operation=operation)
+            except ValueError as e:  # key error
+                self.logger.warning(e)
+            except InvalidSignature as e:  # signature verification error
+                self.logger.warning(e)
+            else:
+                valid.append((operation, signature))
+        return valid
 
     @lazy_wrapper(RequestStatementOperationMessage)
     def on_request(self, peer: Peer, operation: RequestStatementOperationMessage) -> None:
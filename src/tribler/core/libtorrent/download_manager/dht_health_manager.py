@@ -10,24 +10,33 @@ from ipv8.taskmanager import TaskManager
 
 from tribler.core.torrent_checker.dataclasses import HealthInfo
 
+# The alerts that carry the DHT packets and get_peers replies, which are only needed during lookups
+LOOKUP_ALERT_MASK = lt.alert.category_t.dht_log_notification | lt.alert.category_t.dht_operation_notification
+
 
 class DHTHealthManager(TaskManager):
     """
     This class manages BEP33 health requests to the libtorrent DHT.
+
+    If none of the DHT nodes support BEP33, the number of peers that the DHT returns is used as an estimate instead.
     """
 
-    def __init__(self, lt_session: lt.session) -> None:
+    def __init__(self, lt_session: lt.session, alert_mask: int | None = None) -> None:
         """
         Initialize the DHT health manager.
 
         :param lt_session: The session used to perform health lookups.
+        :param alert_mask: The alert mask of the session, which is extended with the DHT alerts during lookups. If not
+                           given, the alert mask of the session is left alone.
         """
         TaskManager.__init__(self)
         self.lookup_futures: dict[bytes, Future[HealthInfo]] = {}  # Map from binary infohash to future
         self.bf_seeders: dict[bytes, bytearray] = {}  # Map from infohash to (final) seeders bloomfilter
         self.bf_peers: dict[bytes, bytearray] = {}  # Map from infohash to (final) peers bloomfilter
+        self.peers: dict[bytes, set[tuple[str, int]]] = {}  # Map from infohash to the peers that the DHT returned
         self.outstanding: dict[str, bytes] = {}  # Map from transaction_id to infohash
         self.lt_session = lt_session
+        self.alert_mask = alert_mask
 
     def get_health(self, infohash: bytes, timeout: float = 15) -> Awaitable[HealthInfo]:
         """
@@ -39,15 +48,19 @@ class DHTHealthManager(TaskManager):
         if infohash in self.lookup_futures:
             return self.lookup_futures[infohash]
 
+        if not self.lookup_futures and self.alert_mask is not None:
+            self.lt_session.set_alert_mask(self.alert_mask | LOOKUP_ALERT_MASK)
+
         lookup_future: Future[HealthInfo] = Future()
         self.lookup_futures[infohash] = lookup_future
         self.bf_seeders[infohash] = bytearray(256)
         self.bf_peers[infohash] = bytearray(256)
+        self.peers[infohash] = set()
 
         # Perform a get_peers request. This should result in get_peers responses with the BEP33 bloom filters.
         self.lt_session.dht_get_peers(lt.sha1_hash(bytes(infohash)))
 
-        self.register_task(f"lookup_{hexlify(infohash).decode}", self.finalize_lookup, infohash, delay=timeout)
+        self.register_task(f"lookup_{hexlify(infohash).decode()}", self.finalize_lookup, infohash, delay=timeout)
 
         return lookup_future
 
@@ -68,11 +81,17 @@ class DHTHealthManager(TaskManager):
         bf_peers = self.bf_peers.pop(infohash)
         seeders = DHTHealthManager.get_size_from_bloomfilter(bf_seeders)
         peers = DHTHealthManager.get_size_from_bloomfilter(bf_peers)
+        if seeders == peers == 0:
+            # No BEP33 bloom filters came in: the returned peers may be seeders or leechers, we can't tell
+            peers = len(self.peers[infohash])
+        self.peers.pop(infohash)
         if not self.lookup_futures[infohash].done():
             health = HealthInfo(infohash, seeders=seeders, leechers=peers)
             self.lookup_futures[infohash].set_result(health)
 
         self.lookup_futures.pop(infohash, None)
+        if not self.lookup_futures and self.alert_mask is not None:
+            self.lt_session.set_alert_mask(self.alert_mask)
 
     @staticmethod
     def combine_bloomfilters(bf1: bytearray, bf2: bytearray) -> bytearray:
@@ -119,6 +138,16 @@ class DHTHealthManager(TaskManager):
         c = min(m - 1, total_zeros)
         return int(math.log(c / float(m)) / (2 * math.log(1 - 1 / float(m))))
 
+    def received_peers(self, infohash: bytes, peers: list[tuple[str, int]]) -> None:
+        """
+        The libtorrent DHT has returned peers for an infohash that we may be looking up.
+
+        :param infohash: The infohash of the peers.
+        :param peers: The (ip, port) addresses of the peers.
+        """
+        if infohash in self.peers:
+            self.peers[infohash].update(peers)
+
     def requesting_bloomfilters(self, transaction_id: str, infohash: bytes) -> None:
         """
         Tne libtorrent DHT has sent a get_peers query for an infohash we may be interested in.
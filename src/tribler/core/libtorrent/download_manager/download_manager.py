@@ -24,6 +24,7 @@ from ipv8.taskmanager import TaskManager
 from validate import Validator
 from yarl import URL
 
+from tribler.core.libtorrent.download_manager.dht_health_manager import DHTHealthManager
 from tribler.core.libtorrent.download_manager.download import Download
 from tribler.core.libtorrent.download_manager.download_config import DownloadConfig
 from tribler.core.libtorrent.download_manager.download_state import DownloadState, DownloadStatus
@@ -32,7 +33,6 @@ from tribler.core.libtorrent.uris import unshorten, url_to_path
 from tribler.core.notifier import Notification, Notifier
 
 if TYPE_CHECKING:
-    from tribler.core.libtorrent.download_manager.dht_health_manager import DHTHealthManager
     from tribler.tribler_config import TriblerConfigManager
 
 SOCKS5_PROXY_DEF = 2
@@ -182,6 +182,11 @@ class DownloadManager(TaskManager):
         if self.config.get("libtorrent/upnp"):
             self.get_session().start_upnp()
 
+        if self.config.get("libtorrent/dht"):
+            # A health lookup reveals our interest in a torrent, so it uses the same anonymization hops as a download
+            hops = self.config.get("libtorrent/download_defaults/number_hops")
+            self.dht_health_manager = DHTHealthManager(self.get_session(hops), self.default_alert_mask)
+
         # Register tasks
         self.register_task("process_alerts", self._task_process_alerts, interval=1, ignore=(Exception, ))
         if self.dht_readiness_timeout > 0 and self.config.get("libtorrent/dht"):
@@ -486,6 +491,10 @@ class DownloadManager(TaskManager):
             if self.session_stats_callback:
                 self.session_stats_callback(ss_alert)
 
+        elif alert_type == "dht_get_peers_reply_alert" and self.dht_health_manager is not None:
+            reply_alert = cast("lt.dht_get_peers_reply_alert", alert)
+            self.dht_health_manager.received_peers(reply_alert.info_hash.to_bytes(), reply_alert.peers())
+
         elif alert_type == "dht_pkt_alert" and self.dht_health_manager is not None:
             # Unfortunately, the Python bindings don't have a direction attribute.
             # So, we'll have to resort to using the string representation of the alert instead.
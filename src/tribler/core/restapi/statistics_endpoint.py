@@ -5,14 +5,16 @@ from typing import TYPE_CHECKING
 from aiohttp import web
 from aiohttp_apispec import docs
 from ipv8.REST.schema import schema
-from marshmallow.fields import Integer, String
+from marshmallow.fields import Dict, Float, Integer, String
 
 from tribler.core.restapi.rest_endpoint import MAX_REQUEST_SIZE, RESTEndpoint, RESTResponse
 
 if TYPE_CHECKING:
     from ipv8.types import IPv8
 
+    from tribler.core.content_discovery.community import ContentDiscoveryCommunity
     from tribler.core.database.store import MetadataStore
+    from tribler.core.torrent_checker.torrent_checker import TorrentChecker
 
 
 class StatisticsEndpoint(RESTEndpoint):
@@ -30,6 +32,8 @@ class StatisticsEndpoint(RESTEndpoint):
 
         self.mds: MetadataStore | None = None
         self.ipv8: IPv8 | None = None
+        self.torrent_checker: TorrentChecker | None = None
+        self.content_discovery_community: ContentDiscoveryCommunity | None = None
 
         self.app.add_routes([web.get("/tribler", self.get_tribler_stats),
                              web.get("/ipv8", self.get_ipv8_stats)])
@@ -42,6 +46,43 @@ class StatisticsEndpoint(RESTEndpoint):
                 "schema": schema(TriblerStatisticsResponse={
                     "statistics": schema(TriblerStatistics={
                         "database_size": Integer,
+                        "search_cache": schema(SearchCacheStats={
+                            "hits": Integer,
+                            "misses": Integer,
+                            "size": Integer
+                        }),
+                        "signature_verification": schema(SignatureVerificationStats={
+                            "verified": Integer,
+                            "rejected": Integer,
+                            "per_second": Float
+                        }),
+                        "db_executor": schema(DBExecutorStats={
+                            "executor": Dict(keys=String, values=Dict),
+                            "reader_executor": Dict(keys=String, values=Dict)
+                        }),
+                        "response_cache": schema(ResponseCacheStats={
+                            "hits": Integer,
+                            "misses": Integer,
+                            "hit_rate": Float,
+                            "size": Integer,
+                            "bytes": Integer
+                        }),
+                        "remote_queries": schema(RemoteQueryStats={
+                            "processed": Integer,
+                            "rejected_rate": Integer,
+                            "rejected_full": Integer,
+                            "shed": Integer,
+                            "queued": Integer,
+                            "running": Integer,
+                            "average_wait": Float
+                        }),
+                        "health_checks": schema(HealthCheckStats={
+                            "torrents": Integer,
+                            "due": Integer,
+                            "planned": Integer,
+                            "seeded": Integer,
+                            "coverage": Float
+                        }),
                         "torrent_queue_stats": [
                             schema(TorrentQueueStats={
                                 "failed": Integer,
@@ -63,7 +104,15 @@ class StatisticsEndpoint(RESTEndpoint):
         stats_dict = {}
         if self.mds:
             stats_dict = {"db_size": self.mds.get_db_file_size(),
-                          "num_torrents": self.mds.get_num_torrents()}
+                          "num_torrents": self.mds.get_num_torrents(),
+                          "search_cache": self.mds.search_cache.get_statistics(),
+                          "signature_verification": self.mds.signature_verifier.get_statistics(),
+                          "db_executor": self.mds.get_executor_statistics()}
+        if self.torrent_checker:
+            stats_dict["health_checks"] = self.torrent_checker.get_statistics()
+        if self.content_discovery_community:
+            stats_dict["response_cache"] = self.content_discovery_community.response_cache.get_statistics()
+            stats_dict["remote_queries"] = self.content_discovery_community.query_scheduler.get_statistics()
 
         return RESTResponse({"tribler_statistics": stats_dict})
 
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TokenBucket:
+    """
+    A bucket that refills with ``rate`` tokens per second, up to ``burst`` tokens.
+    """
+
+    rate: float
+    burst: float
+    tokens: float
+    updated: float = field(default_factory=time.time)
+
+    def refill(self, now: float) -> None:
+        """
+        Add the tokens that were earned since the last update.
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def consume(self, cost: float, now: float) -> bool:
+        """
+        Take the given number of tokens, if they are available.
+        """
+        self.refill(now)
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
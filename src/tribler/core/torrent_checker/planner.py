@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Iterable
+
+from tribler.core.token_bucket import TokenBucket
+from tribler.core.torrent_checker.dataclasses import HEALTH_FRESHNESS_SECONDS
+
+INTEREST_DEFAULT = 1.0
+INTEREST_SEARCHED = 4.0  # Torrents that showed up in the search results of the user
+INTEREST_DOWNLOADED = 8.0  # Torrents that the user downloads
+MAX_INTERESTS = 10000  # The interest of the user in the least recent torrents beyond this number is forgotten
+MAX_TORRENTS = 500000  # The number of torrents beyond which the least popular torrents are forgotten
+EVICTION_FRACTION = 0.1  # The fraction of the torrents that is forgotten at once
+COUNTER_RESOLUTION = 60  # seconds, the resolution of the statistics
+
+
+class PlannedTorrent:
+    """
+    The health information of a torrent that the planner uses to schedule its next check.
+
+    The planner holds one of these for every torrent in the database, so they use slots to save memory.
+    """
+
+    __slots__ = ("due", "interest", "last_check", "leechers", "seeders")
+
+    def __init__(self, last_check: int, seeders: int, leechers: int, interest: float = INTEREST_DEFAULT,
+                 due: float = 0.0) -> None:
+        """
+        Create the planned health information of a torrent.
+        """
+        self.last_check = last_check
+        self.seeders = seeders
+        self.leechers = leechers
+        self.interest = interest
+        self.due = due
+
+    @property
+    def popularity(self) -> float:
+        """
+        The popularity of the torrent, which grows logarithmically with its number of peers.
+        """
+        return 1 + math.log2(1 + self.seeders + self.leechers)
+
+
+class TimeCounter:
+    """
+    Counts timestamps, and how many of them are at or after a threshold that only moves forward.
+
+    The timestamps are counted in buckets of ``resolution`` seconds, so that moving the threshold only drops whole
+    buckets. Timestamps before the threshold are not stored at all.
+    """
+
+    def __init__(self, resolution: int = COUNTER_RESOLUTION) -> None:
+        """
+        Create a new counter without timestamps.
+        """
+        self.resolution = resolution
+        self.buckets: dict[int, int] = {}
+        self.threshold = 0  # The first bucket that is counted
+        self.recent = 0
+
+    def add(self, timestamp: float, count: int = 1) -> None:
+        """
+        Add (or remove, for a negative count) a timestamp.
+        """
+        bucket = int(timestamp // self.resolution)
+        if bucket < self.threshold:
+            return
+        remaining = self.buckets.get(bucket, 0) + count
+        if remaining:
+            self.buckets[bucket] = remaining
+        else:
+            self.buckets.pop(bucket, None)
+        self.recent += count
+
+    def count_since(self, timestamp: float) -> int:
+        """
+        Get the number of timestamps at or after the given time, at the resolution of this counter.
+        """
+        threshold = int(timestamp // self.resolution)
+        if threshold > self.threshold:
+            expired = (range(self.threshold, threshold) if threshold - self.threshold < len(self.buckets)
+                       else [bucket for bucket in self.buckets if bucket < threshold])
+            for bucket in expired:
+                self.recent -= self.buckets.pop(bucket, 0)
+            self.threshold = threshold
+        return self.recent
+
+
+class HealthCheckPlanner:
+    """
+    A priority queue of the torrents whose health should be checked.
+
+    The priority of a torrent is its staleness (the time since its last check) multiplied by its popularity and by
+    the interest of the user. A torrent is due for a check when its priority reaches ``freshness_period``, so that
+    popular and interesting torrents are checked more often. As the priority of every torrent grows at its own fixed
+    rate, the queue is ordered by the time at which a torrent becomes due, which only changes when the torrent is
+    updated. Outdated queue entries are skipped when they are popped.
+
+    The number of checks is limited by a global budget of checks per second. A share of this budget is reserved for
+    the checks that are not planned, e.g., of the torrents of a random tracker.
+    """
+
+    def __init__(self, checks_per_second: float, burst: float, min_interval: int,
+                 freshness_period: int = HEALTH_FRESHNESS_SECONDS, random_share: float = 0.0,
+                 max_torrents: int = MAX_TORRENTS) -> None:
+        """
+        Create a new empty planner.
+
+        :param checks_per_second: the number of checks that may be performed per second.
+        :param burst: the maximum number of checks that may be performed at once, after a quiet period.
+        :param min_interval: the minimum time in seconds between two checks of the same torrent.
+        :param freshness_period: the time in seconds after which the health of a torrent is stale.
+        :param random_share: the fraction of the budget that is reserved for checks that are not planned.
+        :param max_torrents: the number of torrents beyond which the least popular torrents are forgotten.
+        """
+        self.min_interval = min_interval
+        self.freshness_period = freshness_period
+        self.max_torrents = max_torrents
+        planned_share = 1 - random_share
+        self.budget = TokenBucket(checks_per_second * planned_share, burst * planned_share, burst * planned_share)
+        self.random_budget = TokenBucket(checks_per_second * random_share, burst * random_share,
+                                         burst * random_share)
+
+        self.torrents: dict[bytes, PlannedTorrent] = {}
+        self.interests: dict[bytes, float] = {}
+        self.queue: list[tuple[float, bytes]] = []
+        self.last_rowid = 0
+        self.planned = 0
+
+        # The statistics are kept up to date with every change, so they do not require a pass over all torrents
+        self.seeded = 0
+        self.seeded_checks = TimeCounter()  # The last checks of the torrents with seeders
+        self.due_times = TimeCounter()  # The times at which the torrents become due
+
+    def get_due(self, torrent: PlannedTorrent) -> float:
+        """
+        Get the time at which the priority of the given torrent reaches the freshness period.
+        """
+        weight = torrent.popularity * torrent.interest
+        return torrent.last_check + max(self.min_interval, self.freshness_period / weight)
+
+    def _push(self, infohash: bytes, due: float) -> None:
+        """
+        Put a torrent into the queue at the given time.
+        """
+        heapq.heappush(self.queue, (due, infohash))
+        if len(self.queue) > 2 * len(self.torrents) + 1000:
+            # Drop the outdated entries
+            self.queue = [(torrent.due, infohash) for infohash, torrent in self.torrents.items()]
+            heapq.heapify(self.queue)
+
+    def _schedule(self, infohash: bytes, torrent: PlannedTorrent, due: float) -> None:
+        """
+        Move a torrent that is already planned to the given time.
+        """
+        self.due_times.add(torrent.due, -1)
+        torrent.due = due
+        self.due_times.add(due)
+        self._push(infohash, due)
+
+    def _count(self, torrent: PlannedTorrent, count: int) -> None:
+        """
+        Add (count=1) or remove (count=-1) a torrent to or from the statistics.
+        """
+        if torrent.seeders > 0:
+            self.seeded += count
+            self.seeded_checks.add(torrent.last_check, count)
+        self.due_times.add(torrent.due, count)
+
+    def add(self, rows: Iterable[tuple[int, bytes, int, int, int]]) -> None:
+        """
+        Add torrents from the database to the queue.
+
+        :param rows: the (rowid, infohash, seeders, leechers, last_check) of the torrent states, in order of rowid.
+        """
+        for rowid, infohash, seeders, leechers, last_check in rows:
+            self.last_rowid = max(self.last_rowid, rowid)
+            self.update(infohash, seeders or 0, leechers or 0, last_check or 0)
+
+    def update(self, infohash: bytes, seeders: int, leechers: int, last_check: int) -> None:
+        """
+        Process the (new) health of a torrent.
+        """
+        previous = self.torrents.get(infohash)
+        if previous is not None:
+            self._count(previous, -1)
+        torrent = PlannedTorrent(last_check, seeders, leechers, self.interests.get(infohash, INTEREST_DEFAULT))
+        torrent.due = self.get_due(torrent)
+        self.torrents[infohash] = torrent
+        self._count(torrent, 1)
+        self._push(infohash, torrent.due)
+        if len(self.torrents) > self.max_torrents:
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Forget the least popular torrents, of which the health is updated again if they become popular.
+        """
+        torrents = self.torrents
+        count = max(1, int(self.max_torrents * EVICTION_FRACTION))
+        for infohash in heapq.nsmallest(count, torrents,
+                                        key=lambda infohash: torrents[infohash].popularity * torrents[infohash].interest):
+            self._count(torrents.pop(infohash), -1)
+
+    def add_interest(self, infohash: bytes, interest: float) -> None:
+        """
+        Register that the user is interested in a torrent, which makes it due for a check sooner.
+        """
+        if interest <= self.interests.get(infohash, INTEREST_DEFAULT):
+            return
+        self.interests[infohash] = interest
+        if len(self.interests) > MAX_INTERESTS:
+            self.interests.pop(next(iter(self.interests)))
+        torrent = self.torrents.get(infohash)
+        if torrent is not None:
+            torrent.interest = interest
+            self._schedule(infohash, torrent, min(torrent.due, self.get_due(torrent)))
+
+    @staticmethod
+    def _take(budget: TokenBucket, count: int, now: float) -> int:
+        """
+        Take up to the given number of checks from the given budget and get the number of checks that were granted.
+        """
+        budget.refill(now)
+        granted = min(count, int(budget.tokens))
+        budget.tokens -= granted
+        return granted
+
+    def take_budget(self, count: int, now: float) -> int:
+        """
+        Take up to the given number of planned checks from the budget and get the number of checks that were granted.
+        """
+        return self._take(self.budget, count, now)
+
+    def take_random_budget(self, count: int, now: float) -> int:
+        """
+        Take up to the given number of checks that are not planned from the budget.
+
+        These checks always get the reserved share of the budget. When no torrents are due, they may also use the
+        budget of the planned checks.
+        """
+        granted = self._take(self.random_budget, count, now)
+        if granted < count and not self.has_due(now):
+            granted += self._take(self.budget, count - granted, now)
+        return granted
+
+    def has_due(self, now: float) -> bool:
+        """
+        Whether any torrent is due for a check.
+        """
+        while self.queue and self.queue[0][0] <= now:
+            due, infohash = self.queue[0]
+            torrent = self.torrents.get(infohash)
+            if torrent is not None and torrent.due == due:
+                return True
+            heapq.heappop(self.queue)
+        return False
+
+    def pop(self, now: float) -> list[bytes]:
+        """
+        Get the torrents that are most overdue for a check, as far as the budget allows.
+
+        The returned torrents are not handed out again before ``min_interval`` has passed or their health is updated.
+        """
+        infohashes: list[bytes] = []
+        while self.has_due(now) and self.take_budget(1, now):
+            _, infohash = heapq.heappop(self.queue)
+            infohashes.append(infohash)
+            self._schedule(infohash, self.torrents[infohash], now + self.min_interval)
+        self.planned += len(infohashes)
+        return infohashes
+
+    def get_statistics(self, now: float) -> dict[str, float]:
+        """
+        Get the size of the queue and the coverage of the checks.
+
+        The coverage is the fraction of the torrents with seeders that have a health that is not stale. The number of
+        due torrents and the coverage are accurate up to the resolution of the counters.
+        """
+        fresh = self.seeded_checks.count_since(now - self.freshness_period)
+        return {"torrents": len(self.torrents),
+                "due": len(self.torrents) - self.due_times.count_since(now),
+                "planned": self.planned,
+                "seeded": self.seeded,
+                "coverage": fresh / self.seeded if self.seeded else 1.0}
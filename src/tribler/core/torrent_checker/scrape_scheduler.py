@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+from asyncio import CancelledError, Future, shield
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from ipv8.taskmanager import TaskManager
+
+from tribler.core.torrent_checker.dataclasses import TrackerResponse
+from tribler.core.torrent_checker.torrentchecker_session import MAX_INFOHASHES_IN_SCRAPE
+
+if TYPE_CHECKING:
+    from tribler.core.torrent_checker.torrentchecker_session import TrackerSession
+
+SCRAPE_BATCH_WINDOW = 0.5  # How long checks for the same tracker are collected before the tracker is scraped
+
+
+class ScrapeBatch:
+    """
+    The infohashes that are waiting to be scraped from a single tracker.
+    """
+
+    def __init__(self, tracker_url: str) -> None:
+        """
+        Create a new empty batch.
+        """
+        self.tracker_url = tracker_url
+        self.task_name = ""
+        self.timeout = 0.0
+        self.futures: dict[bytes, Future[TrackerResponse | None]] = {}
+
+    @property
+    def full(self) -> bool:
+        """
+        Whether no more infohashes fit into a single scrape.
+        """
+        return len(self.futures) >= MAX_INFOHASHES_IN_SCRAPE
+
+
+class ScrapeScheduler(TaskManager):
+    """
+    Combine the health checks of different torrents on the same tracker into a single scrape.
+
+    The checks for a tracker are collected for a short window, after which all collected infohashes are scraped at
+    once and every caller gets the part of the response that concerns its own infohash. A batch is scraped before its
+    window ends if it is full or if one of its callers does not want to wait. Different trackers are scraped
+    independently of each other.
+    """
+
+    def __init__(self, create_session: Callable[[str, float], TrackerSession | None],
+                 get_response: Callable[[TrackerSession], Awaitable[TrackerResponse]],
+                 window: float = SCRAPE_BATCH_WINDOW) -> None:
+        """
+        Create a new scheduler.
+
+        :param create_session: the callback to create a session for a tracker url and timeout, or return None if no
+                               session can be created.
+        :param get_response: the callback to perform the scrape of a session.
+        :param window: the time in seconds during which checks for the same tracker are collected.
+        """
+        super().__init__()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        self.create_session = create_session
+        self.get_response = get_response
+        self.window = window
+
+        self.batches: dict[str, ScrapeBatch] = {}  # The batches that can still be added to, per tracker
+        self.unsent: set[ScrapeBatch] = set()
+        self.batch_count = 0
+
+    async def scrape(self, tracker_url: str, infohash: bytes, timeout: float,
+                     now: bool = False) -> TrackerResponse | None:
+        """
+        Scrape a tracker for the health of a torrent, together with the other torrents that are checked meanwhile.
+
+        :param now: whether to scrape right away, instead of waiting for the other checks of the window.
+        :returns: the response of the tracker, containing the health of the given infohash only, or None if no session
+                  could be created for the tracker.
+        """
+        batch = self.batches.get(tracker_url)
+        if batch is None:
+            batch = self.batches[tracker_url] = ScrapeBatch(tracker_url)
+            self.unsent.add(batch)
+            self.batch_count += 1
+            batch.task_name = f"Scrape batch {self.batch_count}"
+            self.register_task(batch.task_name, self.send, batch, delay=self.window)
+
+        batch.timeout = max(batch.timeout, timeout)
+        future = batch.futures.get(infohash)
+        if future is None:
+            future = batch.futures[infohash] = Future()
+        if batch.full or now:
+            # Later checks for this tracker go into a new batch, so there is nothing left to wait for
+            self.batches.pop(tracker_url)
+            self.cancel_pending_task(batch.task_name)
+            self.register_task(batch.task_name, self.send, batch)
+
+        # The same infohash may be checked by multiple callers, which should not cancel each other
+        response = await shield(future)
+        if response is None:
+            return None
+        health_list = response.torrent_health_list
+        return TrackerResponse(url=tracker_url,
+                               torrent_health_list=[health for health in health_list if health.infohash == infohash])
+
+    async def scrape_batch(self, batch: ScrapeBatch) -> TrackerResponse | None:
+        """
+        Create a session for all infohashes of a batch and perform the scrape, if a session can be created.
+        """
+        session = self.create_session(batch.tracker_url, batch.timeout)
+        if session is None:
+            self._logger.debug("Skipping %d infohashes for %s, no session", len(batch.futures), batch.tracker_url)
+            return None
+        for infohash in batch.futures:
+            session.add_infohash(infohash)
+        self._logger.debug("Scraping %d infohashes from %s", len(batch.futures), batch.tracker_url)
+        return await self.get_response(session)
+
+    async def send(self, batch: ScrapeBatch) -> None:
+        """
+        Scrape all infohashes of a batch and hand the response to the callers.
+        """
+        if self.batches.get(batch.tracker_url) is batch:
+            self.batches.pop(batch.tracker_url)
+        self.unsent.discard(batch)
+        try:
+            response = await self.scrape_batch(batch)
+        except CancelledError:
+            for future in batch.futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # The callers that were cancelled meanwhile no longer retrieve the exception
+                    future.exception()
+        else:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_result(response)
+
+    async def shutdown(self) -> None:
+        """
+        Stop scraping and cancel the checks that are waiting.
+        """
+        await self.shutdown_task_manager()
+        for batch in self.unsent:
+            for future in batch.futures.values():
+                future.cancel()
+        self.unsent = set()
+        self.batches = {}
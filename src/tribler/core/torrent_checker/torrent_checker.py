@@ -5,7 +5,7 @@ import logging
 import random
 import time
 from asyncio import CancelledError, DatagramTransport
-from binascii import hexlify
+from binascii import hexlify, unhexlify
 from collections import defaultdict
 from typing import TYPE_CHECKING, Any, Dict, List, Tuple, cast
 
@@ -13,11 +13,15 @@ from ipv8.taskmanager import TaskManager
 from pony.orm import db_session, desc, select
 from pony.utils import between
 
+from tribler.core.database.executor import Priority
 from tribler.core.libtorrent.trackers import MalformedTrackerURLException, is_valid_url
 from tribler.core.notifier import Notification, Notifier
 from tribler.core.torrent_checker.dataclasses import HEALTH_FRESHNESS_SECONDS, HealthInfo, TrackerResponse
+from tribler.core.torrent_checker.planner import INTEREST_DOWNLOADED, INTEREST_SEARCHED, HealthCheckPlanner
+from tribler.core.torrent_checker.scrape_scheduler import ScrapeScheduler
 from tribler.core.torrent_checker.torrentchecker_session import (
     FakeDHTSession,
+    HttpClientPool,
     TrackerSession,
     UdpSocketManager,
     create_tracker_session,
@@ -30,14 +34,17 @@ if TYPE_CHECKING:
     from tribler.tribler_config import TriblerConfigManager
 
 TRACKER_SELECTION_INTERVAL = 1  # The interval for querying a random tracker
-TORRENT_SELECTION_INTERVAL = 10  # The interval for checking the health of a random torrent
+TORRENT_SELECTION_INTERVAL = 10  # The interval for checking the health of the torrents that are due
 MIN_TORRENT_CHECK_INTERVAL = 900  # How much time we should wait before checking a torrent again
 TORRENT_CHECK_RETRY_INTERVAL = 30  # Interval when the torrent was successfully checked for the last time
-MAX_TORRENTS_CHECKED_PER_SESSION = 5  # (5 random + 5 per tracker = 10 torrents) per 10 seconds
+MAX_TORRENTS_CHECKED_PER_SESSION = 5  # How many torrents to check per random tracker, as far as the budget allows
 
-TORRENT_SELECTION_POOL_SIZE = 2  # How many torrents to check (popular or random) during periodic check
+RANDOM_TRACKER_BUDGET_SHARE = 0.2  # The share of the check budget that is reserved for checking random trackers
+PLANNER_REFILL_INTERVAL = 10  # The interval for adding new torrents to the health check planner
+PLANNER_REFILL_BATCH_SIZE = 5000  # How many torrents to add to the health check planner at once
 USER_CHANNEL_TORRENT_SELECTION_POOL_SIZE = 5  # How many torrents to check from user's channel during periodic check
 TORRENTS_CHECKED_RETURN_SIZE = 240  # Estimated torrents checked on default 4 hours idle run
+HTTP_CLIENT_EVICTION_INTERVAL = 60  # The interval for closing unused HTTP tracker clients
 
 
 def aggregate_responses_for_infohash(infohash: bytes, responses: List[TrackerResponse]) -> HealthInfo:
@@ -80,6 +87,14 @@ class TorrentChecker(TaskManager):
         self._should_stop = False
         self.sessions: dict[str, list[TrackerSession]] = defaultdict(list)
         self.socket_mgr = UdpSocketManager()
+        self.http_pool = HttpClientPool()
+        self.scrape_scheduler = ScrapeScheduler(self.create_session_for_request, self.get_tracker_response)
+        checks_per_second = config.get("torrent_checker/checks_per_second")
+        self.planner = HealthCheckPlanner(checks_per_second, checks_per_second * TORRENT_SELECTION_INTERVAL,
+                                          MIN_TORRENT_CHECK_INTERVAL, random_share=RANDOM_TRACKER_BUDGET_SHARE)
+        self.loop = asyncio.get_event_loop()
+        self.notifier.add(Notification.local_query_results, self.on_query_results)
+        self.notifier.add(Notification.remote_query_results, self.on_query_results)
         self.udp_transport: DatagramTransport | None = None
 
         # We keep track of the results of popular torrents checked by you.
@@ -91,7 +106,10 @@ class TorrentChecker(TaskManager):
         Start all the looping tasks for the checker and creata socket.
         """
         self.register_task("check random tracker", self.check_random_tracker, interval=TRACKER_SELECTION_INTERVAL)
-        self.register_task("check local torrents", self.check_local_torrents, interval=TORRENT_SELECTION_INTERVAL)
+        self.register_task("refill health check planner", self.refill_planner, interval=PLANNER_REFILL_INTERVAL)
+        self.register_task("check local torrents", self.check_local_torrents, interval=TORRENT_SELECTION_INTERVAL,
+                           delay=TORRENT_SELECTION_INTERVAL)
+        self.register_task("evict idle http clients", self.http_pool.evict_idle, interval=HTTP_CLIENT_EVICTION_INTERVAL)
         await self.create_socket_or_schedule()
 
     async def listen_on_udp(self) -> DatagramTransport:
@@ -126,7 +144,9 @@ class TorrentChecker(TaskManager):
             self.udp_transport.close()
             self.udp_transport = None
 
+        await self.scrape_scheduler.shutdown()
         await self.shutdown_task_manager()
+        await self.http_pool.close()
 
     async def check_random_tracker(self) -> None:
         """
@@ -158,6 +178,13 @@ class TorrentChecker(TaskManager):
             self.tracker_manager.update_tracker_info(url)
             return
 
+        # These checks count toward the same budget as the checks of the planner, of which they get a reserved share
+        granted = self.planner.take_random_budget(len(infohashes), time.time())
+        if granted == 0:
+            self._logger.info("No budget left to check tracker %s", url)
+            return
+        infohashes = infohashes[:granted]
+
         try:
             session = self.create_session_for_request(url, timeout=30)
         except MalformedTrackerURLException as e:
@@ -243,43 +270,69 @@ class TorrentChecker(TaskManager):
                                                   last_check=torrent.last_check, self_checked=True)
         return result
 
-    @db_session
-    def torrents_to_check(self) -> list:
+    async def refill_planner(self) -> None:
+        """
+        Add the torrents that were added to the database since the last refill to the planner.
+
+        The torrents are added in batches, so that a large database is loaded over multiple refills. The health that
+        changed since the last refill, e.g., because other peers gave it to us, is also passed to the planner.
         """
-        Two categories of torrents are selected (popular & old). From the pool of selected torrents, a certain
-        number of them are submitted for health check. The torrents that are within the freshness window are
-        excluded from the selection considering the health information is still fresh.
+        for infohash, (seeders, leechers, last_check) in self.mds.pop_health_changes().items():
+            self.planner.update(infohash, seeders, leechers, last_check)
 
-        1. Popular torrents (50%)
-        The indicator for popularity here is considered as the seeder count with direct proportionality
-        assuming more seeders -> more popular. There could be other indicators to be introduced later.
+        rows = await self.mds.run_threaded_readonly(self.get_planner_rows, self.planner.last_rowid,
+                                                    priority=Priority.INGESTION)
+        self.planner.add(rows)
 
-        2. Old torrents (50%)
-        By old torrents, we refer to those checked quite farther in the past, sorted by the last_check value.
+        for download in self.download_manager.get_downloads():
+            self.planner.add_interest(download.get_def().infohash, INTEREST_DOWNLOADED)
+
+    @db_session
+    def get_planner_rows(self, last_rowid: int) -> list[tuple[int, bytes, int, int, int]]:
         """
-        last_fresh_time = time.time() - HEALTH_FRESHNESS_SECONDS
-        popular_torrents = list(self.mds.TorrentState.select(
-            lambda g: g.has_data == 1  # The condition had to be written this way for the partial index to work
-            and g.last_check < last_fresh_time
-        ).order_by(lambda g: (desc(g.seeders), g.last_check)).limit(TORRENT_SELECTION_POOL_SIZE))
+        Get the next batch of torrent states with a row id above the given one, for the planner.
 
-        old_torrents = list(self.mds.TorrentState.select(
+        This runs in a database thread, so it only reads the database and does not touch the planner.
+        """
+        torrent_states = self.mds.TorrentState.select(
             lambda g: g.has_data == 1  # The condition had to be written this way for the partial index to work
-            and g.last_check < last_fresh_time
-        ).order_by(lambda g: (g.last_check, desc(g.seeders))).limit(TORRENT_SELECTION_POOL_SIZE))
+            and g.rowid > last_rowid
+        ).order_by(lambda g: g.rowid).limit(PLANNER_REFILL_BATCH_SIZE)
+        return [(ts.rowid, ts.infohash, ts.seeders, ts.leechers, ts.last_check) for ts in torrent_states]
 
-        selected_torrents = popular_torrents + old_torrents
-        return random.sample(selected_torrents, min(TORRENT_SELECTION_POOL_SIZE, len(selected_torrents)))
+    def on_query_results(self, query: str, **data: dict) -> None:
+        """
+        Prioritize the health checks of the torrents in the search results of the user.
+
+        The local search results are notified from a database thread, while the planner is only used on the event
+        loop. Therefore, the interest is added on the event loop.
+        """
+        infohashes = [unhexlify(result["infohash"]) for result in data["results"] if "infohash" in result]
+        self.loop.call_soon_threadsafe(self.add_search_interest, infohashes)
+
+    def add_search_interest(self, infohashes: list[bytes]) -> None:
+        """
+        Register that the given torrents showed up in the search results of the user.
+        """
+        for infohash in infohashes:
+            self.planner.add_interest(infohash, INTEREST_SEARCHED)
+
+    def get_statistics(self) -> dict[str, float]:
+        """
+        Get the statistics of the health check planner.
+        """
+        return self.planner.get_statistics(time.time())
 
     async def check_local_torrents(self) -> Tuple[List, List]:
         """
-        Perform a full health check on a few popular and old torrents in the database.
+        Perform a full health check on the torrents that the planner finds most overdue, as far as the budget allows.
         """
-        selected_torrents = self.torrents_to_check()
-        self._logger.info("Check %d local torrents", len(selected_torrents))
-        results = [await self.check_torrent_health(t.infohash) for t in selected_torrents]
+        selected_infohashes = self.planner.pop(time.time())
+        self._logger.info("Check %d local torrents", len(selected_infohashes))
+        # Checking the torrents at the same time allows their scrapes of the same trackers to be combined
+        results = await asyncio.gather(*[self.check_torrent_health(infohash) for infohash in selected_infohashes])
         self._logger.info("Results for local torrents check: %s", str(results))
-        return selected_torrents, results
+        return selected_infohashes, results
 
     def get_next_tracker(self) -> Any | None:  # noqa: ANN401
         """
@@ -312,13 +365,15 @@ class TorrentChecker(TaskManager):
         return {tracker.url for tracker in db_tracker_list
                 if is_valid_url(tracker.url) and not self.is_blacklisted_tracker(tracker.url)}
 
-    async def check_torrent_health(self, infohash: bytes, timeout: float = 20, scrape_now: bool = False) -> HealthInfo:
+    async def check_torrent_health(self, infohash: bytes, timeout: float = 20, scrape_now: bool = False,
+                                   use_metainfo: bool = False) -> HealthInfo:
         """
         Check the health of a torrent with a given infohash.
 
         :param infohash: Torrent infohash.
         :param timeout: The timeout to use in the performed requests
         :param scrape_now: Flag whether we want to force scraping immediately
+        :param use_metainfo: Flag whether to fetch the metainfo of the torrent, instead of only querying the DHT
         """
         infohash_hex = hexlify(infohash).decode()
         self._logger.info("Check health for the torrent: %s", infohash_hex)
@@ -338,13 +393,10 @@ class TorrentChecker(TaskManager):
                 tracker_set = self.get_valid_trackers_of_torrent(torrent_state.infohash)
                 self._logger.info("Trackers for %s: %s", infohash_hex, str(tracker_set))
 
-        coroutines = []
-        for tracker_url in tracker_set:
-            if session := self.create_session_for_request(tracker_url, timeout=timeout):
-                session.add_infohash(infohash)
-                coroutines.append(self.get_tracker_response(session))
+        coroutines = [self.scrape_scheduler.scrape(tracker_url, infohash, timeout, now=scrape_now)
+                      for tracker_url in tracker_set]
 
-        session = FakeDHTSession(self.download_manager, timeout)
+        session = FakeDHTSession(self.download_manager, timeout, use_metainfo)
         session.add_infohash(infohash)
         self._logger.info("DHT session has been created for %s: %s", infohash_hex, str(session))
         self.sessions["DHT"].append(session)
@@ -352,7 +404,8 @@ class TorrentChecker(TaskManager):
 
         responses = await asyncio.gather(*coroutines, return_exceptions=True)
         self._logger.info("%d responses for %s have been received: %s", len(responses), infohash_hex, str(responses))
-        successful_responses = [response for response in responses if not isinstance(response, Exception)]
+        successful_responses = [response for response in responses
+                                if response is not None and not isinstance(response, Exception)]
         health = aggregate_responses_for_infohash(infohash, cast(List[TrackerResponse], successful_responses))
         if health.last_check == 0:  # if not zero, was already updated in get_tracker_response
             health.last_check = int(time.time())
@@ -377,7 +430,7 @@ class TorrentChecker(TaskManager):
             return None
         listen_ports = cast(List[int], self.socks_listen_ports)  # Guaranteed by check above
         proxy = ('127.0.0.1', listen_ports[required_hops - 1]) if required_hops > 0 else None
-        session = create_tracker_session(tracker_url, timeout, proxy, self.socket_mgr)
+        session = create_tracker_session(tracker_url, timeout, proxy, self.socket_mgr, self.http_pool)
         self._logger.info("Tracker session has been created: %s", str(session))
         self.sessions[tracker_url].append(session)
         return session
@@ -422,10 +475,14 @@ class TorrentChecker(TaskManager):
             if not health.should_replace(prev_health):
                 self._logger.info("Skip health update, the health in the database is fresher or have more seeders")
                 self.notify(prev_health)  # to update UI state from "Checking..."
+                # The torrent was checked nevertheless
+                self.planner.update(health.infohash, prev_health.seeders, prev_health.leechers,
+                                    max(prev_health.last_check, health.last_check))
                 return False
 
             torrent_state.set(seeders=health.seeders, leechers=health.leechers, last_check=health.last_check,
                               self_checked=True)
+        self.planner.update(health.infohash, health.seeders, health.leechers, health.last_check)
 
         if health.seeders > 0 or health.leechers > 0:
             self.torrents_checked[health.infohash] = health
@@ -6,12 +6,12 @@ import socket
 import struct
 import time
 from abc import ABCMeta, abstractmethod
-from asyncio import DatagramProtocol, Future, TimeoutError, ensure_future, get_event_loop
+from asyncio import DatagramProtocol, Future, TimeoutError, ensure_future, gather, get_event_loop
 from typing import TYPE_CHECKING, Any, List, NoReturn, cast
 
 import async_timeout
 import libtorrent as lt
-from aiohttp import ClientResponseError, ClientSession, ClientTimeout
+from aiohttp import ClientResponseError, ClientSession, ClientTimeout, TCPConnector
 from ipv8.taskmanager import TaskManager
 
 from tribler.core.libtorrent.trackers import add_url_params, parse_tracker_url
@@ -31,9 +31,17 @@ TRACKER_ACTION_ANNOUNCE = 1
 TRACKER_ACTION_SCRAPE = 2
 
 UDP_TRACKER_INIT_CONNECTION_ID = 0x41727101980
+# BEP15: a client can use a connection ID until one minute after it has received it.
+UDP_TRACKER_CONNECTION_ID_LIFETIME = 60
+UDP_TRACKER_ADDRESS_LIFETIME = 300
 
 MAX_INFOHASHES_IN_SCRAPE = 60
 
+HTTP_TRACKER_MAX_CONNECTIONS = 30
+HTTP_TRACKER_MAX_CONNECTIONS_PER_HOST = 2
+HTTP_TRACKER_KEEPALIVE_TIMEOUT = 30  # How long an idle connection to a tracker is kept open
+HTTP_TRACKER_CLIENT_IDLE_TIMEOUT = 300  # How long an unused client (and its connector) is kept around
+
 
 class TrackerSession(TaskManager):
     """
@@ -120,15 +128,19 @@ class HttpTrackerSession(TrackerSession):
     A session for HTTP tracker checks.
     """
 
-    def __init__(self, tracker_url: str, tracker_address: tuple[str, int], announce_page: str, timeout: float,
-                 proxy: tuple) -> None:
+    def __init__(self, tracker_url: str, tracker_address: tuple[str, int], announce_page: str,
+                 timeout: float, proxy: tuple, client: ClientSession | None = None) -> None:
         """
         Create a new HTTP tracker session.
+
+        :param client: a shared HTTP client to use, see ``HttpClientPool``. If not given, the session uses a client of
+                       its own, which is closed when the session is cleaned up.
         """
         super().__init__("http", tracker_url, tracker_address, announce_page, timeout)
-        self.session = ClientSession(connector=Socks5Connector(proxy) if proxy else None,
-                                     raise_for_status=True,
-                                     timeout=ClientTimeout(total=self.timeout))
+        self.owns_session = client is None
+        self.session = client or ClientSession(connector=Socks5Connector(proxy) if proxy else None,
+                                               raise_for_status=True,
+                                               timeout=ClientTimeout(total=self.timeout))
 
     async def connect_to_tracker(self) -> TrackerResponse:
         """
@@ -149,7 +161,8 @@ class HttpTrackerSession(TrackerSession):
 
         try:
             self._logger.debug("%s HTTP SCRAPE message sent: %s", self, url)
-            async with self.session, self.session.get(url.encode("ascii").decode()) as response:
+            async with self.session.get(url.encode("ascii").decode(),
+                                        timeout=ClientTimeout(total=self.timeout)) as response:
                 body = await response.read()
         except UnicodeEncodeError:
             raise
@@ -204,10 +217,149 @@ class HttpTrackerSession(TrackerSession):
         """
         Cleans the session by cancelling all deferreds and closing sockets.
         """
-        await self.session.close()
+        if self.owns_session:
+            await self.session.close()
         await super().cleanup()
 
 
+class HttpClientPool:
+    """
+    Shared HTTP clients for tracker scrapes, one for every proxy.
+
+    The connections of a client are kept alive between scrapes, so that checking a tracker again does not need a new
+    TCP (and SOCKS5 and TLS) handshake. Clients that have not been used for a while are closed by ``evict_idle``.
+    """
+
+    def __init__(self, max_connections: int = HTTP_TRACKER_MAX_CONNECTIONS,
+                 max_connections_per_host: int = HTTP_TRACKER_MAX_CONNECTIONS_PER_HOST,
+                 keepalive_timeout: float = HTTP_TRACKER_KEEPALIVE_TIMEOUT,
+                 idle_timeout: float = HTTP_TRACKER_CLIENT_IDLE_TIMEOUT) -> None:
+        """
+        Create a new pool without clients.
+
+        :param max_connections: the maximum number of simultaneous connections of a single client.
+        :param max_connections_per_host: the maximum number of simultaneous connections to a single tracker.
+        :param keepalive_timeout: the time in seconds after which an idle connection is closed.
+        :param idle_timeout: the time in seconds after which an unused client is closed, which should be longer than
+                             the timeout of a scrape.
+        """
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.idle_timeout = idle_timeout
+
+        self.clients: dict[tuple | None, ClientSession] = {}
+        self.last_used: dict[tuple | None, float] = {}
+
+    def get(self, proxy: tuple | None) -> ClientSession:
+        """
+        Get the client for the given proxy, creating it if needed.
+        """
+        client = self.clients.get(proxy)
+        if client is None or client.closed:
+            connector: TCPConnector
+            if proxy:
+                connector = Socks5Connector(proxy, limit=self.max_connections,
+                                            limit_per_host=self.max_connections_per_host,
+                                            keepalive_timeout=self.keepalive_timeout)
+            else:
+                connector = TCPConnector(limit=self.max_connections, limit_per_host=self.max_connections_per_host,
+                                         keepalive_timeout=self.keepalive_timeout)
+            client = self.clients[proxy] = ClientSession(connector=connector, raise_for_status=True)
+        self.last_used[proxy] = time.time()
+        return client
+
+    async def evict_idle(self) -> None:
+        """
+        Close the clients that have not been used for a while.
+        """
+        now = time.time()
+        for proxy in [proxy for proxy, last_used in self.last_used.items() if now - last_used > self.idle_timeout]:
+            self.last_used.pop(proxy)
+            await self.clients.pop(proxy).close()
+
+    async def close(self) -> None:
+        """
+        Close all clients.
+        """
+        clients = list(self.clients.values())
+        self.clients = {}
+        self.last_used = {}
+        for client in clients:
+            await client.close()
+
+
+class ConnectionIdRejectedError(ValueError):
+    """
+    A UDP tracker responded with an error to a connection ID that it handed out to an earlier session.
+    """
+
+
+class UdpTrackerCache:
+    """
+    The resolved addresses and connection IDs of recently contacted UDP trackers.
+
+    A UDP tracker session needs two round-trips: one to get a connection ID and one to scrape. As connection IDs stay
+    valid for a while, a session to a recently contacted tracker can skip the first round-trip.
+    """
+
+    def __init__(self, connection_id_lifetime: float = UDP_TRACKER_CONNECTION_ID_LIFETIME,
+                 address_lifetime: float = UDP_TRACKER_ADDRESS_LIFETIME) -> None:
+        """
+        Create a new empty cache.
+
+        :param connection_id_lifetime: the time in seconds during which a connection ID can be reused.
+        :param address_lifetime: the time in seconds during which a resolved address can be reused.
+        """
+        self.connection_id_lifetime = connection_id_lifetime
+        self.address_lifetime = address_lifetime
+        self.addresses: dict[str, tuple[str, float]] = {}
+        self.connection_ids: dict[tuple, tuple[int, float]] = {}
+
+    def get_address(self, host: str, now: float) -> str | None:
+        """
+        Get the IP address that the given host name resolved to, if it is still valid.
+        """
+        ip_address, expires = self.addresses.get(host, (None, 0))
+        if expires <= now:
+            self.addresses.pop(host, None)
+            return None
+        return ip_address
+
+    def set_address(self, host: str, ip_address: str, now: float) -> None:
+        """
+        Store the IP address that the given host name resolved to.
+        """
+        self.addresses[host] = (ip_address, now + self.address_lifetime)
+
+    def get_connection_id(self, key: tuple, now: float) -> int | None:
+        """
+        Get the connection ID for the given tracker, if it is still valid.
+
+        :param key: the (proxy, tracker address) of the tracker.
+        """
+        connection_id, expires = self.connection_ids.get(key, (None, 0))
+        if expires <= now:
+            self.connection_ids.pop(key, None)
+            return None
+        return connection_id
+
+    def set_connection_id(self, key: tuple, connection_id: int, obtained_at: float) -> None:
+        """
+        Store the connection ID that the given tracker handed out.
+
+        :param key: the (proxy, tracker address) of the tracker.
+        :param obtained_at: the time at which the connection ID was requested.
+        """
+        self.connection_ids[key] = (connection_id, obtained_at + self.connection_id_lifetime)
+
+    def invalidate(self, key: tuple) -> None:
+        """
+        Forget the connection ID of the given tracker, e.g., because the tracker did not accept it.
+        """
+        self.connection_ids.pop(key, None)
+
+
 class UdpSocketManager(DatagramProtocol):
     """
     The UdpSocketManager ensures that the network packets are forwarded to the right UdpTrackerSession.
@@ -221,6 +373,7 @@ class UdpSocketManager(DatagramProtocol):
         self.tracker_sessions: dict[int, Future[bytes]] = {}
         self.transport: Socks5Client | None = None
         self.proxy_transports: dict[tuple, Socks5Client] = {}
+        self.tracker_cache = UdpTrackerCache()
 
     def connection_made(self, transport: Socks5Client) -> None:
         """
@@ -294,7 +447,7 @@ class UdpTrackerSession(TrackerSession):
         self._connection_id = 0
         self.transaction_id = 0
         self.port = tracker_address[1]
-        self.ip_address = None
+        self.ip_address: str | None = None
         self.socket_mgr = socket_mgr
         self.proxy = proxy
 
@@ -303,6 +456,13 @@ class UdpTrackerSession(TrackerSession):
         self.action = TRACKER_ACTION_CONNECT
         self.generate_transaction_id()
 
+    @property
+    def cache_key(self) -> tuple:
+        """
+        The key of this tracker in the tracker cache of the socket manager.
+        """
+        return self.proxy, self.tracker_address
+
     def generate_transaction_id(self) -> None:
         """
         Generates a unique transaction id and stores this in the _active_session_dict set.
@@ -354,20 +514,52 @@ class UdpTrackerSession(TrackerSession):
                 # We only resolve the hostname if we're not using a proxy.
                 # If a proxy is used, the TunnelCommunity will resolve the hostname at the exit nodes.
                 if not self.proxy:
-                    # Resolve the hostname to an IP address if not done already
-                    coro = get_event_loop().getaddrinfo(self.tracker_address[0], 0, family=socket.AF_INET)
-                    if isinstance(coro, Future):
-                        infos = await coro  # In Python <=3.6 getaddrinfo returns a Future
-                    else:
-                        infos = await self.register_anonymous_task("resolve", ensure_future(coro))
-                    self.ip_address = infos[0][-1][0]
-                await self.connect()
-                return await self.scrape()
+                    await self.resolve()
+                try:
+                    # Skip the connect round-trip if the tracker gave us a connection ID recently
+                    connection_id = self.socket_mgr.tracker_cache.get_connection_id(self.cache_key, time.time())
+                    if connection_id is not None:
+                        self._connection_id = connection_id
+                        self.action = TRACKER_ACTION_SCRAPE
+                        try:
+                            return await self.scrape(cached_connection_id=True)
+                        except ConnectionIdRejectedError:
+                            # The tracker dropped the connection ID since, so we connect again
+                            self.socket_mgr.tracker_cache.invalidate(self.cache_key)
+                            self._connection_id = UDP_TRACKER_INIT_CONNECTION_ID
+                            self.action = TRACKER_ACTION_CONNECT
+                            self.generate_transaction_id()
+                    await self.connect()
+                    return await self.scrape()
+                except ValueError:
+                    # The tracker may have dropped our connection ID, so don't reuse it
+                    self.socket_mgr.tracker_cache.invalidate(self.cache_key)
+                    raise
         except TimeoutError:
+            self.socket_mgr.tracker_cache.invalidate(self.cache_key)
             self.failed(msg="request timed out")
         except socket.gaierror as e:
             self.failed(msg=str(e))
 
+    async def resolve(self) -> None:
+        """
+        Resolve the hostname of the tracker to an IP address, unless it was resolved recently.
+        """
+        host = self.tracker_address[0]
+        cached_address = self.socket_mgr.tracker_cache.get_address(host, time.time())
+        if cached_address is not None:
+            self.ip_address = cached_address
+            return
+
+        coro = get_event_loop().getaddrinfo(host, 0, family=socket.AF_INET)
+        if isinstance(coro, Future):
+            infos = await coro  # In Python <=3.6 getaddrinfo returns a Future
+        else:
+            infos = await self.register_anonymous_task("resolve", ensure_future(coro))
+        ip_address = infos[0][-1][0]
+        self.ip_address = ip_address
+        self.socket_mgr.tracker_cache.set_address(host, ip_address, time.time())
+
     async def connect(self) -> None:
         """
         Creates a connection message and calls the socket manager to send it.
@@ -376,6 +568,7 @@ class UdpTrackerSession(TrackerSession):
             self.failed(msg="UDP socket transport not ready")
 
         # Initiate the connection
+        requested_at = time.time()
         message = struct.pack("!qii", self._connection_id, self.action, self.transaction_id)
         raw_response = await self.socket_mgr.send_request(message, self)
 
@@ -401,13 +594,17 @@ class UdpTrackerSession(TrackerSession):
 
         # update action and IDs
         self._connection_id = struct.unpack_from("!q", response, 8)[0]
+        self.socket_mgr.tracker_cache.set_connection_id(self.cache_key, self._connection_id, requested_at)
         self.action = TRACKER_ACTION_SCRAPE
         self.generate_transaction_id()
         self.last_contact = int(time.time())
 
-    async def scrape(self) -> TrackerResponse:
+    async def scrape(self, cached_connection_id: bool = False) -> TrackerResponse:
         """
         Parse the response of a tracker.
+
+        :param cached_connection_id: whether the connection ID was handed out to an earlier session.
+        :raises ConnectionIdRejectedError: if the tracker responds with an error to a cached connection ID.
         """
         fmt = "!qii" + ("20s" * len(self.infohash_list))
         message = struct.pack(fmt, self._connection_id, self.action, self.transaction_id, *self.infohash_list)
@@ -432,6 +629,8 @@ class UdpTrackerSession(TrackerSession):
 
             self._logger.info("%s Error response for UDP SCRAPE: [%s] [%s]",
                               self, repr(response), repr(error_message))
+            if cached_connection_id:
+                raise ConnectionIdRejectedError(error_message.decode(errors="ignore"))
             self.failed(msg=error_message.decode(errors="ignore"))
 
         # get results
@@ -465,20 +664,44 @@ class UdpTrackerSession(TrackerSession):
 class FakeDHTSession(TrackerSession):
     """
     Fake TrackerSession that manages DHT requests.
+
+    The health is looked up using BEP33 scrapes, or the number of peers in the DHT, which does not require joining the
+    swarms of the torrents. Fetching the metainfo of the torrents, which does, only happens when explicitly requested.
     """
 
-    def __init__(self, download_manager: DownloadManager, timeout: float) -> None:
+    def __init__(self, download_manager: DownloadManager, timeout: float, use_metainfo: bool = False) -> None:
         """
         Create a new fake DHT tracker session.
+
+        :param use_metainfo: whether to fetch the metainfo of the torrents to find their seeders and leechers.
         """
         super().__init__("DHT", "DHT", ("DHT", 0), "DHT", timeout)
 
         self.download_manager = download_manager
+        self.use_metainfo = use_metainfo
 
     async def connect_to_tracker(self) -> TrackerResponse:
         """
         Query the bittorrent DHT.
         """
+        if self.use_metainfo:
+            return await self.connect_using_metainfo()
+
+        health_manager = self.download_manager.dht_health_manager
+        if health_manager is None:
+            self.failed(msg="DHT health lookups are not available")
+        results = await gather(*[health_manager.get_health(infohash, timeout=self.timeout)
+                                 for infohash in self.infohash_list], return_exceptions=True)
+        now = int(time.time())
+        health_list = [HealthInfo(result.infohash, seeders=result.seeders, leechers=result.leechers,
+                                  last_check=now, self_checked=True)
+                       for result in results if not isinstance(result, BaseException)]
+        return TrackerResponse(url="DHT", torrent_health_list=health_list)
+
+    async def connect_using_metainfo(self) -> TrackerResponse:
+        """
+        Query the bittorrent DHT by fetching the metainfo of every torrent.
+        """
         health_list = []
         now = int(time.time())
         for infohash in self.infohash_list:
@@ -492,35 +715,19 @@ class FakeDHTSession(TrackerSession):
         return TrackerResponse(url="DHT", torrent_health_list=health_list)
 
 
-class FakeBep33DHTSession(FakeDHTSession):
-    """
-    Fake session for a BEP33 lookup.
-    """
-
-    async def connect_to_tracker(self) -> TrackerResponse:
-        """
-        Query the bittorrent DHT using BEP33 to avoid joining the swarm.
-        """
-        coros = [self.download_manager.dht_health_manager.get_health(infohash, timeout=self.timeout)
-                 for infohash in self.infohash_list]
-        results: list[HealthInfo] = []
-        for coroutine in coros:
-            local_results = [result for result in (await coroutine) if not isinstance(result, Exception)]
-            results = [*results, *local_results]
-        return TrackerResponse(url="DHT", torrent_health_list=results)
-
-
 def create_tracker_session(tracker_url: str, timeout: float, proxy: tuple,
-                           socket_manager: UdpSocketManager) -> TrackerSession:
+                           socket_manager: UdpSocketManager, http_pool: HttpClientPool | None = None) -> TrackerSession:
     """
     Creates a tracker session with the given tracker URL.
 
     :param tracker_url: The given tracker URL.
     :param timeout: The timeout for the session.
+    :param http_pool: The shared HTTP clients to use for HTTP trackers, if any.
     :return: The tracker session.
     """
     tracker_type, tracker_address, announce_page = parse_tracker_url(tracker_url)
 
     if tracker_type == "udp":
         return UdpTrackerSession(tracker_url, tracker_address, announce_page, timeout, proxy, socket_manager)
-    return HttpTrackerSession(tracker_url, tracker_address, announce_page, timeout, proxy)
+    return HttpTrackerSession(tracker_url, tracker_address, announce_page, timeout, proxy,
+                              http_pool.get(proxy) if http_pool else None)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import os
 import sys
 from binascii import hexlify
@@ -14,17 +15,20 @@ from ipv8.test.mocking.endpoint import MockEndpointListener
 from tribler.core.content_discovery.community import ContentDiscoveryCommunity, ContentDiscoverySettings
 from tribler.core.content_discovery.payload import (
     PopularTorrentsRequest,
+    RemoteSelectPayload,
     SelectResponsePayload,
     TorrentsHealthPayload,
     VersionRequest,
     VersionResponse,
 )
+from tribler.core.content_discovery.search import RemoteSearch
 from tribler.core.database.layers.knowledge import ResourceType
 from tribler.core.database.orm_bindings.torrent_metadata import LZ4_EMPTY_ARCHIVE
 from tribler.core.database.serialization import REGULAR_TORRENT
 from tribler.core.notifier import Notification, Notifier
 from tribler.core.torrent_checker.torrent_checker import TorrentChecker
 from tribler.core.torrent_checker.torrentchecker_session import HealthInfo
+from tribler.tribler_config import TriblerConfigManager
 
 if TYPE_CHECKING:
     from ipv8.community import CommunitySettings
@@ -42,7 +46,7 @@ class MockTorrentChecker(TorrentChecker):
         """
         Create a new mocked TorrentChecker.
         """
-        super().__init__(None, None, None, None, None)
+        super().__init__(TriblerConfigManager(), None, Mock(), None, None)
         self._torrents_checked = {self.infohash: HealthInfo(self.infohash, 7, 42, 1337)}
 
     def set_torrents_checked(self, value: dict[bytes, HealthInfo]) -> None:
@@ -71,7 +75,8 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
         """
         overwrite_settings = ContentDiscoverySettings(
             torrent_checker=MockTorrentChecker(),
-            metadata_store=Mock(get_entries_threaded=AsyncMock(), process_compressed_mdblob_threaded=AsyncMock())
+            metadata_store=Mock(get_entries_threaded=AsyncMock(), process_compressed_mdblob_threaded=AsyncMock(),
+                                get_unknown_infohashes=Mock(side_effect=lambda infohashes: infohashes))
         )
         out = super().create_node(overwrite_settings, create_dht, enable_statistics)
         out.overlay.cancel_all_pending_tasks()
@@ -114,6 +119,34 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
         self.assertEqual(1, message.random_torrents_length)
         self.assertEqual(0, message.torrents_checked_length)
 
+    async def test_torrents_health_resolve_unknown(self) -> None:
+        """
+        Test if the metadata of only the unknown torrents in a health message is requested, one select per torrent.
+        """
+        known = b"\x02" * 20
+        unknown = b"\x03" * 20
+        self.overlay(1).composition.metadata_store.get_unknown_infohashes = Mock(
+            side_effect=lambda infohashes: infohashes - {known}
+        )
+        self.torrent_checker(0).set_torrents_checked({
+            MockTorrentChecker.infohash: HealthInfo(MockTorrentChecker.infohash, 7, 42, 1337),
+            known: HealthInfo(known, 7, 42, 1337),
+            unknown: HealthInfo(unknown, 7, 42, 1337)
+        })
+
+        with self.assertReceivedBy(0, [RemoteSelectPayload, RemoteSelectPayload],
+                                   message_filter=[RemoteSelectPayload]) as received:
+            self.overlay(0).ez_send(self.peer(1), TorrentsHealthPayload.create({}, self.overlay(0).get_random_torrents()))
+            await self.deliver_messages()
+
+        queries = sorted((json.loads(message.json) for message in received), key=lambda query: query["infohash"])
+        # The infohashes are encoded exactly as older peers encode them
+        expected = [self.overlay(1).convert_to_json({"infohash": hexlify(infohash).decode(), "last": 1})
+                    for infohash in (MockTorrentChecker.infohash, unknown)]
+
+        self.assertEqual(1, self.overlay(1).composition.metadata_store.process_torrent_health_batch.call_count)
+        self.assertEqual([json.loads(query) for query in expected], queries)
+
     def test_get_alive_torrents(self) -> None:
         """
         Test if get_alive_checked_torrents returns a known alive torrent.
@@ -195,6 +228,71 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
         self.assertEqual([], notifications["results"])
         self.assertEqual(hexlify(peers[0].mid).decode(), notifications["peer"])
 
+    async def test_popularity_search_latency(self) -> None:
+        """
+        Test if the response time of searched peers is remembered.
+        """
+        _, peers = self.overlay(0).send_search_request(txt_filter="ubuntu*")
+        await self.deliver_messages()
+
+        self.assertIn(peers[0].mid, self.overlay(0).peer_latencies)
+
+    async def test_popularity_search_latency_before_processing(self) -> None:
+        """
+        Test if the response time of searched peers does not include the processing of their response.
+        """
+        latencies_on_processing = []
+        self.overlay(0).composition.metadata_store.process_compressed_mdblob_threaded = AsyncMock(
+            side_effect=lambda *_: latencies_on_processing.append(dict(self.overlay(0).peer_latencies)) or []
+        )
+
+        _, peers = self.overlay(0).send_search_request(txt_filter="ubuntu*")
+        await self.deliver_messages()
+
+        self.assertIn(peers[0].mid, latencies_on_processing[0])
+
+    def test_get_search_peers(self) -> None:
+        """
+        Test if faster peers are preferred for searches and unknown peers over slow peers.
+        """
+        fast, slow, unknown = Mock(mid=b"fast"), Mock(mid=b"slow"), Mock(mid=b"unknown")
+        self.overlay(0).get_random_peers = Mock(return_value=[slow, unknown, fast])
+        self.overlay(0).peer_latencies = {b"fast": 0.1, b"slow": 10.0}
+
+        self.assertEqual([fast, unknown], self.overlay(0).get_search_peers(2))
+
+    async def test_search_waves(self) -> None:
+        """
+        Test if peers are queried in waves, until all peers are queried.
+        """
+        self.overlay(0).composition.search_wave_size = 1
+        self.overlay(0).composition.search_wave_interval = 0
+        search = RemoteSearch({"txt_filter": "ubuntu*"}, max_results=10)
+
+        self.overlay(0).extend_search(search, [self.peer(1)] * 3, Mock())
+
+        self.assertEqual([self.peer(1)], search.peers)
+        self.assertTrue(self.overlay(0).is_pending_task_active(f"Extend search {search.uuid} wave 1"))
+
+        await self.deliver_messages()
+
+        self.assertEqual([self.peer(1)] * 3, search.peers)
+        self.assertEqual(3, search.waves)
+
+    async def test_search_finished(self) -> None:
+        """
+        Test if no more peers are queried and pending requests are dropped once a search has enough results.
+        """
+        search = RemoteSearch({"txt_filter": "ubuntu*"}, max_results=1)
+        self.overlay(0).extend_search(search, [self.peer(1)], Mock())
+        search.sources[b"\x01" * 20] = 1
+
+        self.overlay(0).stop_search(search)
+        self.overlay(0).extend_search(search, [self.peer(1)], Mock())
+
+        self.assertEqual(1, len(search.requests))
+        self.assertFalse(self.overlay(0).request_cache.has(search.requests[0].prefix, search.requests[0].number))
+
     async def test_request_for_version(self) -> None:
         """
         Test if a version request is responded to.
@@ -265,6 +363,39 @@ class TestContentDiscoveryCommunity(TestBase[ContentDiscoveryCommunity]):
         select_request = mock_callback.call_args[0][0]
         self.assertTrue(select_request.peer_responded)
 
+    async def test_remote_select_cached(self) -> None:
+        """
+        Test if repeated remote selects are answered from the response cache.
+        """
+        entry = Mock(serialized=Mock(return_value=b"\x01" * 32), serialized_health=Mock(return_value=b";"))
+        metadata_store = self.overlay(0).composition.metadata_store
+        metadata_store.get_entries_threaded = AsyncMock(return_value=[entry])
+
+        with self.assertReceivedBy(1, [SelectResponsePayload, SelectResponsePayload]) as responses:
+            self.overlay(1).send_remote_select(self.peer(0), txt_filter="ubuntu*")
+            await self.deliver_messages()
+            self.overlay(1).send_remote_select(self.peer(0), txt_filter="ubuntu*")
+            await self.deliver_messages()
+
+        self.assertEqual(1, metadata_store.get_entries_threaded.call_count)
+        self.assertEqual(responses[0].raw_blob, responses[1].raw_blob)
+        self.assertEqual(1, self.overlay(0).response_cache.get_statistics()["hits"])
+
+    async def test_remote_select_rejected(self) -> None:
+        """
+        Test if remote selects of a peer that queries too much are answered with an empty archive.
+        """
+        self.overlay(0).query_scheduler.burst = 0
+
+        with self.assertReceivedBy(1, [SelectResponsePayload]) as responses:
+            self.overlay(1).send_remote_select(self.peer(0), txt_filter="ubuntu*")
+            await self.deliver_messages()
+        response, = responses
+
+        self.assertEqual(LZ4_EMPTY_ARCHIVE, response.raw_blob)
+        self.assertFalse(self.overlay(0).composition.metadata_store.get_entries_threaded.called)
+        self.assertEqual(1, self.overlay(0).query_scheduler.get_statistics()["rejected_rate"])
+
     async def test_remote_select_deprecated(self) -> None:
         """
         Test deprecated search keys receiving an empty archive response.
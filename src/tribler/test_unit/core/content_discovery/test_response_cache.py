@@ -0,0 +1,104 @@
+from unittest.mock import patch
+
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.response_cache import ResponseCache
+
+
+class TestResponseCache(TestBase):
+    """
+    Tests for the ResponseCache class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new cache.
+        """
+        super().setUp()
+        self.cache = ResponseCache(size=2, max_bytes=10, ttl=30)
+
+    def test_get_unknown(self) -> None:
+        """
+        Test if unknown queries are a miss.
+        """
+        self.assertIsNone(self.cache.get({"txt_filter": "a"}, 1))
+        self.assertEqual({"hits": 0, "misses": 1, "hit_rate": 0.0, "size": 0, "bytes": 0},
+                         self.cache.get_statistics())
+
+    def test_get_known(self) -> None:
+        """
+        Test if known queries are a hit.
+        """
+        self.cache.put({"txt_filter": "a", "first": 0, "last": 100}, 1, [b"abc", b"d"])
+
+        self.assertEqual([b"abc", b"d"], self.cache.get({"last": 100, "first": 0, "txt_filter": "a"}, 1))
+        self.assertIsNone(self.cache.get({"txt_filter": "a", "first": 100, "last": 200}, 1))
+        self.assertEqual({"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1, "bytes": 4},
+                         self.cache.get_statistics())
+
+    def test_get_unhashable_parameters(self) -> None:
+        """
+        Test if queries with unhashable parameters can be cached.
+        """
+        self.cache.put({"tags": ["a", "b"], "origin": {"a": 1}}, 1, [b"abc"])
+
+        self.assertEqual([b"abc"], self.cache.get({"tags": ["a", "b"], "origin": {"a": 1}}, 1))
+
+    def test_get_set_parameters(self) -> None:
+        """
+        Test if queries with equal sets are a hit, regardless of the iteration order of the sets.
+        """
+        self.cache.put({"infohash_set": {b"b", b"a"}}, 1, [b"abc"])
+
+        self.assertEqual(self.cache.make_key({"infohash_set": {b"a", b"b"}}),
+                         self.cache.make_key({"infohash_set": frozenset([b"b", b"a"])}))
+        self.assertEqual([b"abc"], self.cache.get({"infohash_set": {b"a", b"b"}}, 1))
+
+    def test_get_changed_watermark(self) -> None:
+        """
+        Test if cached responses are dropped when the database changed.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [b"abc"])
+
+        self.assertIsNone(self.cache.get({"txt_filter": "a"}, 2))
+        self.assertEqual(0, self.cache.get_statistics()["size"])
+
+    def test_get_expired(self) -> None:
+        """
+        Test if cached responses are dropped when they are older than the time-to-live.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [b"abc"])
+
+        with patch("time.time", lambda: float("inf")):
+            self.assertIsNone(self.cache.get({"txt_filter": "a"}, 1))
+        self.assertEqual(0, self.cache.get_statistics()["bytes"])
+
+    def test_evict_size(self) -> None:
+        """
+        Test if the least recently used response is evicted when the cache holds too many responses.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [b"a"])
+        self.cache.put({"txt_filter": "b"}, 1, [b"b"])
+        self.cache.get({"txt_filter": "a"}, 1)
+        self.cache.put({"txt_filter": "c"}, 1, [b"c"])
+
+        self.assertIsNotNone(self.cache.get({"txt_filter": "a"}, 1))
+        self.assertIsNone(self.cache.get({"txt_filter": "b"}, 1))
+
+    def test_evict_bytes(self) -> None:
+        """
+        Test if the least recently used responses are evicted when the cache holds too many bytes.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [b"aaaaaa"])
+        self.cache.put({"txt_filter": "b"}, 1, [b"bbbbbb"])
+
+        self.assertIsNone(self.cache.get({"txt_filter": "a"}, 1))
+        self.assertEqual(6, self.cache.get_statistics()["bytes"])
+
+    def test_put_too_large(self) -> None:
+        """
+        Test if responses that are larger than the cache are not stored.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [b"a" * 11])
+
+        self.assertEqual(0, self.cache.get_statistics()["size"])
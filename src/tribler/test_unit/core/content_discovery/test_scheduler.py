@@ -0,0 +1,119 @@
+from asyncio import Event, ensure_future, sleep
+from unittest.mock import patch
+
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.scheduler import (
+    COST_DEFAULT,
+    COST_FTS,
+    COST_INFOHASH,
+    COST_INFOHASH_SET_ITEM,
+    QueryScheduler,
+    estimate_cost,
+)
+
+
+class TestQueryScheduler(TestBase):
+    """
+    Tests for the QueryScheduler class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new scheduler that processes one query at a time.
+        """
+        super().setUp()
+        self.scheduler = QueryScheduler(rate=1, burst=20, max_concurrent=1, max_queued=2, max_wait=10)
+        self.order = []
+        self.release = Event()
+
+    async def blocking_query(self) -> str:
+        """
+        A query that only finishes when it is released.
+        """
+        await self.release.wait()
+        return "blocked"
+
+    def query(self, name: str):  # noqa: ANN201
+        """
+        Create a query that records its execution order.
+        """
+        async def run() -> str:
+            self.order.append(name)
+            return name
+        return run
+
+    def test_estimate_cost(self) -> None:
+        """
+        Test if the cost of a query depends on its shape.
+        """
+        self.assertEqual(COST_FTS, estimate_cost({"txt_filter": "ubuntu*", "first": 0, "last": 100}))
+        self.assertEqual(COST_INFOHASH, estimate_cost({"infohash": b"\x01" * 20}))
+        self.assertEqual(COST_INFOHASH + 2 * COST_INFOHASH_SET_ITEM,
+                         estimate_cost({"infohash_set": {b"\x01" * 20, b"\x02" * 20}}))
+        self.assertEqual(COST_DEFAULT, estimate_cost({"first": 0, "last": 100}))
+
+    async def test_run(self) -> None:
+        """
+        Test if an admitted query is run immediately.
+        """
+        self.assertEqual("a", await self.scheduler.run(b"peer", 1, self.query("a")))
+        self.assertEqual(1, self.scheduler.get_statistics()["processed"])
+
+    async def test_reject_rate(self) -> None:
+        """
+        Test if the queries of a peer that exceeds its token bucket are rejected, without affecting other peers.
+        """
+        self.assertEqual("a", await self.scheduler.run(b"peer", 15, self.query("a")))
+        self.assertIsNone(await self.scheduler.run(b"peer", 15, self.query("b")))
+        self.assertEqual("c", await self.scheduler.run(b"other", 15, self.query("c")))
+        self.assertEqual(1, self.scheduler.get_statistics()["rejected_rate"])
+
+    async def test_fair_queueing(self) -> None:
+        """
+        Test if queued queries of different peers are taken in turn.
+        """
+        self.scheduler.max_queued = 3
+        blocked = ensure_future(self.scheduler.run(b"peer1", 1, self.blocking_query))
+        await sleep(0)
+        queued = [ensure_future(self.scheduler.run(b"peer1", 1, self.query("peer1 a"))),
+                  ensure_future(self.scheduler.run(b"peer1", 1, self.query("peer1 b"))),
+                  ensure_future(self.scheduler.run(b"peer2", 1, self.query("peer2 a")))]
+        await sleep(0)
+        self.assertEqual(3, self.scheduler.get_statistics()["queued"])
+        self.release.set()
+
+        self.assertEqual("blocked", await blocked)
+        self.assertEqual(["peer1 a", "peer1 b", "peer2 a"], [await query for query in queued])
+        self.assertEqual(["peer1 a", "peer2 a", "peer1 b"], self.order)
+
+    async def test_reject_full(self) -> None:
+        """
+        Test if queries are rejected when the queue is full.
+        """
+        blocked = ensure_future(self.scheduler.run(b"peer", 1, self.blocking_query))
+        await sleep(0)
+        queued = [ensure_future(self.scheduler.run(b"peer", 1, self.query(str(i)))) for i in range(2)]
+        await sleep(0)
+
+        self.assertIsNone(await self.scheduler.run(b"peer", 1, self.query("rejected")))
+        self.release.set()
+        await blocked
+        self.assertEqual(["0", "1"], [await query for query in queued])
+        self.assertEqual(1, self.scheduler.get_statistics()["rejected_full"])
+
+    async def test_shed(self) -> None:
+        """
+        Test if queued queries are shed after their deadline.
+        """
+        blocked = ensure_future(self.scheduler.run(b"peer", 1, self.blocking_query))
+        await sleep(0)
+        queued = ensure_future(self.scheduler.run(b"peer", 1, self.query("late")))
+        await sleep(0)
+
+        with patch("time.time", lambda: float("inf")):
+            self.release.set()
+            await blocked
+            self.assertIsNone(await queued)
+        self.assertEqual([], self.order)
+        self.assertEqual(1, self.scheduler.get_statistics()["shed"])
@@ -0,0 +1,66 @@
+from unittest.mock import Mock
+
+from ipv8.test.base import TestBase
+
+from tribler.core.content_discovery.search import RemoteSearch
+from tribler.core.database.store import ObjState, ProcessingResult
+
+
+class TestRemoteSearch(TestBase):
+    """
+    Tests for the RemoteSearch class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new search.
+        """
+        super().setUp()
+        self.search = RemoteSearch({"txt_filter": "ubuntu"}, max_results=2)
+
+    def result(self, infohash: bytes, title: str, seeders: int = 0,
+               obj_state: ObjState = ObjState.NEW_OBJECT) -> ProcessingResult:
+        """
+        Create a processing result for a torrent.
+        """
+        simple_dict = {"name": title, "num_seeders": seeders, "num_leechers": 0, "created": 0,
+                       "infohash": infohash.hex()}
+        return ProcessingResult(Mock(infohash=infohash, to_simple_dict=Mock(return_value=simple_dict)), obj_state)
+
+    def test_add_results_ranked(self) -> None:
+        """
+        Test if new results are ordered by their rank.
+        """
+        results = self.search.add_results([self.result(b"\x01" * 20, "debian"),
+                                           self.result(b"\x02" * 20, "ubuntu")])
+
+        self.assertEqual(["ubuntu", "debian"], [result["name"] for result in results])
+
+    def test_add_results_merged(self) -> None:
+        """
+        Test if results that another peer already gave are not reported again, but counted.
+        """
+        self.search.add_results([self.result(b"\x01" * 20, "ubuntu")])
+        results = self.search.add_results([self.result(b"\x01" * 20, "ubuntu", obj_state=ObjState.DUPLICATE_OBJECT)])
+
+        self.assertEqual([], results)
+        self.assertEqual(2, self.search.sources[b"\x01" * 20])
+
+    def test_add_results_known(self) -> None:
+        """
+        Test if results that were already in our database are not reported.
+        """
+        results = self.search.add_results([self.result(b"\x01" * 20, "ubuntu", obj_state=ObjState.DUPLICATE_OBJECT)])
+
+        self.assertEqual([], results)
+        self.assertEqual({}, self.search.sources)
+
+    def test_finished(self) -> None:
+        """
+        Test if a search is finished when it has enough results.
+        """
+        self.search.add_results([self.result(b"\x01" * 20, "ubuntu")])
+        self.assertFalse(self.search.finished)
+
+        self.search.add_results([self.result(b"\x02" * 20, "ubuntu")])
+        self.assertTrue(self.search.finished)
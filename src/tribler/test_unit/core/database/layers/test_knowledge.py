@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from types import SimpleNamespace
 from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
 
 from ipv8.test.base import TestBase
 
 from tribler.core.database.layers.health import ResourceType
-from tribler.core.database.layers.knowledge import KnowledgeDataAccessLayer, Operation
+from tribler.core.database.layers.knowledge import KnowledgeDataAccessLayer, Operation, SimpleStatement
 from tribler.core.knowledge.payload import StatementOperation
 
 if TYPE_CHECKING:
@@ -59,6 +60,9 @@ class MockStatement(MockEntity):
     A mocked Statement.
     """
 
+    local_operation = None
+    score = 0
+
     def update_counter(self, operation: Operation, increment: int = 1, is_local_peer: bool = False) -> None:
         """
         Fake a counter update and store the calling args.
@@ -88,25 +92,6 @@ class MockStatementOp(MockEntity):
         """
         return 0
 
-    @classmethod
-    def select_random(cls: type[Self], count: int) -> list[Self]:
-        """
-        Fake random selection.
-        """
-        out = []
-        for i in range(count):
-            statement_op = MockStatementOp()
-            statement_op.id = i
-            statement_op.statement = None
-            statement_op.peer = None
-            statement_op.operation = Operation.ADD.value
-            statement_op.clock = 0
-            statement_op.signature = b""
-            statement_op.updated_at = 0
-            statement_op.auto_generated = False
-            out.append(statement_op)
-        return out
-
 
 class MockStatementOpMissing(MockStatement):
     """
@@ -142,6 +127,7 @@ class TestKnowledgeDataAccessLayer(TestBase):
         """
         super().setUp()
         self.kdal = KnowledgeDataAccessLayer(MockDatabase())
+        self.kdal.commit_hooks = Mock()
         self.kdal.Statement = MockStatement
         self.kdal.Statement.CREATED = []
         self.kdal.StatementOp = MockStatementOpMissing
@@ -275,15 +261,67 @@ class TestKnowledgeDataAccessLayer(TestBase):
 
         self.assertEqual(["test tag"], value)
 
-    def test_get_operations_for_gossip(self) -> None:
+    def test_get_simple_statements_for_subjects(self) -> None:
         """
-        Test if.
+        Test if the statements of subjects that are not cached are selected at once.
         """
-        self.kdal.StatementOp = MockStatementOp
+        statement = SimpleStatement(ResourceType.TORRENT, "a", ResourceType.TAG, "test tag")
+
+        with patch.object(self.kdal, "_select_simple_statements", Mock(return_value={"a": [statement]})) as select:
+            value = self.kdal.get_simple_statements_for_subjects(ResourceType.TORRENT, ["a", "b"])
+
+        self.assertEqual({"a": [statement], "b": []}, value)
+        select.assert_called_once_with(ResourceType.TORRENT, ["a", "b"])
+
+    def test_get_simple_statements_for_subjects_cached(self) -> None:
+        """
+        Test if the statements of cached subjects are not selected again.
+        """
+        statement = SimpleStatement(ResourceType.TORRENT, "a", ResourceType.TAG, "test tag")
+        with patch.object(self.kdal, "_select_simple_statements", Mock(return_value={"a": [statement]})):
+            self.kdal.get_simple_statements_for_subjects(ResourceType.TORRENT, ["a"])
+
+        with patch.object(self.kdal, "_select_simple_statements", Mock(return_value={})) as select:
+            value = self.kdal.get_simple_statements_for_subjects(ResourceType.TORRENT, ["a", "b"])
+
+        self.assertEqual({"a": [statement], "b": []}, value)
+        select.assert_called_once_with(ResourceType.TORRENT, ["b"])
+
+    def test_get_simple_statements_for_subjects_evict(self) -> None:
+        """
+        Test if the least recently used subject is forgotten when the cache is full.
+        """
+        self.kdal.statement_cache_size = 2
+
+        with patch.object(self.kdal, "_select_simple_statements", Mock(return_value={})):
+            self.kdal.get_simple_statements_for_subjects(ResourceType.TORRENT, ["a", "b"])
+            self.kdal.get_simple_statements_for_subjects(ResourceType.TORRENT, ["a"])
+            self.kdal.get_simple_statements_for_subjects(ResourceType.TORRENT, ["c"])
+
+        self.assertEqual([(ResourceType.TORRENT, "a"), (ResourceType.TORRENT, "c")],
+                         list(self.kdal.statement_cache))
+
+    def test_add_operation_invalidates_cache(self) -> None:
+        """
+        Test if the cached statements of a subject are forgotten when an operation is added for it.
+        """
+        with patch.object(self.kdal, "_select_simple_statements", Mock(return_value={})):
+            self.kdal.get_simple_statements_for_subjects(ResourceType.TORRENT, ["\x01" * 20, "\x02" * 20])
+
+        self.kdal.add_auto_generated_operation(ResourceType.TORRENT, "\x01" * 20, ResourceType.TAG, "test tag")
+
+        self.assertEqual([(ResourceType.TORRENT, "\x02" * 20)], list(self.kdal.statement_cache))
+
+    def test_add_operation_invalidates_cache_after_transaction(self) -> None:
+        """
+        Test if the cached statements of a subject are forgotten again when the transaction ends.
+        """
+        self.kdal.add_auto_generated_operation(ResourceType.TORRENT, "\x01" * 20, ResourceType.TAG, "test tag")
+        with patch.object(self.kdal, "_select_simple_statements", Mock(return_value={})):
+            self.kdal.get_simple_statements_for_subjects(ResourceType.TORRENT, ["\x01" * 20])
 
-        selected, = self.kdal.get_operations_for_gossip(1)
+        (forget, ), kwargs = self.kdal.commit_hooks.add.call_args
+        forget()
 
-        self.assertFalse(selected.auto_generated)
-        self.assertEqual(0, selected.clock)
-        self.assertEqual(0, selected.id)
-        self.assertEqual(Operation.ADD.value, selected.operation)
+        self.assertEqual({"on_rollback": True}, kwargs)
+        self.assertEqual([], list(self.kdal.statement_cache))
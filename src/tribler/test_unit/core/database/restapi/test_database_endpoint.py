@@ -9,6 +9,7 @@ from ipv8.test.base import TestBase
 from multidict import MultiDict, MultiDictProxy
 
 from tribler.core.database.layers.knowledge import ResourceType, SimpleStatement
+from tribler.core.database.queries import encode_continuation_token
 from tribler.core.database.restapi.database_endpoint import DatabaseEndpoint, parse_bool
 from tribler.core.database.serialization import REGULAR_TORRENT
 from tribler.core.restapi.rest_endpoint import HTTP_BAD_REQUEST
@@ -114,6 +115,18 @@ class TestDatabaseEndpoint(TestBase):
         self.assertEqual(1337, sanitized["max_rowid"])
         self.assertEqual(b"\xaa", sanitized["channel_pk"])
 
+    def test_sanitize_continuation_token(self) -> None:
+        """
+        Test if continuation tokens are passed on and malformed continuation tokens are refused.
+        """
+        token = encode_continuation_token("abc", 7)
+
+        sanitized = DatabaseEndpoint.sanitize_parameters(MultiDictProxy(MultiDict([("continuation_token", token)])))
+
+        self.assertEqual(token, sanitized["continuation_token"])
+        with self.assertRaises(ValueError):
+            DatabaseEndpoint.sanitize_parameters(MultiDictProxy(MultiDict([("continuation_token", "bla")])))
+
     def test_parse_bool(self) -> None:
         """
         Test if parse bool fulfills its promises.
@@ -129,9 +142,9 @@ class TestDatabaseEndpoint(TestBase):
         """
         metadata = {"type": REGULAR_TORRENT, "infohash": "AA"}
         endpoint = DatabaseEndpoint()
-        endpoint.tribler_db = Mock(knowledge=Mock(get_simple_statements=Mock(return_value=[
-            SimpleStatement(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")
-        ])))
+        endpoint.tribler_db = Mock(knowledge=Mock(get_simple_statements_for_subjects=Mock(return_value={
+            "AA": [SimpleStatement(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")]
+        })))
         endpoint.add_statements_to_metadata_list([metadata])
 
         self.assertEqual(ResourceType.TORRENT, metadata["statements"][0]["subject_type"])
@@ -139,6 +152,25 @@ class TestDatabaseEndpoint(TestBase):
         self.assertEqual(ResourceType.TAG, metadata["statements"][0]["predicate"])
         self.assertEqual("tag", metadata["statements"][0]["object"])
 
+    def test_add_statements_to_metadata_list_batched(self) -> None:
+        """
+        Test if the statements of all torrents in a metadata list are loaded at once.
+        """
+        metadata = [{"type": REGULAR_TORRENT, "infohash": "AA"}, {"type": REGULAR_TORRENT, "infohash": "BB"},
+                    {"type": 0, "infohash": "CC"}]
+        endpoint = DatabaseEndpoint()
+        endpoint.tribler_db = Mock(knowledge=Mock(get_simple_statements_for_subjects=Mock(return_value={
+            "AA": [SimpleStatement(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")], "BB": []
+        })))
+        endpoint.add_statements_to_metadata_list(metadata)
+
+        endpoint.tribler_db.knowledge.get_simple_statements_for_subjects.assert_called_once_with(
+            subject_type=ResourceType.TORRENT, subjects={"AA", "BB"}
+        )
+        self.assertEqual("tag", metadata[0]["statements"][0]["object"])
+        self.assertEqual([], metadata[1]["statements"])
+        self.assertNotIn("statements", metadata[2])
+
     async def test_get_torrent_health_bad_timeout(self) -> None:
         """
         Test if a bad timeout value in get_torrent_health leads to a HTTP_BAD_REQUEST status.
@@ -221,9 +253,9 @@ class TestDatabaseEndpoint(TestBase):
         """
         metadata = {"type": REGULAR_TORRENT, "infohash": "AA"}
         endpoint = DatabaseEndpoint()
-        endpoint.tribler_db = Mock(knowledge=Mock(get_simple_statements=Mock(return_value=[
-            SimpleStatement(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")
-        ])))
+        endpoint.tribler_db = Mock(knowledge=Mock(get_simple_statements_for_subjects=Mock(return_value={
+            "AA": [SimpleStatement(ResourceType.TORRENT, "AA", ResourceType.TAG, "tag")]
+        })))
         download = Mock(get_state=Mock(return_value=Mock(get_progress=Mock(return_value=1.0))),
                         tdef=Mock(infohash="AA"))
         endpoint.download_manager = Mock(get_download=Mock(return_value=download), metainfo_requests=[])
@@ -273,7 +305,7 @@ class TestDatabaseEndpoint(TestBase):
         """
         endpoint = DatabaseEndpoint()
         endpoint.tribler_db = Mock()
-        endpoint.mds = Mock(run_threaded=self.mds_run_now, get_total_count=Mock(), get_max_rowid=Mock(),
+        endpoint.mds = Mock(run_threaded_readonly=self.mds_run_now, get_total_count=Mock(), get_max_rowid=Mock(),
                             get_entries=Mock(return_value=[Mock(to_simple_dict=Mock(return_value={"test": "test",
                                                                                                   "type": -1}))]))
 
@@ -293,7 +325,7 @@ class TestDatabaseEndpoint(TestBase):
         """
         endpoint = DatabaseEndpoint()
         endpoint.tribler_db = Mock()
-        endpoint.mds = Mock(run_threaded=self.mds_run_now, get_total_count=Mock(return_value=1),
+        endpoint.mds = Mock(run_threaded_readonly=self.mds_run_now, estimate_total_count=Mock(return_value=(1, False)),
                             get_max_rowid=Mock(return_value=7),
                             get_entries=Mock(return_value=[Mock(to_simple_dict=Mock(return_value={"test": "test",
                                                                                                   "type": -1}))]))
@@ -308,8 +340,29 @@ class TestDatabaseEndpoint(TestBase):
         self.assertEqual(None, response_body_json["sort_by"])
         self.assertEqual(True, response_body_json["sort_desc"])
         self.assertEqual(1, response_body_json["total"])
+        self.assertFalse(response_body_json["is_estimate"])
         self.assertEqual(7, response_body_json["max_rowid"])
 
+    async def test_local_search_continuation_token(self) -> None:
+        """
+        Test if a local search that fills the requested page includes a continuation token.
+        """
+        endpoint = DatabaseEndpoint()
+        endpoint.tribler_db = Mock()
+        endpoint.mds = Mock(run_threaded_readonly=self.mds_run_now, get_continuation_token=Mock(return_value="token"),
+                            get_entries=Mock(return_value=[Mock(to_simple_dict=Mock(return_value={"test": "test",
+                                                                                                  "type": -1}))]))
+
+        response = await endpoint.local_search(SearchLocalRequest({"first": "1", "last": "1",
+                                                                   "continuation_token": encode_continuation_token(
+                                                                       None, 7)}, endpoint.mds))
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual(200, response.status)
+        self.assertEqual("token", response_body_json["continuation_token"])
+        self.assertEqual(encode_continuation_token(None, 7), endpoint.mds.get_entries.call_args.kwargs[
+            "continuation_token"])
+
     async def test_completions_bad_query(self) -> None:
         """
         Test if a missing query leads to a bad request status.
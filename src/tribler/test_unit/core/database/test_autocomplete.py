@@ -0,0 +1,111 @@
+from unittest.mock import patch
+
+from ipv8.test.base import TestBase
+
+from tribler.core.database.autocomplete import AutoCompleteIndex
+
+
+class TestAutoCompleteIndex(TestBase):
+    """
+    Tests for the AutoCompleteIndex class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new empty index.
+        """
+        super().setUp()
+        self.index = AutoCompleteIndex()
+
+    def test_get_terms(self) -> None:
+        """
+        Test if the terms of a title are its words and pairs of consecutive words.
+        """
+        self.assertSetEqual({"big", "buck", "bunny", "big buck", "buck bunny"},
+                            AutoCompleteIndex.get_terms(["big", "buck", "bunny"]))
+
+    def test_complete_short_prefix(self) -> None:
+        """
+        Test if short prefixes are completed with the terms of the highest weight.
+        """
+        self.index.add_words(["abc"])
+        self.index.add_words(["abd"], seeders=5)
+        self.index.add_words(["ab"])
+
+        self.assertEqual(["abd", "abc"], self.index.complete("ab", 5))
+        self.assertEqual(["abd"], self.index.complete("ab", 1))
+
+    def test_complete_long_prefix(self) -> None:
+        """
+        Test if long prefixes are completed with the terms of the highest weight.
+        """
+        self.index.add_words(["ubuntu", "server"], seeders=3)
+        self.index.add_words(["ubuntu", "desktop"])
+        self.index.add_words(["ubuntu", "desktop"])
+
+        self.assertEqual(["ubuntu server", "ubuntu desktop"], self.index.complete("ubuntu", 5))
+        self.assertEqual(["ubuntu desktop"], self.index.complete("ubuntu d", 5))
+        self.assertEqual([], self.index.complete("debian", 5))
+
+    def test_complete_short_terms(self) -> None:
+        """
+        Test if terms that are shorter than a long prefix are not completed.
+        """
+        self.index.add_words(["ubu"])
+        self.index.add_words(["ubuntu"])
+
+        self.assertEqual(["ubuntu"], self.index.complete("ubun", 5))
+        self.assertEqual(["ubu", "ubuntu"], self.index.complete("ub", 5))
+
+    def test_evict(self) -> None:
+        """
+        Test if the terms with the lowest weights are evicted to make room for new terms once the index is full.
+        """
+        self.index.add_words(["abcd"], seeders=5)
+        self.index.add_words(["abce"])
+        with patch("tribler.core.database.autocomplete.MAX_TERMS", 2):
+            self.index.add_words(["abcf"])
+
+        self.assertEqual({"abcd", "abcf"}, set(self.index.weights))
+        self.assertEqual(["abcd", "abcf"], self.index.complete("ab", 5))
+        self.assertEqual(["abcd", "abcf"], self.index.complete("abc", 5))
+        self.assertNotIn("abce", self.index.buckets)
+
+    def test_change_weight(self) -> None:
+        """
+        Test if the order of the completions follows changes in weight.
+        """
+        self.index.add_words(["ubuntu", "server"], seeders=3)
+        self.index.add_words(["ubuntu", "desktop"])
+
+        self.index.change_weight(["ubuntu", "desktop"], 10)
+        self.index.change_weight(["ubuntu", "server"], -3)
+
+        self.assertEqual(["ubuntu desktop", "ubuntu server"], self.index.complete("ubuntu", 5))
+        self.assertEqual(["ubuntu", "ubuntu desktop", "ubuntu server"], self.index.complete("ubu", 5))
+        self.assertEqual(1, self.index.weights["ubuntu server"])
+
+    def test_change_weight_unknown(self) -> None:
+        """
+        Test if a decrease in weight does not add unknown terms.
+        """
+        self.index.change_weight(["ubuntu"], -1)
+
+        self.assertEqual(0, len(self.index))
+
+    def test_suggest_next_word(self) -> None:
+        """
+        Test if a finished word is completed with the next word of a title.
+        """
+        self.index.add_words(["big", "buck", "bunny"])
+
+        self.assertEqual(["big buck bunny"], self.index.suggest(["big", "buck"], 5))
+
+    def test_suggest_fill_up(self) -> None:
+        """
+        Test if completions of the last word fill up the completions of the last two words.
+        """
+        self.index.add_words(["ubuntu", "desktop"])
+        self.index.add_words(["desert", "storm"], seeders=5)
+
+        self.assertEqual(["ubuntu desktop", "ubuntu desert"], self.index.suggest(["ubuntu", "des"], 2))
@@ -0,0 +1,90 @@
+from unittest.mock import Mock
+
+from ipv8.test.base import TestBase
+from pony import orm
+from pony.orm import db_session
+
+from tribler.core.database.commit_hooks import CommitHooks
+
+
+class TestCommitHooks(TestBase):
+    """
+    Tests for the CommitHooks class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a database with a single entity type.
+        """
+        super().setUp()
+        self.db = orm.Database()
+
+        class Item(self.db.Entity):
+            name = orm.Required(str)
+
+        self.Item = Item
+        self.db.bind(provider="sqlite", filename=":memory:")
+        self.db.generate_mapping(create_tables=True)
+        self.hooks = CommitHooks(self.db)
+
+    def test_commit(self) -> None:
+        """
+        Test if callbacks are called after the transaction is committed, in order.
+        """
+        callback = Mock()
+
+        with db_session:
+            self.Item(name="a")
+            self.hooks.add(lambda: callback(1))
+            self.hooks.add(lambda: callback(2))
+            self.assertFalse(callback.called)
+
+        self.assertEqual([((1,),), ((2,),)], callback.call_args_list)
+
+    def test_commit_intermediate(self) -> None:
+        """
+        Test if callbacks are called by commits in the middle of a session, only once.
+        """
+        callback = Mock()
+
+        with db_session:
+            self.Item(name="a")
+            self.hooks.add(callback)
+            orm.commit()
+            self.assertEqual(1, callback.call_count)
+            self.Item(name="b")
+
+        self.assertEqual(1, callback.call_count)
+
+    def test_rollback(self) -> None:
+        """
+        Test if callbacks are dropped when the transaction is rolled back.
+        """
+        callback = Mock()
+
+        with self.assertRaises(ValueError), db_session:
+            self.Item(name="a")
+            self.hooks.add(callback)
+            raise ValueError
+        with db_session:
+            self.Item(name="b")
+
+        self.assertFalse(callback.called)
+        self.assertEqual({}, dict(self.hooks.callbacks))
+
+    def test_rollback_on_rollback(self) -> None:
+        """
+        Test if callbacks that were added with on_rollback are also called when the transaction is rolled back.
+        """
+        callback = Mock()
+        dropped = Mock()
+
+        with self.assertRaises(ValueError), db_session:
+            self.Item(name="a")
+            self.hooks.add(callback, on_rollback=True)
+            self.hooks.add(dropped)
+            raise ValueError
+
+        self.assertEqual(1, callback.call_count)
+        self.assertFalse(dropped.called)
+        self.assertEqual({}, dict(self.hooks.callbacks))
@@ -0,0 +1,130 @@
+import threading
+from asyncio import wrap_future
+
+from ipv8.test.base import TestBase
+
+from tribler.core.database.executor import Priority, PriorityExecutor
+
+
+class TestPriorityExecutor(TestBase):
+    """
+    Tests for the PriorityExecutor class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new executor with a single worker.
+        """
+        super().setUp()
+        self.executor = PriorityExecutor(1, "TestExecutor")
+
+    async def tearDown(self) -> None:
+        """
+        Stop the executor.
+        """
+        self.executor.shutdown(cancel_futures=True)
+        await super().tearDown()
+
+    def block(self) -> threading.Event:
+        """
+        Occupy the single worker until the returned event is set.
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocker() -> None:
+            started.set()
+            release.wait(10)
+
+        self.executor.submit(Priority.INGESTION, blocker)
+        started.wait(10)
+        return release
+
+    async def test_submit(self) -> None:
+        """
+        Test if a submitted call is run in a worker thread of the executor.
+        """
+        name = await wrap_future(self.executor.submit(Priority.INTERACTIVE, lambda: threading.current_thread().name))
+
+        self.assertEqual("TestExecutor_0", name)
+
+    async def test_submit_exception(self) -> None:
+        """
+        Test if an exception of a call is set on its future.
+        """
+        future = self.executor.submit(Priority.INTERACTIVE, int, "not a number")
+
+        with self.assertRaises(ValueError):
+            await wrap_future(future)
+
+    async def test_priority_order(self) -> None:
+        """
+        Test if queued calls are run by priority and, within a lane, in order of submission.
+        """
+        order = []
+        release = self.block()
+        futures = [self.executor.submit(Priority.INGESTION, order.append, "ingestion"),
+                   self.executor.submit(Priority.REMOTE, order.append, "remote 1"),
+                   self.executor.submit(Priority.INTERACTIVE, order.append, "interactive"),
+                   self.executor.submit(Priority.REMOTE, order.append, "remote 2")]
+        release.set()
+        for future in futures:
+            await wrap_future(future)
+
+        self.assertEqual(["interactive", "remote 1", "remote 2", "ingestion"], order)
+
+    async def test_statistics(self) -> None:
+        """
+        Test if the queue depth and processed calls are counted per lane.
+        """
+        release = self.block()
+        future = self.executor.submit(Priority.REMOTE, int)
+        queued = self.executor.get_statistics()
+        release.set()
+        await wrap_future(future)
+        processed = self.executor.get_statistics()
+
+        self.assertEqual(1, queued["remote"]["queued"])
+        self.assertEqual(0, processed["remote"]["queued"])
+        self.assertEqual(1, processed["remote"]["processed"])
+        self.assertEqual(0, processed["interactive"]["processed"])
+        self.assertEqual(1, processed["ingestion"]["processed"])
+        self.assertLessEqual(processed["remote"]["average_wait"], processed["remote"]["max_wait"])
+
+    def test_statistics_empty(self) -> None:
+        """
+        Test if the statistics of an executor that has not run anything are zero.
+        """
+        self.assertEqual({"queued": 0, "processed": 0, "average_wait": 0.0, "max_wait": 0.0},
+                         self.executor.get_statistics()["interactive"])
+
+    def test_shutdown_cancel(self) -> None:
+        """
+        Test if queued calls are cancelled when shutting down with cancel_futures.
+        """
+        release = self.block()
+        future = self.executor.submit(Priority.INTERACTIVE, int)
+        self.executor.shutdown(cancel_futures=True, wait=False)
+        release.set()
+
+        self.assertTrue(future.cancelled())
+        self.assertEqual(0, self.executor.get_statistics()["interactive"]["queued"])
+
+    def test_shutdown_wait(self) -> None:
+        """
+        Test if shutting down waits for the worker threads to stop.
+        """
+        self.executor.submit(Priority.INTERACTIVE, int)
+
+        self.executor.shutdown()
+
+        self.assertFalse(any(thread.is_alive() for thread in self.executor.threads))
+
+    def test_submit_after_shutdown(self) -> None:
+        """
+        Test if calls cannot be submitted after the executor is shut down.
+        """
+        self.executor.shutdown()
+
+        with self.assertRaises(RuntimeError):
+            self.executor.submit(Priority.INTERACTIVE, int)
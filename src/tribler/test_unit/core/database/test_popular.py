@@ -0,0 +1,103 @@
+from ipv8.test.base import TestBase
+
+from tribler.core.database.popular import PopularEntry, PopularTorrents
+
+
+class TestPopularTorrents(TestBase):
+    """
+    Tests for the PopularTorrents class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a refreshed list of two popular torrents.
+        """
+        super().setUp()
+        self.popular = PopularTorrents(size=2, freshness_period=100, refresh_interval=1000)
+        self.popular.refresh([(1, 10, 0, 1000), (2, 5, 0, 1000)], 1000, self.popular.start_refresh())
+
+    def test_get_stale(self) -> None:
+        """
+        Test if a list that was never computed is stale.
+        """
+        self.assertIsNone(PopularTorrents(size=2, freshness_period=100, refresh_interval=1000).get(1000))
+
+    def test_get(self) -> None:
+        """
+        Test if the popular torrents are ordered by their health.
+        """
+        self.assertEqual([1, 2], self.popular.get(1000))
+
+    def test_get_refresh_interval(self) -> None:
+        """
+        Test if the list needs to be recomputed after the refresh interval.
+        """
+        self.assertIsNone(self.popular.get(2001))
+
+    def test_get_expired(self) -> None:
+        """
+        Test if a full list needs to be recomputed when one of its torrents was checked too long ago.
+        """
+        self.popular.update(2, PopularEntry(5, 0, 950), 1000)
+
+        self.assertIsNone(self.popular.get(1060))
+
+    def test_update_better(self) -> None:
+        """
+        Test if a torrent that is more popular than the least popular torrent takes its place.
+        """
+        self.popular.update(3, PopularEntry(7, 0, 1000), 1000)
+
+        self.assertEqual([1, 3], self.popular.get(1000))
+
+    def test_update_worse(self) -> None:
+        """
+        Test if a torrent that is less popular than all torrents in the list is ignored.
+        """
+        self.popular.update(3, PopularEntry(1, 0, 1000), 1000)
+
+        self.assertEqual([1, 2], self.popular.get(1000))
+
+    def test_update_member_better(self) -> None:
+        """
+        Test if a torrent in the list that becomes more popular moves up.
+        """
+        self.popular.update(2, PopularEntry(20, 0, 1000), 1000)
+
+        self.assertEqual([2, 1], self.popular.get(1000))
+
+    def test_update_member_worse(self) -> None:
+        """
+        Test if a full list needs to be recomputed when one of its torrents becomes less popular.
+        """
+        self.popular.update(1, PopularEntry(1, 0, 1000), 1000)
+
+        self.assertIsNone(self.popular.get(1000))
+
+    def test_update_not_full(self) -> None:
+        """
+        Test if a list that is not full is updated without recomputing it.
+        """
+        self.popular.size = 3
+        self.popular.update(2, PopularEntry(0, 0, 1000), 1000)
+        self.popular.update(3, PopularEntry(1, 1, 1000), 1000)
+
+        self.assertEqual([1, 3], self.popular.get(1000))
+
+    def test_update_full_removed(self) -> None:
+        """
+        Test if a full list needs to be recomputed when one of its torrents is no longer popular.
+        """
+        self.popular.update(2, PopularEntry(0, 0, 1000), 1000)
+
+        self.assertIsNone(self.popular.get(1000))
+
+    def test_refresh_concurrent_update(self) -> None:
+        """
+        Test if a list stays stale when it was updated while it was being computed.
+        """
+        version = self.popular.start_refresh()
+        self.popular.update(3, PopularEntry(7, 0, 1000), 1000)
+        self.popular.refresh([(1, 10, 0, 1000), (2, 5, 0, 1000)], 1000, version)
+
+        self.assertIsNone(self.popular.get(1000))
@@ -9,7 +9,9 @@ from tribler.core.database.ranks import (
     freshness_rank,
     seeders_rank,
     title_rank,
+    tokenize_title,
     torrent_rank,
+    torrent_ranks,
 )
 
 
@@ -167,6 +169,36 @@ class TestRanks(TestBase):
         self.assertGreaterEqual(rank2, rank3)
         self.assertGreaterEqual(rank3, rank4)
 
+    def test_torrent_ranks_batch(self) -> None:
+        """
+        Test if ranking a batch of torrents gives the same ranks as ranking them one by one.
+        """
+        torrents = [("Big Buck Bunny", 0, 0, None), ("Big Bad Buck Bunny", 10, 100, 100), ("Bunny Buck", 3, 0, -1),
+                    ("", 1, 1, 1), (None, None, None, 10)]
+
+        ranks = torrent_ranks("Big Buck Bunny", torrents)
+
+        self.assertEqual([torrent_rank("Big Buck Bunny", *torrent) for torrent in torrents], ranks)
+
+    def test_torrent_ranks_tokenized(self) -> None:
+        """
+        Test if ranking pre-tokenized titles gives the same ranks as ranking the titles themselves.
+        """
+        titles = ["Big Buck Bunny", "Big.Bad-Buck (Bunny)", "", "\u00c9t\u00e9 Bunny"]
+
+        ranks = torrent_ranks("Big Buck Bunny", [(title, 1, 1, 1) for title in titles])
+        tokenized_ranks = torrent_ranks("Big Buck Bunny", [(tokenize_title(title).split(), 1, 1, 1)
+                                                           for title in titles])
+
+        self.assertEqual(ranks, tokenized_ranks)
+
+    def test_tokenize_title(self) -> None:
+        """
+        Test if titles are normalized to space-separated lower-case words.
+        """
+        self.assertEqual("big bad buck bunny 1080p", tokenize_title("Big.Bad-Buck (Bunny) [1080p]"))
+        self.assertEqual("", tokenize_title(None))
+
     def test_find_word_first(self) -> None:
         """
         Test if a matched first word gets popped from the queue.
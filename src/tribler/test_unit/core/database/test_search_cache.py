@@ -0,0 +1,84 @@
+from ipv8.test.base import TestBase
+
+from tribler.core.database.search_cache import SearchResultCache
+
+
+class TestSearchResultCache(TestBase):
+    """
+    Tests for the SearchResultCache class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new cache.
+        """
+        super().setUp()
+        self.cache = SearchResultCache(size=2)
+
+    def test_get_unknown(self) -> None:
+        """
+        Test if unknown searches are a miss.
+        """
+        self.assertIsNone(self.cache.get({"txt_filter": "a"}, 1))
+        self.assertEqual({"hits": 0, "misses": 1, "size": 0}, self.cache.get_statistics())
+
+    def test_get_known(self) -> None:
+        """
+        Test if known searches are a hit, regardless of the requested page.
+        """
+        self.cache.put({"txt_filter": "a", "first": 1, "last": 50}, 1, [(3, b"c"), (2, b"b")])
+
+        self.assertEqual([3, 2], self.cache.get({"txt_filter": "a", "first": 51, "last": 100}, 1))
+        self.assertEqual({"hits": 1, "misses": 0, "size": 1}, self.cache.get_statistics())
+
+    def test_get_unhashable_parameters(self) -> None:
+        """
+        Test if searches with set parameters can be cached.
+        """
+        self.cache.put({"txt_filter": "a", "infohash_set": {b"a", b"b"}}, 1, [(1, b"a")])
+
+        self.assertEqual([1], self.cache.get({"txt_filter": "a", "infohash_set": {b"b", b"a"}}, 1))
+
+    def test_invalidate_rowid_watermark(self) -> None:
+        """
+        Test if searches are invalidated when new entries were added.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [(1, b"a")])
+
+        self.assertIsNone(self.cache.get({"txt_filter": "a"}, 2))
+        self.assertEqual(0, self.cache.get_statistics()["size"])
+
+    def test_invalidate_infohash(self) -> None:
+        """
+        Test if only the searches that include a torrent are invalidated when its health changes.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [(1, b"a")])
+        self.cache.put({"txt_filter": "b"}, 1, [(2, b"b")])
+
+        self.cache.invalidate_infohash(b"a")
+
+        self.assertIsNone(self.cache.get({"txt_filter": "a"}, 1))
+        self.assertEqual([2], self.cache.get({"txt_filter": "b"}, 1))
+
+    def test_evict_least_recently_used(self) -> None:
+        """
+        Test if the least recently used search is evicted when the cache is full.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [(1, b"a")])
+        self.cache.put({"txt_filter": "b"}, 1, [(2, b"b")])
+        self.cache.get({"txt_filter": "a"}, 1)
+        self.cache.put({"txt_filter": "c"}, 1, [(3, b"c")])
+
+        self.assertEqual([1], self.cache.get({"txt_filter": "a"}, 1))
+        self.assertIsNone(self.cache.get({"txt_filter": "b"}, 1))
+
+    def test_peek(self) -> None:
+        """
+        Test if peeking at a cached search does not count as a hit or miss.
+        """
+        self.cache.put({"txt_filter": "a"}, 1, [(1, b"a")])
+
+        self.assertEqual([1], self.cache.peek({"txt_filter": "a"}, 1))
+        self.assertIsNone(self.cache.peek({"txt_filter": "a"}, 2))
+        self.assertIsNone(self.cache.peek({"txt_filter": "b"}, 1))
+        self.assertEqual({"hits": 0, "misses": 0, "size": 1}, self.cache.get_statistics())
@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import sqlite3
+import time
+from pathlib import Path
+from unittest.mock import patch
+
 from ipv8.community import Community, CommunitySettings
 from ipv8.keyvault.crypto import default_eccrypto
 from ipv8.test.base import TestBase
 from ipv8.test.mocking.ipv8 import MockIPv8
-from pony.orm import db_session
+from pony.orm import OperationalError, db_session
 
+from tribler.core.database.autocomplete import AutoCompleteIndex
 from tribler.core.database.orm_bindings.torrent_metadata import entries_to_chunk
-from tribler.core.database.serialization import NULL_KEY, int2time
+from tribler.core.database.queries import encode_continuation_token
+from tribler.core.database.serialization import NULL_KEY, REGULAR_TORRENT, int2time
 from tribler.core.database.store import MetadataStore, ObjState
+from tribler.core.torrent_checker.dataclasses import HealthInfo
 
 
 class MockCommunity(Community):
@@ -197,6 +205,92 @@ class TestMetadataStore(TestBase[MockCommunity]):
         self.assertIsNotNone(self.metadata_store.TorrentMetadata.get(title=ffa_title))
         self.assertEqual([], self.metadata_store.process_payload(ffa_payload))
 
+    @db_session
+    def test_process_payloads_batch(self) -> None:
+        """
+        Test if a batch of payloads is deduplicated against the database and against itself.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        signed_payloads = []
+        for i in range(3):
+            md = self.metadata_store.TorrentMetadata(title=f"signed {i}", infohash=bytes([i]) * 20, id_=i, timestamp=0,
+                                                     torrent_date=int2time(0), public_key=other_key.key_to_bin())
+            signed_payloads.append(md.payload_class.from_signed_blob(md.serialized(other_key)))
+            md.delete()
+        self.metadata_store.process_payloads(signed_payloads[:1])
+        ffa_torrent = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xff" * 20, "title": "ffa"})
+        ffa_payload = ffa_torrent.payload_class.from_signed_blob(ffa_torrent.serialized())
+        ffa_torrent.delete()
+        self.metadata_store.db.flush()
+
+        results = self.metadata_store.process_payloads([*signed_payloads, signed_payloads[1], ffa_payload, ffa_payload])
+
+        self.assertEqual([ObjState.DUPLICATE_OBJECT, ObjState.NEW_OBJECT, ObjState.NEW_OBJECT,
+                          ObjState.DUPLICATE_OBJECT, ObjState.NEW_OBJECT], [result.obj_state for result in results])
+        self.assertEqual(["signed 0", "signed 1", "signed 2", "signed 1", "ffa"],
+                         [result.md_obj.title for result in results])
+        self.assertIs(results[1].md_obj, results[3].md_obj)
+
+    @db_session
+    def test_process_payloads_existing_health(self) -> None:
+        """
+        Test if new entries are linked to the existing health of their torrent.
+        """
+        health = self.metadata_store.TorrentState(infohash=b"\x01" * 20, seeders=7)
+        md = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "ffa"})
+        payload = md.payload_class.from_signed_blob(md.serialized())
+        md.delete()
+
+        result, = self.metadata_store.process_payloads([payload])
+
+        self.assertEqual(health, result.md_obj.health)
+
+    @db_session
+    def test_process_payloads_inserted(self) -> None:
+        """
+        Test if the entries that are inserted at once are indexed, counted and complete.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        md = self.metadata_store.TorrentMetadata(title="signed torrent", infohash=b"\x01" * 20, id_=1, timestamp=0,
+                                                 torrent_date=int2time(0), public_key=other_key.key_to_bin(),
+                                                 tracker_info="http://tracker.example.com/announce")
+        signed_payload = md.payload_class.from_signed_blob(md.serialized(other_key))
+        md.delete()
+        ffa_torrent = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20,
+                                                                             "title": "ffa torrent"})
+        ffa_payload = ffa_torrent.payload_class.from_signed_blob(ffa_torrent.serialized())
+        ffa_torrent.delete()
+        self.metadata_store.db.flush()
+
+        signed, ffa = (result.md_obj for result in self.metadata_store.process_payloads([signed_payload,
+                                                                                          ffa_payload]))
+
+        self.assertEqual(2, self.metadata_store.get_num_torrents())
+        self.assertEqual({signed, ffa}, set(self.metadata_store.search_keyword("torrent")))
+        self.assertEqual(ffa.rowid, self.metadata_store.get_max_rowid())
+        self.assertEqual(ffa.serialize(), ffa.signed_blob)
+        self.assertIsNone(ffa.signature)
+        self.assertEqual(signed.serialize(), signed.signed_blob)
+        self.assertEqual(0, signed.health.seeders)
+        self.assertEqual([signed], list(signed.health.metadata))
+        self.assertEqual(["http://tracker.example.com/announce"], [tracker.url for tracker in signed.health.trackers])
+
+    @db_session
+    def test_process_torrent_health_batch(self) -> None:
+        """
+        Test if the health of multiple torrents is added or updated at once.
+        """
+        now = int(time.time())
+        self.metadata_store.TorrentState(infohash=b"\x01" * 20, seeders=1, last_check=now - 10)
+
+        self.metadata_store.process_torrent_health_batch([HealthInfo(b"\x01" * 20, seeders=5, last_check=now),
+                                                          HealthInfo(b"\x02" * 20, seeders=3, last_check=now),
+                                                          HealthInfo(b"\x03" * 20, last_check=now + 3600)])
+
+        self.assertEqual(5, self.metadata_store.TorrentState.get(infohash=b"\x01" * 20).seeders)
+        self.assertEqual(3, self.metadata_store.TorrentState.get(infohash=b"\x02" * 20).seeders)
+        self.assertIsNone(self.metadata_store.TorrentState.get(infohash=b"\x03" * 20))
+
     @db_session
     def test_get_entries_query_sort_by_size(self) -> None:
         """
@@ -210,3 +304,552 @@ class TestMetadataStore(TestBase[MockCommunity]):
         self.assertEqual(20, ordered1.size)
         self.assertEqual(10, ordered2.size)
         self.assertEqual(1, ordered3.size)
+
+    @db_session
+    def test_get_entries_txt_filter_ranked(self) -> None:
+        """
+        Test if text search results are ordered by their search rank.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "abc def ghi"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "abc"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x03" * 20, "title": "xyz abc"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x04" * 20, "title": "xyz"})
+
+        ordered = self.metadata_store.get_entries(txt_filter='"abc"')
+
+        self.assertEqual(["abc", "abc def ghi", "xyz abc"], [entry.title for entry in ordered])
+
+    @db_session
+    def test_get_entries_txt_filter_paged(self) -> None:
+        """
+        Test if pages of text search results are sliced from the ranked results.
+        """
+        for i in range(5):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20,
+                                                                   "title": "abc" + " x" * i})
+
+        page = self.metadata_store.get_entries(first=2, last=3, txt_filter='"abc"')
+
+        self.assertEqual(["abc x", "abc x x"], [entry.title for entry in page])
+
+    @db_session
+    def test_get_entries_continuation_token(self) -> None:
+        """
+        Test if pages that follow a continuation token continue where the previous page stopped.
+        """
+        for i in range(5):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": "abc",
+                                                                   "size": i % 2})
+
+        page1 = self.metadata_store.get_entries(first=1, last=3, sort_by="size")
+        token = self.metadata_store.get_continuation_token(page1[-1], sort_by="size")
+        page2 = self.metadata_store.get_entries(first=1, last=3, sort_by="size", continuation_token=token)
+
+        self.assertEqual([4, 2, 5], [entry.rowid for entry in page1])
+        self.assertEqual([3, 1], [entry.rowid for entry in page2])
+
+    @db_session
+    def test_get_entries_continuation_token_title(self) -> None:
+        """
+        Test if continuation tokens can be used when sorting on a text column.
+        """
+        for i, title in enumerate(["b", "A", "a", "c"]):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": title})
+
+        page1 = self.metadata_store.get_entries(first=1, last=2, sort_by="title", sort_desc=False)
+        token = self.metadata_store.get_continuation_token(page1[-1], sort_by="title")
+        page2 = self.metadata_store.get_entries(first=1, last=2, sort_by="title", sort_desc=False,
+                                                continuation_token=token)
+
+        self.assertEqual(["A", "a"], [entry.title for entry in page1])
+        self.assertEqual(["b", "c"], [entry.title for entry in page2])
+
+    @db_session
+    def test_get_entries_continuation_token_txt_filter(self) -> None:
+        """
+        Test if continuation tokens of ranked searches continue after the entry in the ranking.
+        """
+        for i in range(5):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20,
+                                                                   "title": "abc" + " x" * i})
+
+        token = self.metadata_store.get_continuation_token(self.metadata_store.get_entries(first=2, last=2,
+                                                                                           txt_filter='"abc"')[0])
+        page = self.metadata_store.get_entries(first=1, last=2, txt_filter='"abc"', continuation_token=token)
+
+        self.assertEqual(["abc x x", "abc x x x"], [entry.title for entry in page])
+
+    @db_session
+    def test_get_entries_continuation_token_invalid(self) -> None:
+        """
+        Test if malformed continuation tokens are refused.
+        """
+        with self.assertRaises(ValueError):
+            self.metadata_store.get_entries(continuation_token="not a token")
+
+    @db_session
+    def test_get_entries_continuation_token_popular(self) -> None:
+        """
+        Test if pages of popular torrents that follow a continuation token continue where the previous page stopped.
+        """
+        for i in range(4):
+            entry = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": "a"})
+            entry.health.set(seeders=i % 2, leechers=i, last_check=int(time.time()))
+
+        page1 = self.metadata_store.get_entries(first=1, last=2, popular=True, metadata_type=REGULAR_TORRENT)
+        token = self.metadata_store.get_continuation_token(page1[-1], popular=True)
+        page2 = self.metadata_store.get_entries(first=1, last=2, popular=True, metadata_type=REGULAR_TORRENT,
+                                                continuation_token=token)
+
+        self.assertEqual([4, 2], [entry.rowid for entry in page1])
+        self.assertEqual([3], [entry.rowid for entry in page2])
+
+    @db_session
+    def test_get_entries_continuation_token_no_health(self) -> None:
+        """
+        Test if entries without a torrent state are not skipped when paging through entries sorted by health.
+        """
+        for i in range(4):
+            entry = self.metadata_store.TorrentMetadata(title="abc", infohash=bytes([i]) * 20,
+                                                        **({} if i % 2 else {"health": None}))
+            if entry.health:
+                entry.health.seeders = i
+        entries = []
+        token = None
+
+        for _ in range(5):
+            page = self.metadata_store.get_entries(first=1, last=1, sort_by="HEALTH", continuation_token=token)
+            if not page:
+                break
+            entries.extend(page)
+            token = self.metadata_store.get_continuation_token(page[-1], sort_by="HEALTH")
+
+        self.assertEqual([4, 2, 3, 1], [entry.rowid for entry in entries])
+
+    @db_session
+    def test_get_entries_continuation_token_wrong_sort(self) -> None:
+        """
+        Test if an error is raised for a continuation token that was created for a different sort.
+        """
+        for sort_by, popular in [(None, True), ("HEALTH", None), ("size", None), ("title", None)]:
+            with self.subTest(sort_by=sort_by), self.assertRaises(ValueError):
+                self.metadata_store.get_entries(sort_by=sort_by, popular=popular, metadata_type=REGULAR_TORRENT,
+                                                continuation_token=encode_continuation_token([1, 2], 1)
+                                                if sort_by in ("size", "title") else encode_continuation_token(None, 1))
+
+    @db_session
+    def test_get_unknown_infohashes(self) -> None:
+        """
+        Test if only the infohashes that no entry exists for are returned.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "abc"})
+        self.metadata_store.TorrentState(infohash=b"\x02" * 20)
+
+        self.assertEqual({b"\x02" * 20, b"\x03" * 20},
+                         self.metadata_store.get_unknown_infohashes({b"\x01" * 20, b"\x02" * 20, b"\x03" * 20}))
+        self.assertEqual(set(), self.metadata_store.get_unknown_infohashes(set()))
+
+    @db_session
+    def test_get_num_torrents(self) -> None:
+        """
+        Test if the number of torrents is maintained when entries are added and removed.
+        """
+        entries = [self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": "abc"})
+                   for i in range(3)]
+        entries[0].delete()
+        self.metadata_store.db.flush()
+
+        self.assertEqual(2, self.metadata_store.get_num_torrents())
+
+    @db_session
+    def test_create_entry_counts_table_existing_db(self) -> None:
+        """
+        Test if the entry counts table is created and filled for databases that did not have it yet.
+        """
+        for i in range(3):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": "abc"})
+        self.metadata_store.db.flush()
+        self.metadata_store.db.execute("DROP TABLE EntryCounts")
+        self.metadata_store.db.execute("DROP TRIGGER counts_ai")
+
+        self.metadata_store.create_entry_counts_table()
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\xff" * 20, "title": "abc"})
+        self.metadata_store.db.flush()
+
+        self.assertEqual(4, self.metadata_store.get_num_torrents())
+
+    @db_session
+    def test_estimate_total_count_exact(self) -> None:
+        """
+        Test if total counts below the cap are exact.
+        """
+        for i in range(3):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": "abc",
+                                                                   "xxx": i % 2})
+
+        self.assertEqual((2, False), self.metadata_store.estimate_total_count(hide_xxx=True, first=1, last=1))
+        self.assertEqual((3, False), self.metadata_store.estimate_total_count(metadata_type=REGULAR_TORRENT))
+
+    @db_session
+    def test_estimate_total_count_capped(self) -> None:
+        """
+        Test if total counts above the cap are estimated from the rowid range of the matches.
+        """
+        for i in range(20):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": "abc",
+                                                                   "xxx": i % 2})
+
+        self.assertEqual((10, True), self.metadata_store.estimate_total_count(cap=5, hide_xxx=True))
+
+    @db_session
+    def test_estimate_total_count_cached(self) -> None:
+        """
+        Test if the total count of a cached ranked search is taken from the cache.
+        """
+        for i in range(3):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": "abc"})
+        self.metadata_store.get_entries(first=1, last=1, txt_filter='"abc"')
+
+        self.assertEqual((3, False), self.metadata_store.estimate_total_count(cap=1, first=1, last=1,
+                                                                              txt_filter='"abc"'))
+        self.assertEqual({"hits": 0, "misses": 1, "size": 1}, self.metadata_store.search_cache.get_statistics())
+
+    @db_session
+    def test_title_tokens_maintained(self) -> None:
+        """
+        Test if the title tokens are maintained when entries are added, changed and removed.
+        """
+        entry = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20,
+                                                                       "title": "Big.Buck Bunny"})
+        entry.flush()
+        get_tokens = lambda: self.metadata_store.db.select("tokens FROM TitleTokens WHERE rowid = $rowid",
+                                                           globals={"rowid": entry.rowid})
+
+        self.assertEqual(["big buck bunny"], get_tokens())
+        entry.title = "Other-Title"
+        entry.flush()
+        self.assertEqual(["other title"], get_tokens())
+        entry.delete()
+        entry.flush()
+        self.assertEqual([], get_tokens())
+
+    @db_session
+    def test_auto_complete_terms(self) -> None:
+        """
+        Test if auto-completion terms are suggested for newly added entries, by the seeders of their titles.
+        """
+        self.metadata_store.TorrentMetadata(title="Ubuntu Desktop 22.04", infohash=b"\x01" * 20)
+        self.metadata_store.TorrentMetadata(title="Ubuntu Server", infohash=b"\x02" * 20,
+                                            health=self.metadata_store.TorrentState(infohash=b"\x02" * 20,
+                                                                                    seeders=10))
+        self.metadata_store.db.flush()
+
+        self.assertEqual(["ubuntu server", "ubuntu desktop"],
+                         self.metadata_store.get_auto_complete_terms("ubuntu", max_terms=5))
+        self.assertEqual(["ubuntu desktop", "ubuntu desktop 22"],
+                         self.metadata_store.get_auto_complete_terms("Ubuntu Des", max_terms=5))
+        self.assertEqual([], self.metadata_store.get_auto_complete_terms("", max_terms=5))
+
+    @db_session
+    def test_update_auto_complete_weights(self) -> None:
+        """
+        Test if changes in seeders are applied to the weights of the titles in the auto-completion index.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "big buck bunny"})
+        entry = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "big sky"})
+        entry.health.seeders = 10
+        entry.health.flush()
+
+        self.metadata_store.update_auto_complete_weights()
+
+        self.assertEqual(["big sky", "big buck"], self.metadata_store.get_auto_complete_terms("big", max_terms=5))
+        self.assertEqual({}, self.metadata_store.seeders_changes)
+
+    @db_session
+    def test_get_watermark(self) -> None:
+        """
+        Test if the watermark follows the inserted entries, without querying the database.
+        """
+        self.assertEqual(0, self.metadata_store.get_watermark())
+
+        entry = self.metadata_store.TorrentMetadata(title="Big Buck Bunny", infohash=b"\x01" * 20)
+        self.metadata_store.db.flush()
+
+        self.assertEqual(entry.rowid, self.metadata_store.get_watermark())
+        self.assertEqual(self.metadata_store.get_max_rowid(), self.metadata_store.get_watermark())
+
+    @db_session
+    def test_pop_health_changes(self) -> None:
+        """
+        Test if the health of torrents with metadata is collected after the first call to pop_health_changes.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "big buck bunny"})
+        self.metadata_store.db.flush()
+
+        self.assertEqual({}, self.metadata_store.pop_health_changes())
+
+        entry = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "big sky"})
+        entry.health.seeders = 10
+        entry.health.last_check = 1000
+        entry.health.flush()
+
+        self.assertEqual({b"\x02" * 20: (10, 0, 1000)}, self.metadata_store.pop_health_changes())
+        self.assertEqual({}, self.metadata_store.pop_health_changes())
+
+    def test_update_auto_complete_weights_failed(self) -> None:
+        """
+        Test if the changes in seeders are kept for the next update if the titles cannot be read.
+        """
+        self.metadata_store.seeders_changes = {1: 5}
+
+        with patch.object(self.metadata_store.db, "select", side_effect=OperationalError("database is locked")), \
+                self.assertRaises(OperationalError):
+            self.metadata_store.update_auto_complete_weights()
+
+        self.assertEqual({1: 5}, self.metadata_store.seeders_changes)
+
+    @db_session
+    def test_fill_auto_complete_index(self) -> None:
+        """
+        Test if the auto-completion index can be filled from the titles that are already in the database.
+        """
+        self.metadata_store.TorrentMetadata(title="Big Buck Bunny", infohash=b"\x01" * 20)
+        self.metadata_store.db.flush()
+        self.metadata_store.auto_complete = AutoCompleteIndex()
+
+        self.metadata_store.fill_auto_complete_index()
+
+        self.assertEqual(["big buck"], self.metadata_store.get_auto_complete_terms("big", max_terms=5))
+
+    @db_session
+    def test_create_title_tokens_table_existing_db(self) -> None:
+        """
+        Test if the title tokens are created and filled for databases that do not have them yet.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "Big Buck Bunny"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "Sintel"})
+        self.metadata_store.db.execute("DROP TABLE TitleTokens")
+
+        self.metadata_store.create_title_tokens_table()
+
+        self.assertEqual(["big buck bunny", "sintel"],
+                         self.metadata_store.db.select("tokens FROM TitleTokens ORDER BY rowid"))
+
+    @db_session
+    def test_get_entries_txt_filter_cached(self) -> None:
+        """
+        Test if ranked searches are served from the cache until an entry changes.
+        """
+        entry = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "abc"})
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "abc def"})
+        self.metadata_store.get_entries(txt_filter='"abc"')
+        self.metadata_store.get_entries(first=2, last=2, txt_filter='"abc"')
+        entry.health.seeders = 10
+        entry.flush()
+        self.metadata_store.get_entries(txt_filter='"abc"')
+
+        self.assertEqual({"hits": 1, "misses": 2, "size": 1}, self.metadata_store.search_cache.get_statistics())
+
+    @db_session
+    def test_get_entries_txt_filter_title_changed(self) -> None:
+        """
+        Test if ranked searches are not served from the cache after the title of an entry changed.
+        """
+        self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "abc"})
+        entry = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "def"})
+        self.metadata_store.get_entries(txt_filter='"abc"')
+        entry.title = "abc def"
+        entry.flush()
+
+        ordered = self.metadata_store.get_entries(txt_filter='"abc"')
+
+        self.assertEqual(["abc", "abc def"], [entry.title for entry in ordered])
+
+    @db_session
+    def test_get_entries_popular(self) -> None:
+        """
+        Test if popular torrents are ordered by their health and follow the health updates.
+        """
+        now = int(time.time())
+        for i in range(3):
+            self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": bytes([i]) * 20, "title": str(i)})
+        self.metadata_store.process_torrent_health_batch([HealthInfo(b"\x00" * 20, seeders=5, last_check=now),
+                                                          HealthInfo(b"\x01" * 20, seeders=7, last_check=now),
+                                                          HealthInfo(b"\x02" * 20, seeders=0, last_check=now)])
+        popular = self.metadata_store.get_entries(popular=True, metadata_type=REGULAR_TORRENT)
+        self.metadata_store.process_torrent_health_batch([HealthInfo(b"\x02" * 20, seeders=9, last_check=now)])
+
+        self.assertEqual(["1", "0"], [entry.title for entry in popular])
+        self.assertEqual(["2", "1", "0"], [entry.title for entry in self.metadata_store.get_entries(
+            popular=True, metadata_type=REGULAR_TORRENT
+        )])
+
+    def test_wal_mode_memory(self) -> None:
+        """
+        Test if in-memory databases do not use a write-ahead log.
+        """
+        metadata_store = MetadataStore(":memory:", self.private_key(0), check_tables=False, wal_mode=True)
+
+        self.assertFalse(metadata_store.wal_mode)
+        self.assertIsNone(metadata_store.reader_executor)
+        self.assertIsNone(metadata_store.checkpoint())
+        metadata_store.shutdown()
+
+    async def test_wal_mode_readers(self) -> None:
+        """
+        Test if readers in WAL mode can query, but not write to, the database.
+        """
+        db_path = str(Path(self.temporary_directory()) / "metadata.db")
+        metadata_store = MetadataStore(db_path, self.private_key(0), check_tables=False, wal_mode=True)
+        with db_session:
+            metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "abc"})
+
+        def write() -> None:
+            with db_session:
+                metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "def"})
+
+        results = await metadata_store.get_entries_threaded(txt_filter='"abc"')
+        with self.assertRaises(OperationalError):
+            await metadata_store.run_threaded_readonly(write)
+        metadata_store.shutdown()
+
+        self.assertEqual(1, len(results))
+
+    async def test_wal_mode_checkpoint(self) -> None:
+        """
+        Test if the write-ahead log can be checkpointed.
+        """
+        db_path = str(Path(self.temporary_directory()) / "metadata.db")
+        metadata_store = MetadataStore(db_path, self.private_key(0), check_tables=False, wal_mode=True)
+        with db_session:
+            metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "abc"})
+
+        busy, log_frames, checkpointed_frames = await metadata_store.run_threaded(metadata_store.checkpoint)
+        metadata_store.shutdown()
+
+        self.assertEqual(0, busy)
+        self.assertEqual(log_frames, checkpointed_frames)
+
+    async def test_wal_mode_shutdown_truncate(self) -> None:
+        """
+        Test if the write-ahead log is emptied on shutdown, after the threads of the executors have used it.
+        """
+        db_path = str(Path(self.temporary_directory()) / "metadata.db")
+        metadata_store = MetadataStore(db_path, self.private_key(0), check_tables=False, wal_mode=True)
+
+        def write() -> None:
+            with db_session:
+                metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "abc"})
+
+        await metadata_store.run_threaded(write)
+        await metadata_store.get_entries_threaded(txt_filter='"abc"')
+        metadata_store.shutdown()
+
+        self.assertEqual((0, 0, 0), metadata_store.checkpoint())
+
+    async def test_wal_mode_auto_complete(self) -> None:
+        """
+        Test if the auto-completion index is filled and updated by the readers in WAL mode, after a restart.
+        """
+        db_path = str(Path(self.temporary_directory()) / "metadata.db")
+        metadata_store = MetadataStore(db_path, self.private_key(0), check_tables=False, wal_mode=True)
+        with db_session:
+            metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "ubuntu desktop"})
+            metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x02" * 20, "title": "ubuntu server"})
+        metadata_store.shutdown()
+        metadata_store = MetadataStore(db_path, self.private_key(0), check_tables=False, wal_mode=True)
+
+        await metadata_store.run_threaded_readonly(metadata_store.fill_auto_complete_index)
+        filled = metadata_store.get_auto_complete_terms("ubu", max_terms=5)
+        with db_session:
+            metadata_store.TorrentMetadata.get(infohash=b"\x02" * 20).health.seeders = 10
+        await metadata_store.run_threaded_readonly(metadata_store.update_auto_complete_weights)
+        metadata_store.shutdown()
+
+        self.assertEqual(["ubuntu", "ubuntu desktop", "ubuntu server"], filled)
+        self.assertEqual(["ubuntu", "ubuntu server", "ubuntu desktop"],
+                         metadata_store.get_auto_complete_terms("ubu", max_terms=5))
+        self.assertEqual({}, metadata_store.seeders_changes)
+
+    @db_session
+    def test_signed_blob_stored(self) -> None:
+        """
+        Test if the exact signed blob of a processed payload is stored and served without serializing again.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20, id_=0, timestamp=0,
+                                                 torrent_date=int2time(0), public_key=other_key.key_to_bin())
+        blob = md.serialized(other_key)
+        md.delete()
+
+        result, = self.metadata_store.process_payload(md.payload_class.from_signed_blob(blob))
+
+        self.assertEqual(blob, result.md_obj.signed_blob)
+        self.assertEqual(blob, result.md_obj.serialized())
+
+    @db_session
+    def test_signed_blob_received(self) -> None:
+        """
+        Test if the received bytes of a signed entry are stored, instead of the entry being serialized again.
+        """
+        other_key = default_eccrypto.generate_key("curve25519")
+        md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20, id_=0, timestamp=0,
+                                                 torrent_date=int2time(0), public_key=other_key.key_to_bin())
+        blob = md.serialized(other_key)
+        md.delete()
+
+        with patch.object(self.metadata_store.TorrentMetadata, "serialize", return_value=b"serialized again"):
+            result, = self.metadata_store.process_squashed_mdblob(blob)
+
+        self.assertEqual(blob, result.md_obj.signed_blob)
+
+    @db_session
+    def test_signed_blob_outdated(self) -> None:
+        """
+        Test if an entry is serialized again if its signature no longer matches the stored signed blob.
+        """
+        md = self.metadata_store.TorrentMetadata(title="test torrent", infohash=b"\x01" * 20)
+        md.signature = b"\x01" * 64
+
+        self.assertNotEqual(md.signed_blob, md.serialized())
+        self.assertEqual(md.serialize(), md.serialized())
+        self.assertEqual(b"\x01" * 64, md.serialized()[-64:])
+
+    @db_session
+    def test_signed_blob_unsigned_changed(self) -> None:
+        """
+        Test if the signed blob of an unsigned entry follows changes to its fields, before and after they are saved.
+        """
+        md = self.metadata_store.TorrentMetadata.add_ffa_from_dict({"infohash": b"\x01" * 20, "title": "abc",
+                                                                    "tags": "Video"})
+        md.flush()
+        md.set(tags="Audio", size=12345)
+
+        unsaved = md.payload_class.from_signed_blob(md.serialized())
+        md.flush()
+        saved = md.payload_class.from_signed_blob(md.signed_blob)
+
+        self.assertEqual(("Audio", 12345), (unsaved.tags, unsaved.size))
+        self.assertEqual(("Audio", 12345), (saved.tags, saved.size))
+        self.assertEqual(md.serialize(), md.serialized())
+
+    def test_add_signed_blob_column_existing_db(self) -> None:
+        """
+        Test if the signed blob column is added to databases that do not have it yet.
+        """
+        db_path = str(Path(self.temporary_directory()) / "metadata.db")
+        metadata_store = MetadataStore(db_path, self.private_key(0), wal_mode=False)
+        with db_session:
+            blob = metadata_store.TorrentMetadata(title="abc", infohash=b"\x01" * 20).signed_blob
+        metadata_store.shutdown()
+        connection = sqlite3.connect(db_path)
+        connection.execute("ALTER TABLE ChannelNode DROP COLUMN signed_blob")
+        connection.commit()
+        connection.close()
+
+        metadata_store = MetadataStore(db_path, self.private_key(0), wal_mode=False)
+        with db_session:
+            md = metadata_store.TorrentMetadata.get()
+            self.assertIsNone(md.signed_blob)
+            self.assertEqual(blob, md.serialized())
+        metadata_store.shutdown()
@@ -0,0 +1,74 @@
+from ipv8.test.base import TestBase
+
+from tribler.core.database.subject_index import IndexChange, SubjectIndex, intersect_sorted
+
+
+class TestSubjectIndex(TestBase):
+    """
+    Tests for the SubjectIndex class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new index with some statements.
+        """
+        super().setUp()
+        self.index = SubjectIndex()
+        self.index.fill([(101, "linux", 1, 30), (101, "linux", 1, 10), (101, "Linux", 2, 20), (101, "iso", 3, 10),
+                         (101, "iso", 3, 20), (14, "linux", 4, 40)])
+
+    def test_intersect_sorted(self) -> None:
+        """
+        Test if sorted lists are intersected correctly.
+        """
+        self.assertEqual([3, 7], intersect_sorted([[1, 3, 5, 7, 9], [3, 4, 7], [0, 3, 7, 8]]))
+        self.assertEqual([], intersect_sorted([[1, 2], [3, 4]]))
+        self.assertEqual([], intersect_sorted([]))
+
+    def test_intersect_case_sensitive(self) -> None:
+        """
+        Test if case-sensitive lookups only match the exact object name.
+        """
+        self.assertEqual([10, 30], self.index.intersect(101, ["linux"]))
+        self.assertEqual([10], self.index.intersect(101, ["linux", "iso"]))
+        self.assertEqual([], self.index.intersect(101, ["LINUX"]))
+
+    def test_intersect_case_insensitive(self) -> None:
+        """
+        Test if case-insensitive lookups match all object names that only differ in case.
+        """
+        self.assertEqual([10, 20, 30], self.index.intersect(101, ["LINUX"], case_sensitive=False))
+        self.assertEqual([10, 20], self.index.intersect(101, ["LINUX", "iso"], case_sensitive=False))
+
+    def test_update_add(self) -> None:
+        """
+        Test if newly shown statements are added to the index.
+        """
+        self.index.update(IndexChange(predicate=101, name="new", object_id=5, subject_id=10, shown=True))
+        self.index.update(IndexChange(predicate=101, name="iso", object_id=3, subject_id=15, shown=True))
+
+        self.assertEqual([10], self.index.intersect(101, ["new"]))
+        self.assertEqual([10, 15, 20], self.index.intersect(101, ["iso"]))
+
+    def test_update_remove(self) -> None:
+        """
+        Test if statements that are no longer shown are removed from the index.
+        """
+        self.index.update(IndexChange(predicate=101, name="Linux", object_id=2, subject_id=20, shown=False))
+
+        self.assertEqual([10, 30], self.index.intersect(101, ["linux"], case_sensitive=False))
+        self.assertEqual({(101, "linux"): {"linux": 1}, (101, "iso"): {"iso": 3}, (14, "linux"): {"linux": 4}},
+                         self.index.objects)
+
+    def test_update_before_fill(self) -> None:
+        """
+        Test if changes that are made before the index is filled are applied after filling.
+        """
+        index = SubjectIndex()
+        index.update(IndexChange(predicate=101, name="iso", object_id=3, subject_id=10, shown=False))
+        index.update(IndexChange(predicate=101, name="iso", object_id=3, subject_id=20, shown=True))
+
+        index.fill([(101, "iso", 3, 10), (101, "iso", 3, 20)])
+
+        self.assertTrue(index.ready)
+        self.assertEqual([20], index.intersect(101, ["iso"]))
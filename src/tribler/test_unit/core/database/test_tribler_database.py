@@ -1,7 +1,9 @@
 from ipv8.test.base import TestBase
 from pony.orm import db_session
 
+from tribler.core.database.layers.knowledge import Operation, ResourceType
 from tribler.core.database.tribler_database import TriblerDatabase
+from tribler.core.knowledge.payload import StatementOperation
 
 
 class TestTriblerDatabase(TestBase):
@@ -58,3 +60,122 @@ class TestTriblerDatabase(TestBase):
         """
         with self.assertRaises(TypeError):
             self.db.version = 'string'
+
+    def add_tags(self) -> None:
+        """
+        Add some tags to torrents.
+        """
+        with db_session:
+            for infohash, tag in [("aa", "linux"), ("aa", "ISO"), ("bb", "iso"), ("cc", "linux")]:
+                self.db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, infohash, ResourceType.TAG, tag)
+
+    @db_session
+    def test_get_subjects_intersection(self) -> None:
+        """
+        Test if the subjects with all given tags can be queried from the database.
+        """
+        self.add_tags()
+
+        self.assertEqual({"aa"}, self.db.knowledge.get_subjects_intersection({"linux", "iso"}, ResourceType.TAG,
+                                                                             case_sensitive=False))
+        self.assertEqual(set(), self.db.knowledge.get_subjects_intersection({"linux", "iso"}, ResourceType.TAG))
+
+    def test_get_subjects_intersection_index(self) -> None:
+        """
+        Test if the subjects with all given tags can be looked up in the subject index.
+        """
+        with db_session:
+            self.db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, "dd", ResourceType.TAG, "iso")
+        self.db.knowledge.fill_subject_index()
+        self.add_tags()
+
+        with db_session:
+            self.assertEqual({"aa", "bb", "dd"}, self.db.knowledge.get_subjects_intersection(
+                {"ISO"}, ResourceType.TAG, case_sensitive=False
+            ))
+            self.assertEqual({"aa"}, self.db.knowledge.get_subjects_intersection({"linux", "ISO"}, ResourceType.TAG))
+
+    def test_get_subjects_intersection_index_rollback(self) -> None:
+        """
+        Test if the subject index is not changed by transactions that are rolled back.
+        """
+        self.db.knowledge.fill_subject_index()
+
+        with self.assertRaises(ValueError), db_session:
+            self.db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, "aa", ResourceType.TAG, "iso")
+            self.assertEqual(set(), self.db.knowledge.get_subjects_intersection({"iso"}, ResourceType.TAG))
+            raise ValueError
+        self.add_tags()
+
+        with db_session:
+            self.assertEqual({"bb"}, self.db.knowledge.get_subjects_intersection({"iso"}, ResourceType.TAG))
+
+    @db_session
+    def test_get_simple_statements_for_subjects(self) -> None:
+        """
+        Test if the statements of multiple torrents can be queried at once.
+        """
+        self.add_tags()
+
+        statements = self.db.knowledge.get_simple_statements_for_subjects(ResourceType.TORRENT, ["aa", "dd"])
+
+        self.assertEqual({"ISO", "linux"}, {statement.object for statement in statements["aa"]})
+        self.assertEqual([], statements["dd"])
+
+    @db_session
+    def test_add_operations(self) -> None:
+        """
+        Test if a batch of operations is applied in order, like separately added operations.
+        """
+        operations = [
+            (StatementOperation(ResourceType.TORRENT, subject, ResourceType.TAG, obj, operation, clock, public_key),
+             b"signature")
+            for subject, obj, operation, clock, public_key in [("aa", "linux", Operation.ADD, 1, b"a"),
+                                                               ("aa", "linux", Operation.REMOVE, 2, b"a"),
+                                                               ("aa", "linux", Operation.ADD, 1, b"b"),
+                                                               ("bb", "linux", Operation.ADD, 1, b"a"),
+                                                               ("bb", "linux", Operation.ADD, 1, b"a")]
+        ]
+
+        results = self.db.knowledge.add_operations(operations)
+
+        self.assertEqual([True, True, True, True, False], results)
+        self.assertEqual({("aa", 1, 1), ("bb", 1, 0)}, {(s.subject.name, s.added_count, s.removed_count)
+                                                        for s in self.db.Statement.select()})
+        self.assertEqual(3, self.db.StatementOp.select().count())
+
+    @db_session
+    def test_get_operations_for_gossip(self) -> None:
+        """
+        Test if random operations that were not auto-generated are selected for gossip.
+        """
+        for i in range(20):
+            self.db.knowledge.add_operation(StatementOperation(ResourceType.TORRENT, "aa", ResourceType.TAG, f"tag{i}",
+                                                               Operation.ADD, 1, b"a"), b"signature")
+            self.db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, "bb", ResourceType.TAG, f"tag{i}")
+
+        operations = self.db.knowledge.get_operations_for_gossip(count=5)
+
+        self.assertEqual(5, len(operations))
+        self.assertTrue(all(not operation.auto_generated for operation in operations))
+
+    @db_session
+    def test_get_operations_for_gossip_too_few(self) -> None:
+        """
+        Test if all suitable operations are selected if there are fewer than requested.
+        """
+        self.db.knowledge.add_operation(StatementOperation(ResourceType.TORRENT, "aa", ResourceType.TAG, "tag",
+                                                           Operation.ADD, 1, b"a"), b"signature")
+        self.db.knowledge.add_auto_generated_operation(ResourceType.TORRENT, "bb", ResourceType.TAG, "tag")
+
+        operations = self.db.knowledge.get_operations_for_gossip(count=5)
+
+        self.assertEqual(["tag"], [operation.statement.object.name for operation in operations])
+        self.assertFalse(next(iter(operations)).auto_generated)
+
+    @db_session
+    def test_get_operations_for_gossip_empty(self) -> None:
+        """
+        Test if no operations are selected for gossip from an empty database.
+        """
+        self.assertEqual(set(), self.db.knowledge.get_operations_for_gossip(count=5))
@@ -0,0 +1,63 @@
+from ipv8.keyvault.crypto import default_eccrypto
+from ipv8.test.base import TestBase
+
+from tribler.core.database.serialization import NULL_KEY, REGULAR_TORRENT, TorrentMetadataPayload
+from tribler.core.database.verification import SignatureVerifier
+
+
+class TestSignatureVerifier(TestBase):
+    """
+    Tests for the SignatureVerifier class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new verifier.
+        """
+        super().setUp()
+        self.verifier = SignatureVerifier(max_workers=2)
+
+    async def tearDown(self) -> None:
+        """
+        Stop the verifier.
+        """
+        self.verifier.shutdown()
+        await super().tearDown()
+
+    def create_payload(self, i: int, signed: bool = True) -> TorrentMetadataPayload:
+        """
+        Create a (signed) torrent payload.
+        """
+        payload = TorrentMetadataPayload(metadata_type=REGULAR_TORRENT, reserved_flags=0, public_key=NULL_KEY,
+                                         id_=i, origin_id=0, timestamp=0, infohash=bytes([i]) * 20, size=0,
+                                         torrent_date=0, title=f"torrent {i}", tags="", tracker_info="")
+        if signed:
+            payload.add_signature(default_eccrypto.generate_key("curve25519"))
+        return payload
+
+    def test_verify_valid(self) -> None:
+        """
+        Test if payloads with a valid signature and unsigned payloads are kept.
+        """
+        payloads = [self.create_payload(1), self.create_payload(2), self.create_payload(3, signed=False)]
+
+        self.assertEqual(payloads, self.verifier.verify(payloads))
+        self.assertEqual(2, self.verifier.get_statistics()["verified"])
+        self.assertEqual(0, self.verifier.get_statistics()["rejected"])
+
+    def test_verify_invalid(self) -> None:
+        """
+        Test if payloads with an invalid signature are dropped.
+        """
+        payloads = [self.create_payload(1), self.create_payload(2)]
+        payloads[0].signature = bytes(127 ^ byte for byte in payloads[0].signature)
+
+        self.assertEqual(payloads[1:], self.verifier.verify(payloads))
+        self.assertEqual(1, self.verifier.get_statistics()["verified"])
+        self.assertEqual(1, self.verifier.get_statistics()["rejected"])
+
+    def test_statistics_empty(self) -> None:
+        """
+        Test if the statistics of a verifier that has not verified anything are zero.
+        """
+        self.assertEqual({"verified": 0, "rejected": 0, "per_second": 0.0}, self.verifier.get_statistics())
@@ -19,7 +19,7 @@ from tribler.core.knowledge.community import (
     validate_resource,
     validate_resource_type,
 )
-from tribler.core.knowledge.payload import StatementOperation, StatementOperationMessage
+from tribler.core.knowledge.payload import StatementOperation, StatementOperationMessage, StatementOperationSignature
 
 if TYPE_CHECKING:
     from ipv8.community import CommunitySettings
@@ -103,6 +103,7 @@ class TestKnowledgeCommunity(TestBase[KnowledgeCommunity]):
         Create a mocked database and new key for each node.
         """
         settings.db = Mock()
+        settings.db.knowledge.add_operations = Mock(side_effect=lambda operations: [True] * len(operations))
         settings.key = default_eccrypto.generate_key("curve25519")
         out = super().create_node(settings, create_dht, enable_statistics)
         out.overlay.cancel_all_pending_tasks()
@@ -130,6 +131,13 @@ class TestKnowledgeCommunity(TestBase[KnowledgeCommunity]):
         ))
         return operation
 
+    def get_added_operations(self, i: int) -> list[StatementOperation]:
+        """
+        Get the operations that a node has stored in its database.
+        """
+        return [operation for call in self.overlay(i).db.knowledge.add_operations.call_args_list
+                for operation, _ in call.args[0]]
+
     @db_session
     def fill_db(self) -> None:
         """
@@ -149,10 +157,12 @@ class TestKnowledgeCommunity(TestBase[KnowledgeCommunity]):
         with self.assertReceivedBy(1, [StatementOperationMessage] * 10) as received:
             self.overlay(1).request_operations()
             await self.deliver_messages()
+        await self.overlay(1).wait_for_tasks()  # Wait for the received operations to be stored
 
         received_objects = {message.operation.object for message in received}
         self.assertEqual(10, len(received_objects))
-        self.assertEqual(5, len(self.overlay(1).db.knowledge.add_operation.call_args_list))
+        self.assertEqual(5, len(self.get_added_operations(1)))
+        self.assertEqual(1, len(self.overlay(1).db.knowledge.add_operations.call_args_list))
 
     async def test_on_request_eat_exceptions(self) -> None:
         """
@@ -164,10 +174,88 @@ class TestKnowledgeCommunity(TestBase[KnowledgeCommunity]):
         with self.assertReceivedBy(1, [StatementOperationMessage] * 9) as received:
             self.overlay(1).request_operations()
             await self.deliver_messages()
+        await self.overlay(1).wait_for_tasks()  # Wait for the received operations to be stored
 
         received_objects = {message.operation.object for message in received}
         self.assertEqual(9, len(received_objects))
-        self.assertEqual(4, len(self.overlay(1).db.knowledge.add_operation.call_args_list))
+        self.assertEqual(4, len(self.get_added_operations(1)))
+
+    async def test_ingestion_batches(self) -> None:
+        """
+        Test if received operations are stored in batches of at most the maximum batch size.
+        """
+        self.overlay(1).max_ingestion_batch = 3
+        self.fill_db()
+
+        with self.assertReceivedBy(1, [StatementOperationMessage] * 10):
+            self.overlay(1).request_operations()
+            await self.deliver_messages()
+        await self.overlay(1).wait_for_tasks()
+
+        self.assertEqual(5, len(self.get_added_operations(1)))
+        self.assertLessEqual(2, len(self.overlay(1).db.knowledge.add_operations.call_args_list))
+        self.assertTrue(all(len(call.args[0]) <= 3
+                            for call in self.overlay(1).db.knowledge.add_operations.call_args_list))
+
+    async def test_ingestion_unrequested(self) -> None:
+        """
+        Test if operations that were not requested are not stored.
+        """
+        self.fill_db()
+        operation, signature = self.operations[0]
+
+        self.overlay(0).ez_send(self.peer(1), StatementOperationMessage(operation=operation,
+                                                                        signature=StatementOperationSignature(signature)))
+        await self.deliver_messages()
+
+        self.assertEqual([], self.get_added_operations(1))
+        self.assertFalse(self.overlay(1).received_operations)
+
+    async def test_ingestion_failed_operation(self) -> None:
+        """
+        Test if the other operations of a batch are stored when a single operation cannot be stored.
+        """
+        def add_operations(operations: list[tuple[StatementOperation, bytes]]) -> list[bool]:
+            if any(operation.object == "000" for operation, _ in operations):
+                raise ValueError
+            return [True] * len(operations)
+
+        self.overlay(1).db.knowledge.add_operations = Mock(side_effect=add_operations)
+        self.fill_db()
+
+        with self.assertReceivedBy(1, [StatementOperationMessage] * 10):
+            self.overlay(1).request_operations()
+            await self.deliver_messages()
+        await self.overlay(1).wait_for_tasks()
+
+        calls = self.overlay(1).db.knowledge.add_operations.call_args_list
+
+        self.assertEqual(5, len(calls[0].args[0]))
+        self.assertEqual([1] * 5, [len(call.args[0]) for call in calls[1:]])
+
+    async def test_ingestion_error_reschedule(self) -> None:
+        """
+        Test if the operations that are left after an error are processed by a new run.
+        """
+        self.overlay(1).max_ingestion_batch = 3
+        verify_operations = self.overlay(1).verify_operations
+
+        def fail_once(operations: list) -> list:
+            if self.overlay(1).verify_operations.call_count == 1:
+                raise RuntimeError
+            return verify_operations(operations)
+
+        self.overlay(1).verify_operations = Mock(side_effect=fail_once)
+        self.fill_db()
+
+        with self.assertReceivedBy(1, [StatementOperationMessage] * 10):
+            self.overlay(1).request_operations()
+            await self.deliver_messages()
+        while self.overlay(1).ingestion_task is not None:
+            await self.overlay(1).wait_for_tasks()
+
+        self.assertEqual(4, self.overlay(1).verify_operations.call_count)
+        self.assertEqual([], self.overlay(1).received_operations)
 
     async def test_no_peers(self) -> None:
         """
@@ -1,10 +1,10 @@
-from asyncio import Future
+from asyncio import Future, sleep
 from binascii import unhexlify
 from unittest.mock import Mock
 
 from ipv8.test.base import TestBase
 
-from tribler.core.libtorrent.download_manager.dht_health_manager import DHTHealthManager
+from tribler.core.libtorrent.download_manager.dht_health_manager import LOOKUP_ALERT_MASK, DHTHealthManager
 
 
 class TestDHTHealthManager(TestBase):
@@ -113,3 +113,47 @@ class TestDHTHealthManager(TestBase):
 
         self.assertEqual(bytearray(b"\xee" * 256), self.manager.bf_seeders[infohash])
         self.assertEqual(bytearray(b"\xff" * 256), self.manager.bf_peers[infohash])
+
+    async def test_get_health_peers(self) -> None:
+        """
+        Test if the number of returned peers is used as an estimate if no bloom filters are received.
+        """
+        lookup_future = self.manager.get_health(b"a" * 20, timeout=0.01)
+        self.manager.received_peers(b"a" * 20, [("1.2.3.4", 1), ("1.2.3.4", 1), ("1.2.3.5", 1)])
+        self.manager.received_peers(b"b" * 20, [("1.2.3.6", 1)])
+
+        health = await lookup_future
+
+        self.assertEqual(0, health.seeders)
+        self.assertEqual(2, health.leechers)
+        self.assertEqual({}, self.manager.peers)
+
+    async def test_get_health_bloomfilters_over_peers(self) -> None:
+        """
+        Test if the bloom filters are preferred over the number of returned peers.
+        """
+        lookup_future = self.manager.get_health(b"a" * 20, timeout=0.01)
+        self.manager.requesting_bloomfilters("1", b"a" * 20)
+        self.manager.received_bloomfilters("1", bf_seeds=bytearray(b"\x01" * 256), bf_peers=bytearray(256))
+        self.manager.received_peers(b"a" * 20, [("1.2.3.4", 1)])
+
+        health = await lookup_future
+
+        self.assertLess(0, health.seeders)
+        self.assertEqual(0, health.leechers)
+
+    async def test_get_health_alert_mask(self) -> None:
+        """
+        Test if the DHT alerts are only enabled while lookups are in progress.
+        """
+        self.manager.alert_mask = 1
+
+        lookup_future = self.manager.get_health(b"a" * 20, timeout=0.01)
+        self.manager.get_health(b"b" * 20, timeout=0.01)
+
+        self.assertEqual(1, self.manager.lt_session.set_alert_mask.call_count)
+        self.assertEqual(1 | LOOKUP_ALERT_MASK, self.manager.lt_session.set_alert_mask.call_args.args[0])
+        await lookup_future
+        await sleep(0.02)
+        self.assertEqual(2, self.manager.lt_session.set_alert_mask.call_count)
+        self.assertEqual(1, self.manager.lt_session.set_alert_mask.call_args.args[0])
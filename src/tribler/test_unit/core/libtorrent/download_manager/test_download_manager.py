@@ -67,6 +67,21 @@ class TestDownloadManager(TestBase):
         config.set_dest_dir(Path(""))
         return config
 
+    def test_dht_health_manager_hops(self) -> None:
+        """
+        Test if the DHT health lookups use the session with the anonymization hops of the downloads.
+        """
+        self.manager.config.set("libtorrent/dht", True)
+        self.manager.config.set("libtorrent/upnp", False)
+        self.manager.config.set("libtorrent/download_defaults/number_hops", 2)
+        self.manager.checkpoint_directory = Path(self.temporary_directory())
+        self.manager.dht_readiness_timeout = 0
+        self.manager.set_download_states_callback = Mock()
+
+        self.manager.initialize()
+
+        self.assertIs(self.manager.ltsessions[2], self.manager.dht_health_manager.lt_session)
+
     async def test_get_metainfo_valid_metadata(self) -> None:
         """
         Testing if the metainfo is retrieved when the handle has valid metadata immediately.
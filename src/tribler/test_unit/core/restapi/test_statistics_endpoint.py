@@ -51,13 +51,50 @@ class TestStatisticsEndpoint(TestBase):
         Test if getting Tribler stats forwards MetadataStore statistics.
         """
         endpoint = StatisticsEndpoint()
-        endpoint.mds = Mock(get_db_file_size=Mock(return_value=42), get_num_torrents=Mock(return_value=7))
+        endpoint.mds = Mock(get_db_file_size=Mock(return_value=42), get_num_torrents=Mock(return_value=7),
+                            search_cache=Mock(get_statistics=Mock(return_value={"hits": 3, "misses": 1, "size": 1})),
+                            signature_verifier=Mock(get_statistics=Mock(return_value={"verified": 5, "rejected": 2,
+                                                                                      "per_second": 10.0})),
+                            get_executor_statistics=Mock(return_value={"executor": {"interactive": {"queued": 1}}}))
 
         response = endpoint.get_tribler_stats(TriblerStatsRequest())
         response_body_json = await response_to_json(response)
 
         self.assertEqual(42, response_body_json["tribler_statistics"]["db_size"])
         self.assertEqual(7, response_body_json["tribler_statistics"]["num_torrents"])
+        self.assertEqual({"hits": 3, "misses": 1, "size": 1}, response_body_json["tribler_statistics"]["search_cache"])
+        self.assertEqual({"verified": 5, "rejected": 2, "per_second": 10.0},
+                         response_body_json["tribler_statistics"]["signature_verification"])
+        self.assertEqual({"executor": {"interactive": {"queued": 1}}},
+                         response_body_json["tribler_statistics"]["db_executor"])
+
+    async def test_get_tribler_stats_with_torrent_checker(self) -> None:
+        """
+        Test if getting Tribler stats forwards the health check statistics.
+        """
+        endpoint = StatisticsEndpoint()
+        endpoint.torrent_checker = Mock(get_statistics=Mock(return_value={"torrents": 3, "coverage": 0.5}))
+
+        response = endpoint.get_tribler_stats(TriblerStatsRequest())
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual({"torrents": 3, "coverage": 0.5}, response_body_json["tribler_statistics"]["health_checks"])
+
+    async def test_get_tribler_stats_with_content_discovery(self) -> None:
+        """
+        Test if getting Tribler stats forwards the statistics of the remote select response cache and scheduler.
+        """
+        endpoint = StatisticsEndpoint()
+        endpoint.content_discovery_community = Mock(
+            response_cache=Mock(get_statistics=Mock(return_value={"hits": 3})),
+            query_scheduler=Mock(get_statistics=Mock(return_value={"processed": 5, "shed": 1}))
+        )
+
+        response = endpoint.get_tribler_stats(TriblerStatsRequest())
+        response_body_json = await response_to_json(response)
+
+        self.assertEqual({"hits": 3}, response_body_json["tribler_statistics"]["response_cache"])
+        self.assertEqual({"processed": 5, "shed": 1}, response_body_json["tribler_statistics"]["remote_queries"])
 
     async def test_get_ipv8_stats_no_ipv8(self) -> None:
         """
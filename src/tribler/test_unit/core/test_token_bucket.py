@@ -0,0 +1,21 @@
+from ipv8.test.base import TestBase
+
+from tribler.core.token_bucket import TokenBucket
+
+
+class TestTokenBucket(TestBase):
+    """
+    Tests for the TokenBucket class.
+    """
+
+    def test_consume(self) -> None:
+        """
+        Test if a token bucket refills over time, up to its burst size.
+        """
+        bucket = TokenBucket(rate=1, burst=2, tokens=2, updated=0)
+
+        self.assertTrue(bucket.consume(2, 0))
+        self.assertFalse(bucket.consume(1, 0.5))
+        self.assertTrue(bucket.consume(1, 1))
+        bucket.refill(100)
+        self.assertEqual(2, bucket.tokens)
@@ -0,0 +1,187 @@
+from ipv8.test.base import TestBase
+
+from tribler.core.torrent_checker.planner import INTEREST_SEARCHED, HealthCheckPlanner, PlannedTorrent, TimeCounter
+
+
+class TestHealthCheckPlanner(TestBase):
+    """
+    Tests for the HealthCheckPlanner class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new planner that allows two checks per second.
+        """
+        super().setUp()
+        self.planner = HealthCheckPlanner(checks_per_second=2, burst=2, min_interval=900, freshness_period=14400)
+        self.planner.budget.updated = 100000
+
+    def test_due_popular(self) -> None:
+        """
+        Test if popular torrents become due sooner.
+        """
+        unpopular = PlannedTorrent(last_check=0, seeders=0, leechers=0)
+        popular = PlannedTorrent(last_check=0, seeders=7, leechers=0)
+
+        self.assertEqual(14400, self.planner.get_due(unpopular))
+        self.assertEqual(3600, self.planner.get_due(popular))
+
+    def test_due_min_interval(self) -> None:
+        """
+        Test if torrents never become due before the minimum interval.
+        """
+        torrent = PlannedTorrent(last_check=0, seeders=1000000, leechers=0, interest=INTEREST_SEARCHED)
+
+        self.assertEqual(900, self.planner.get_due(torrent))
+
+    def test_pop_order(self) -> None:
+        """
+        Test if the torrents that are most overdue are popped first.
+        """
+        self.planner.add([(1, b"\x01" * 20, 0, 0, 0), (2, b"\x02" * 20, 7, 0, 0), (3, b"\x03" * 20, 0, 0, 99000)])
+
+        self.assertEqual([b"\x02" * 20, b"\x01" * 20], self.planner.pop(100000))
+        self.assertEqual(3, self.planner.last_rowid)
+
+    def test_pop_budget(self) -> None:
+        """
+        Test if no more torrents are popped than the budget allows.
+        """
+        self.planner.add([(i, bytes([i]) * 20, 0, 0, 0) for i in range(5)])
+
+        self.assertEqual(2, len(self.planner.pop(100000)))
+        self.assertEqual(0, len(self.planner.pop(100000)))
+        self.assertEqual(1, len(self.planner.pop(100000.5)))
+
+    def test_pop_not_again(self) -> None:
+        """
+        Test if a popped torrent is not popped again before the minimum interval passed.
+        """
+        self.planner.update(b"\x01" * 20, 0, 0, 0)
+        self.planner.pop(100000)
+        self.planner.budget.tokens = 2
+
+        self.assertEqual([], self.planner.pop(100899))
+        self.assertEqual([b"\x01" * 20], self.planner.pop(100900))
+
+    def test_update(self) -> None:
+        """
+        Test if a torrent is rescheduled when its health is updated.
+        """
+        self.planner.update(b"\x01" * 20, 0, 0, 0)
+        self.planner.update(b"\x01" * 20, 0, 0, 99999)
+
+        self.assertFalse(self.planner.has_due(100000))
+        self.assertEqual([], self.planner.pop(100000))
+
+    def test_add_interest(self) -> None:
+        """
+        Test if interest of the user makes a torrent due sooner.
+        """
+        self.planner.update(b"\x01" * 20, 0, 0, 90000)
+        self.planner.update(b"\x02" * 20, 0, 0, 90000)
+
+        self.planner.add_interest(b"\x01" * 20, INTEREST_SEARCHED)
+
+        self.assertEqual([b"\x01" * 20], self.planner.pop(100000))
+
+    def test_add_interest_before_torrent(self) -> None:
+        """
+        Test if interest of the user is remembered for torrents that are added later.
+        """
+        self.planner.add_interest(b"\x01" * 20, INTEREST_SEARCHED)
+        self.planner.update(b"\x01" * 20, 0, 0, 0)
+
+        self.assertEqual(INTEREST_SEARCHED, self.planner.torrents[b"\x01" * 20].interest)
+
+    def test_statistics(self) -> None:
+        """
+        Test if the coverage is the fraction of seeded torrents with a fresh health.
+        """
+        self.planner.add([(1, b"\x01" * 20, 5, 0, 99000), (2, b"\x02" * 20, 5, 0, 0), (3, b"\x03" * 20, 0, 0, 0)])
+
+        statistics = self.planner.get_statistics(100000)
+
+        self.assertEqual(3, statistics["torrents"])
+        self.assertEqual(2, statistics["due"])
+        self.assertEqual(2, statistics["seeded"])
+        self.assertEqual(0.5, statistics["coverage"])
+
+    def test_statistics_update(self) -> None:
+        """
+        Test if the statistics follow the updates of the health and the passing of time.
+        """
+        self.planner.add([(1, b"\x01" * 20, 5, 0, 99000), (2, b"\x02" * 20, 5, 0, 0)])
+        self.planner.update(b"\x02" * 20, 0, 0, 99000)
+
+        self.assertEqual({"torrents": 2, "due": 0, "planned": 0, "seeded": 1, "coverage": 1.0},
+                         self.planner.get_statistics(100000))
+        self.assertEqual({"torrents": 2, "due": 2, "planned": 0, "seeded": 1, "coverage": 0.0},
+                         self.planner.get_statistics(120000))
+
+    def test_evict(self) -> None:
+        """
+        Test if the least popular torrents are forgotten when there are too many torrents.
+        """
+        planner = HealthCheckPlanner(checks_per_second=2, burst=2, min_interval=900, max_torrents=10)
+
+        planner.add([(i, bytes([i]) * 20, i, 0, 0) for i in range(11)])
+
+        self.assertEqual(10, len(planner.torrents))
+        self.assertNotIn(b"\x00" * 20, planner.torrents)
+        self.assertEqual(10, planner.get_statistics(0)["seeded"])
+
+    def test_take_random_budget_reserved(self) -> None:
+        """
+        Test if checks that are not planned get their reserved share of the budget while torrents are due.
+        """
+        planner = HealthCheckPlanner(checks_per_second=2, burst=10, min_interval=900, random_share=0.2)
+        planner.budget.updated = planner.random_budget.updated = 100000
+        planner.update(b"\x01" * 20, 0, 0, 0)
+
+        self.assertEqual(2, planner.take_random_budget(5, 100000))
+        self.assertEqual(8, planner.budget.tokens)
+
+    def test_take_random_budget_not_due(self) -> None:
+        """
+        Test if checks that are not planned may use the whole budget when no torrents are due.
+        """
+        planner = HealthCheckPlanner(checks_per_second=2, burst=10, min_interval=900, random_share=0.2)
+        planner.budget.updated = planner.random_budget.updated = 100000
+
+        self.assertEqual(5, planner.take_random_budget(5, 100000))
+        self.assertEqual(5, planner.budget.tokens)
+
+
+class TestTimeCounter(TestBase):
+    """
+    Tests for the TimeCounter class.
+    """
+
+    def test_count_since(self) -> None:
+        """
+        Test if only the timestamps at or after the given time are counted.
+        """
+        counter = TimeCounter(resolution=10)
+        counter.add(5)
+        counter.add(15)
+        counter.add(25)
+
+        self.assertEqual(3, counter.count_since(0))
+        self.assertEqual(2, counter.count_since(10))
+        self.assertEqual(1, counter.count_since(20))
+
+    def test_remove(self) -> None:
+        """
+        Test if removed timestamps are no longer counted, also when they are no longer stored.
+        """
+        counter = TimeCounter(resolution=10)
+        counter.add(5)
+        counter.add(15)
+        counter.count_since(10)
+
+        counter.add(5, -1)
+        counter.add(15, -1)
+
+        self.assertEqual(0, counter.count_since(10))
+        self.assertEqual({}, counter.buckets)
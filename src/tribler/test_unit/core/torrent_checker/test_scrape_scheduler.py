@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from asyncio import CancelledError, ensure_future, gather, sleep, wait_for
+
+from ipv8.test.base import TestBase
+
+from tribler.core.torrent_checker.dataclasses import HealthInfo, TrackerResponse
+from tribler.core.torrent_checker.scrape_scheduler import ScrapeScheduler
+from tribler.core.torrent_checker.torrentchecker_session import MAX_INFOHASHES_IN_SCRAPE
+
+
+class MockSession:
+    """
+    A mocked tracker session.
+    """
+
+    def __init__(self, tracker_url: str, timeout: float) -> None:
+        """
+        Create a new MockSession.
+        """
+        self.tracker_url = tracker_url
+        self.timeout = timeout
+        self.infohash_list = []
+
+    def add_infohash(self, infohash: bytes) -> None:
+        """
+        Add an infohash to scrape.
+        """
+        self.infohash_list.append(infohash)
+
+
+class TestScrapeScheduler(TestBase):
+    """
+    Tests for the ScrapeScheduler class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new scheduler without a batch window.
+        """
+        super().setUp()
+        self.sessions = []
+        self.error = None
+        self.scheduler = ScrapeScheduler(self.create_session, self.get_response, window=0)
+
+    async def tearDown(self) -> None:
+        """
+        Shut down the scheduler.
+        """
+        await self.scheduler.shutdown()
+        await super().tearDown()
+
+    def create_session(self, tracker_url: str, timeout: float) -> MockSession:
+        """
+        Create and remember a session.
+        """
+        session = MockSession(tracker_url, timeout)
+        self.sessions.append(session)
+        return session
+
+    async def get_response(self, session: MockSession) -> TrackerResponse:
+        """
+        Respond with one seeder for every infohash, or raise the configured error.
+        """
+        if self.error:
+            raise self.error
+        return TrackerResponse(url=session.tracker_url,
+                               torrent_health_list=[HealthInfo(infohash, seeders=1)
+                                                    for infohash in session.infohash_list])
+
+    async def test_batch(self) -> None:
+        """
+        Test if the checks of different torrents on the same tracker are combined into one scrape.
+        """
+        responses = await gather(self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20),
+                                 self.scheduler.scrape("udp://tracker:1", b"\x02" * 20, 30))
+
+        self.assertEqual(1, len(self.sessions))
+        self.assertEqual([b"\x01" * 20, b"\x02" * 20], self.sessions[0].infohash_list)
+        self.assertEqual(30, self.sessions[0].timeout)
+        self.assertEqual([[b"\x01" * 20], [b"\x02" * 20]],
+                         [[health.infohash for health in response.torrent_health_list] for response in responses])
+
+    async def test_batch_same_infohash(self) -> None:
+        """
+        Test if the same torrent is only scraped once for multiple callers.
+        """
+        responses = await gather(self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20),
+                                 self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20))
+
+        self.assertEqual([b"\x01" * 20], self.sessions[0].infohash_list)
+        self.assertEqual(1, responses[0].torrent_health_list[0].seeders)
+        self.assertEqual(1, responses[1].torrent_health_list[0].seeders)
+
+    async def test_trackers_independent(self) -> None:
+        """
+        Test if different trackers are scraped separately.
+        """
+        await gather(self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20),
+                     self.scheduler.scrape("udp://tracker:2", b"\x01" * 20, 20))
+
+        self.assertEqual({"udp://tracker:1", "udp://tracker:2"}, {session.tracker_url for session in self.sessions})
+
+    async def test_batch_full(self) -> None:
+        """
+        Test if a full batch is not added to.
+        """
+        infohashes = [i.to_bytes(20, "big") for i in range(MAX_INFOHASHES_IN_SCRAPE + 1)]
+
+        await gather(*[self.scheduler.scrape("udp://tracker:1", infohash, 20) for infohash in infohashes])
+
+        self.assertEqual([MAX_INFOHASHES_IN_SCRAPE, 1], [len(session.infohash_list) for session in self.sessions])
+
+    async def test_error(self) -> None:
+        """
+        Test if a failed scrape is reported to all callers.
+        """
+        self.error = ValueError("tracker failed")
+
+        responses = await gather(self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20),
+                                 self.scheduler.scrape("udp://tracker:1", b"\x02" * 20, 20), return_exceptions=True)
+
+        self.assertIs(self.error, responses[0])
+        self.assertIs(self.error, responses[1])
+
+    async def test_error_cancelled_caller(self) -> None:
+        """
+        Test if a failed scrape is retrieved for a caller that was cancelled meanwhile.
+        """
+        self.scheduler.window = 10
+        self.error = ValueError("tracker failed")
+        scrape = ensure_future(self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20))
+        await sleep(0)
+        scrape.cancel()
+        batch, = self.scheduler.unsent
+
+        await self.scheduler.send(batch)
+
+        self.assertFalse(batch.futures[b"\x01" * 20]._log_traceback)  # noqa: SLF001
+
+    async def test_no_session(self) -> None:
+        """
+        Test if a tracker is skipped if no session can be created.
+        """
+        self.scheduler.create_session = lambda *_: None
+
+        self.assertIsNone(await self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20))
+
+    async def test_now(self) -> None:
+        """
+        Test if a batch is scraped without waiting for its window if a caller asks for it.
+        """
+        self.scheduler.window = 10
+        waiting = ensure_future(self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20))
+        await sleep(0)
+
+        response = await wait_for(self.scheduler.scrape("udp://tracker:1", b"\x02" * 20, 20, now=True), 1)
+
+        self.assertEqual([b"\x01" * 20, b"\x02" * 20], self.sessions[0].infohash_list)
+        self.assertEqual([b"\x02" * 20], [health.infohash for health in response.torrent_health_list])
+        self.assertEqual([b"\x01" * 20], [health.infohash for health in (await waiting).torrent_health_list])
+
+    async def test_full_now(self) -> None:
+        """
+        Test if a full batch is scraped without waiting for its window.
+        """
+        self.scheduler.window = 10
+        infohashes = [i.to_bytes(20, "big") for i in range(MAX_INFOHASHES_IN_SCRAPE)]
+
+        await wait_for(gather(*[self.scheduler.scrape("udp://tracker:1", infohash, 20) for infohash in infohashes]), 1)
+
+        self.assertEqual([MAX_INFOHASHES_IN_SCRAPE], [len(session.infohash_list) for session in self.sessions])
+
+    async def test_shutdown(self) -> None:
+        """
+        Test if waiting checks are cancelled on shutdown.
+        """
+        self.scheduler.window = 10
+        scrape = ensure_future(self.scheduler.scrape("udp://tracker:1", b"\x01" * 20, 20))
+        await sleep(0)
+
+        await self.scheduler.shutdown()
+
+        with self.assertRaises(CancelledError):
+            await scrape
+        self.assertEqual([], self.sessions)
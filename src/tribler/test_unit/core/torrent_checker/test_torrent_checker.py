@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import random
 import secrets
+import threading
 import time
+from asyncio import get_running_loop, sleep
 from binascii import unhexlify
+from functools import partial
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
@@ -17,11 +20,8 @@ from tribler.core.torrent_checker.dataclasses import (
     HealthInfo,
     TrackerResponse,
 )
-from tribler.core.torrent_checker.torrent_checker import (
-    TORRENT_SELECTION_POOL_SIZE,
-    TorrentChecker,
-    aggregate_responses_for_infohash,
-)
+from tribler.core.torrent_checker.planner import INTEREST_DOWNLOADED, INTEREST_SEARCHED
+from tribler.core.torrent_checker.torrent_checker import TorrentChecker, aggregate_responses_for_infohash
 from tribler.core.torrent_checker.torrentchecker_session import HttpTrackerSession, UdpSocketManager
 from tribler.core.torrent_checker.tracker_manager import TrackerManager
 from tribler.test_unit.core.torrent_checker.mocks import MockEntity, MockTorrentState, MockTrackerState
@@ -64,6 +64,8 @@ class TestTorrentChecker(TestBase):
         self.metadata_store.TorrentState.__class__.instances = []
         self.metadata_store.TrackerState.__class__.instances = []
         self.metadata_store.TorrentMetadata.__class__.instances = []
+        self.metadata_store.pop_health_changes = Mock(return_value={})
+        self.metadata_store.run_threaded_readonly = AsyncMock(side_effect=lambda func, *args, **kwargs: func(*args))
 
         self.tracker_manager = TrackerManager(state_dir=Path("."), metadata_store=self.metadata_store)
         self.torrent_checker = TorrentChecker(config=TriblerConfigManager(), tracker_manager=self.tracker_manager,
@@ -122,6 +124,26 @@ class TestTorrentChecker(TestBase):
         self.assertEqual(5, result.seeders)
         self.assertEqual(10, result.leechers)
 
+    async def test_health_check_metainfo(self) -> None:
+        """
+        Test if the metainfo of a torrent is fetched when requested.
+        """
+        self.torrent_checker.download_manager.get_metainfo = AsyncMock(return_value={b"seeders": 5, b"leechers": 10})
+
+        result = await self.torrent_checker.check_torrent_health(b'a' * 20, use_metainfo=True)
+
+        self.assertEqual(5, result.seeders)
+        self.assertEqual(10, result.leechers)
+        self.torrent_checker.download_manager.get_metainfo.assert_called_once()
+
+    async def test_health_check_no_metainfo(self) -> None:
+        """
+        Test if the metainfo of a torrent is not fetched by default.
+        """
+        await self.torrent_checker.check_torrent_health(b'a' * 20)
+
+        self.torrent_checker.download_manager.get_metainfo.assert_not_called()
+
     def test_load_torrents_check_from_db_no_self_checked(self) -> None:
         """
         Test if the torrents_checked only considers self-checked torrents.
@@ -274,28 +296,146 @@ class TestTorrentChecker(TestBase):
         self.assertEqual(12, ts.leechers)
         self.assertEqual(13, ts.seeders)
 
+    def add_torrent_states(self, count: int) -> list[MockTorrentState]:
+        """
+        Add torrent states with increasing numbers of seeders, of which the first half was checked just now.
+        """
+        torrent_states = [MockTorrentState(bytes([i]) * 20, i, last_check=int(time.time()) if i < count // 2 else 0)
+                          for i in range(count)]
+        for i, torrent_state in enumerate(torrent_states):
+            torrent_state.rowid = i + 1
+        self.torrent_checker.mds.TorrentState.instances = torrent_states
+        return torrent_states
+
     async def test_check_local_torrents(self) -> None:
         """
-        Test if the random torrent health checking mechanism picks the right torrents.
+        Test if the torrents that are most overdue are checked, as far as the budget allows.
         """
-        self.torrent_checker.mds.TorrentState.instances = [
-            MockTorrentState(bytes([i]) * 20, i, last_check=int(time.time()) if i < 20 else 0) for i in range(40)
-        ]
-        self.torrent_checker.mds.TorrentMetadata.instances = [
-            MockMiniTorrentMetadata(bytes([i]) * 20, f'torrent{i}', self.torrent_checker.mds.TorrentState.instances[i])
-            for i in range(40)
-        ]
-        stale_infohashes = [bytes([i]) * 20 for i in range(20, 40)]
+        self.add_torrent_states(40)
+        await self.torrent_checker.refill_planner()
+
+        selected_infohashes, _ = await self.torrent_checker.check_local_torrents()
+
+        self.assertEqual([bytes([i]) * 20 for i in range(39, 31, -1)], selected_infohashes)
+
+    async def test_check_local_torrents_not_again(self) -> None:
+        """
+        Test if checked torrents are not selected again right away.
+        """
+        self.add_torrent_states(40)
+        await self.torrent_checker.refill_planner()
+        self.torrent_checker.planner.budget.burst = self.torrent_checker.planner.budget.tokens = 100
+
+        first, _ = await self.torrent_checker.check_local_torrents()
+        self.torrent_checker.planner.budget.tokens = 100
+        second, _ = await self.torrent_checker.check_local_torrents()
+
+        self.assertEqual(20, len(first))
+        self.assertEqual([], second)
+
+    async def test_refill_planner_incremental(self) -> None:
+        """
+        Test if the planner is refilled with the torrents that it does not know yet.
+        """
+        torrent_states = self.add_torrent_states(2)
+        await self.torrent_checker.refill_planner()
+        torrent_states[0].seeders = 100
+        new_torrent_state = MockTorrentState(b"\x03" * 20)
+        new_torrent_state.rowid = 3
+
+        await self.torrent_checker.refill_planner()
+
+        self.assertEqual(3, len(self.torrent_checker.planner.torrents))
+        self.assertEqual(0, self.torrent_checker.planner.torrents[b"\x00" * 20].seeders)
+        self.assertEqual(3, self.torrent_checker.planner.last_rowid)
+
+    async def test_refill_planner_health_changes(self) -> None:
+        """
+        Test if the planner is refilled with the health that changed in the database, e.g., through other peers.
+        """
+        self.torrent_checker.mds.pop_health_changes = Mock(return_value={b"\x01" * 20: (10, 5, 1000)})
+
+        await self.torrent_checker.refill_planner()
+
+        self.assertEqual(10, self.torrent_checker.planner.torrents[b"\x01" * 20].seeders)
+        self.assertEqual(1000, self.torrent_checker.planner.torrents[b"\x01" * 20].last_check)
+
+    async def test_refill_planner_downloads(self) -> None:
+        """
+        Test if the torrents that are downloaded are prioritized.
+        """
+        download = Mock(get_def=Mock(return_value=Mock(infohash=b"\x01" * 20)))
+        self.torrent_checker.download_manager.get_downloads = Mock(return_value=[download])
+
+        await self.torrent_checker.refill_planner()
+
+        self.assertEqual(INTEREST_DOWNLOADED, self.torrent_checker.planner.interests[b"\x01" * 20])
+
+    async def test_on_query_results(self) -> None:
+        """
+        Test if the torrents in search results are prioritized.
+        """
+        self.torrent_checker.on_query_results("ubuntu", results=[{"infohash": "01" * 20}, {"name": "no infohash"}])
+        await sleep(0)
+
+        self.assertEqual({b"\x01" * 20: INTEREST_SEARCHED}, self.torrent_checker.planner.interests)
+
+    async def test_on_query_results_thread(self) -> None:
+        """
+        Test if the torrents in search results that are notified from another thread are prioritized on the loop.
+        """
+        threads = []
+        self.torrent_checker.planner.add_interest = lambda *args: threads.append(threading.current_thread())
+
+        await get_running_loop().run_in_executor(None, partial(self.torrent_checker.on_query_results, "ubuntu",
+                                                                results=[{"infohash": "01" * 20}]))
+        await sleep(0)
+
+        self.assertEqual([threading.current_thread()], threads)
+
+    async def test_check_random_tracker_planner_first(self) -> None:
+        """
+        Test if random trackers are not checked while the planner has due torrents and their reserved budget is spent.
+        """
+        tracker, = self.torrent_checker.mds.TrackerState.instances = [MockTrackerState(url="http://localhost/tracker")]
+        self.torrent_checker.mds.TorrentState.instances = [MockTorrentState(infohash=b"\x01" * 20, trackers={tracker})]
+        self.torrent_checker.create_session_for_request = Mock(return_value=None)
+        self.torrent_checker.planner.update(b"\x02" * 20, 0, 0, 0)
+        self.torrent_checker.planner.random_budget.tokens = 0
+
+        with patch.dict(tribler.core.torrent_checker.torrent_checker.__dict__,
+                        {"select": (lambda x: self.torrent_checker.mds.TorrentState.instances)}):
+            await self.torrent_checker.check_random_tracker()
+
+        self.torrent_checker.create_session_for_request.assert_not_called()
+
+    async def test_check_random_tracker_reserved_budget(self) -> None:
+        """
+        Test if random trackers are checked with their reserved budget while the planner has torrents that are due.
+        """
+        tracker, = self.torrent_checker.mds.TrackerState.instances = [MockTrackerState(url="http://localhost/tracker")]
+        self.torrent_checker.mds.TorrentState.instances = [MockTorrentState(infohash=b"\x01" * 20, trackers={tracker})]
+        self.torrent_checker.create_session_for_request = Mock(return_value=None)
+        self.torrent_checker.planner.update(b"\x02" * 20, 0, 0, 0)
+
+        with patch.dict(tribler.core.torrent_checker.torrent_checker.__dict__,
+                        {"select": (lambda x: self.torrent_checker.mds.TorrentState.instances)}):
+            await self.torrent_checker.check_random_tracker()
+
+        self.torrent_checker.create_session_for_request.assert_called_once()
+        self.assertTrue(self.torrent_checker.planner.has_due(time.time()))
+
+    def test_update_health_planner(self) -> None:
+        """
+        Test if the planner is informed of a torrent health update.
+        """
+        self.torrent_checker.mds.TorrentState.instances = [MockTorrentState(b"\x01" * 20)]
+        health = HealthInfo(b"\x01" * 20, seeders=10, leechers=5, last_check=int(time.time()), self_checked=True)
 
-        # 1. Popular torrents are in the front, and
-        # 2. Older torrents are towards the back
-        selection_range = (stale_infohashes[0:TORRENT_SELECTION_POOL_SIZE]
-                           + stale_infohashes[-TORRENT_SELECTION_POOL_SIZE:])
-        selected_torrents, _ = await self.torrent_checker.check_local_torrents()
+        self.torrent_checker.update_torrent_health(health)
 
-        self.assertLessEqual(len(selected_torrents), TORRENT_SELECTION_POOL_SIZE)
-        for t in selected_torrents:
-            self.assertIn(t.infohash, selection_range)
+        self.assertEqual(10, self.torrent_checker.planner.torrents[b"\x01" * 20].seeders)
+        self.assertFalse(self.torrent_checker.planner.has_due(time.time()))
 
     def test_update_torrent_health_invalid_health(self) -> None:
         """
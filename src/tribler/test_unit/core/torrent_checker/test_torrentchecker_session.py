@@ -1,4 +1,5 @@
 import struct
+import time
 from asyncio import CancelledError, Future, ensure_future, sleep
 from unittest.mock import Mock, patch
 
@@ -9,10 +10,11 @@ from libtorrent import bencode
 
 from tribler.core.torrent_checker.dataclasses import HealthInfo
 from tribler.core.torrent_checker.torrentchecker_session import (
-    FakeBep33DHTSession,
     FakeDHTSession,
+    HttpClientPool,
     HttpTrackerSession,
     UdpSocketManager,
+    UdpTrackerCache,
     UdpTrackerSession,
 )
 
@@ -30,11 +32,14 @@ class MockUdpSocketManager:
         """
         self.response = None
         self.tracker_sessions = {}
+        self.tracker_cache = UdpTrackerCache()
+        self.sent = []
 
     def send_request(self, data: bytes, tracker_session: UdpTrackerSession) -> Future:
         """
         Fake sending a request and return the registered response.
         """
+        self.sent.append(data)
         return succeed(self.response)
 
 
@@ -48,7 +53,7 @@ class TestTrackerSession(TestBase):
         Create a fake udp socket manager.
         """
         self.fake_udp_socket_manager = MockUdpSocketManager()
-        self.fake_dht_session = FakeDHTSession(Mock(), 10)
+        self.fake_dht_session = FakeDHTSession(Mock(), 10, use_metainfo=True)
         self.session = None
 
     async def tearDown(self) -> None:
@@ -88,7 +93,7 @@ class TestTrackerSession(TestBase):
         """
         self.session = HttpTrackerSession("localhost", ("localhost", 8475), "/announce", 5, None)
 
-        def fake_request(_: str) -> None:
+        def fake_request(_: str, **__) -> None:
             raise HTTPBadRequest
 
         with self.assertRaises(ValueError), patch.object(self.session.session, "get", fake_request):
@@ -96,6 +101,18 @@ class TestTrackerSession(TestBase):
 
         self.assertTrue(self.session.is_failed)
 
+    async def test_httpsession_shared_client(self) -> None:
+        """
+        Test if a HTTP session does not close a client that it was given.
+        """
+        client = Mock(close=Mock(return_value=succeed(None)))
+        self.session = HttpTrackerSession("localhost", ("localhost", 8475), "/announce", 5, None, client)
+
+        await self.session.cleanup()
+
+        self.assertIs(client, self.session.session)
+        client.close.assert_not_called()
+
     async def test_httpsession_failure_reason_in_dict(self) -> None:
         """
         Test if processing a scrape response of a failed (bencoded) dictionary leads to a ValueError.
@@ -334,6 +351,94 @@ class TestTrackerSession(TestBase):
 
         self.assertTrue(self.session.is_finished)
 
+    async def test_udpsession_connect_cached(self) -> None:
+        """
+        Test if a UDP session reuses the connection ID that the tracker gave to an earlier session.
+        """
+        self.fake_udp_socket_manager.tracker_cache.set_connection_id((None, ("192.168.1.1", 1234)), 126, time.time())
+        self.fake_udp_socket_manager.tracker_cache.set_address("192.168.1.1", "192.168.1.1", time.time())
+        self.session = UdpTrackerSession("localhost", ("192.168.1.1", 1234), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+        self.session.infohash_list = [b"test"]
+        self.fake_udp_socket_manager.response = struct.pack("!iiiii", 2, self.session.transaction_id, 0, 1, 2)
+
+        response = await self.session.connect_to_tracker()
+
+        self.assertEqual(1, len(self.fake_udp_socket_manager.sent))
+        self.assertEqual((126, 2), struct.unpack_from("!qi", self.fake_udp_socket_manager.sent[0]))
+        self.assertEqual(0, response.torrent_health_list[0].seeders)
+
+    async def test_udpsession_connect_stores_id(self) -> None:
+        """
+        Test if the connection ID that a tracker gives is stored for later sessions.
+        """
+        self.session = UdpTrackerSession("localhost", ("192.168.1.1", 1234), "/announce", 0, None,
+                                         self.fake_udp_socket_manager)
+        self.fake_udp_socket_manager.response = struct.pack("!iiq", self.session.action,
+                                                            self.session.transaction_id, 126)
+
+        await self.session.connect()
+
+        self.assertEqual(126, self.fake_udp_socket_manager.tracker_cache.get_connection_id(self.session.cache_key,
+                                                                                           time.time()))
+
+    async def test_udpsession_scrape_fail_invalidates(self) -> None:
+        """
+        Test if a cached connection ID is forgotten when the scrape with it fails.
+        """
+        self.fake_udp_socket_manager.tracker_cache.set_connection_id((None, ("192.168.1.1", 1234)), 126, time.time())
+        self.fake_udp_socket_manager.tracker_cache.set_address("192.168.1.1", "192.168.1.1", time.time())
+        self.session = UdpTrackerSession("localhost", ("192.168.1.1", 1234), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+        self.session.infohash_list = [b"test"]
+        self.fake_udp_socket_manager.response = struct.pack("!ii5s", 3, self.session.transaction_id, b"error")
+
+        with self.assertRaises(ValueError):
+            await self.session.connect_to_tracker()
+
+        self.assertIsNone(self.fake_udp_socket_manager.tracker_cache.get_connection_id(self.session.cache_key,
+                                                                                       time.time()))
+
+    async def test_udpsession_cached_rejected_reconnect(self) -> None:
+        """
+        Test if a UDP session connects again once if the tracker rejects a cached connection ID.
+        """
+        self.fake_udp_socket_manager.tracker_cache.set_connection_id((None, ("192.168.1.1", 1234)), 126, time.time())
+        self.fake_udp_socket_manager.tracker_cache.set_address("192.168.1.1", "192.168.1.1", time.time())
+        self.session = UdpTrackerSession("localhost", ("192.168.1.1", 1234), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+        self.session.infohash_list = [b"test"]
+        responses = [lambda tid: struct.pack("!ii5s", 3, tid, b"error"),
+                     lambda tid: struct.pack("!iiq", 0, tid, 127),
+                     lambda tid: struct.pack("!iiiii", 2, tid, 0, 1, 2)]
+
+        def send_request(data: bytes, tracker_session: UdpTrackerSession) -> Future:
+            self.fake_udp_socket_manager.sent.append(data)
+            return succeed(responses.pop(0)(tracker_session.transaction_id))
+        self.fake_udp_socket_manager.send_request = send_request
+
+        response = await self.session.connect_to_tracker()
+
+        self.assertEqual([126, 0x41727101980, 127],
+                         [struct.unpack_from("!q", data)[0] for data in self.fake_udp_socket_manager.sent])
+        self.assertEqual(2, response.torrent_health_list[0].leechers)
+        self.assertEqual(127, self.fake_udp_socket_manager.tracker_cache.get_connection_id(self.session.cache_key,
+                                                                                           time.time()))
+
+    async def test_udpsession_resolve_cached(self) -> None:
+        """
+        Test if a UDP session does not resolve a recently resolved host name again.
+        """
+        self.fake_udp_socket_manager.tracker_cache.set_address("tracker.example", "1.2.3.4", time.time())
+        self.session = UdpTrackerSession("localhost", ("tracker.example", 1234), "/announce", 5, None,
+                                         self.fake_udp_socket_manager)
+
+        with patch("tribler.core.torrent_checker.torrentchecker_session.get_event_loop") as get_event_loop:
+            await self.session.resolve()
+
+        get_event_loop.assert_not_called()
+        self.assertEqual("1.2.3.4", self.session.ip_address)
+
     async def test_http_unprocessed_infohashes(self) -> None:
         """
         Test if a HTTP session that receives infohashes leads to a finished scrape.
@@ -391,11 +496,11 @@ class TestTrackerSession(TestBase):
 
     async def test_connect_to_tracker_bep33(self) -> None:
         """
-        Test the metainfo lookup of the BEP33 DHT session.
+        Test if the DHT session looks up the health using BEP33 by default.
         """
         infohash_health = HealthInfo(b"a" * 20, seeders=1, leechers=2)
-        mock_dlmgr = Mock(dht_health_manager=Mock(get_health=Mock(return_value=succeed([infohash_health]))))
-        self.session = FakeBep33DHTSession(mock_dlmgr, 10)
+        mock_dlmgr = Mock(dht_health_manager=Mock(get_health=Mock(return_value=succeed(infohash_health))))
+        self.session = FakeDHTSession(mock_dlmgr, 10)
         self.session.add_infohash(b"a" * 20)
 
         response = await self.session.connect_to_tracker()
@@ -404,3 +509,139 @@ class TestTrackerSession(TestBase):
         self.assertEqual(1, len(response.torrent_health_list))
         self.assertEqual(2, response.torrent_health_list[0].leechers)
         self.assertEqual(1, response.torrent_health_list[0].seeders)
+        self.assertTrue(response.torrent_health_list[0].self_checked)
+        mock_dlmgr.get_metainfo.assert_not_called()
+
+    async def test_connect_to_tracker_bep33_concurrent(self) -> None:
+        """
+        Test if the DHT session looks up the health of all infohashes at the same time.
+        """
+        lookups = {b"a" * 20: Future(), b"b" * 20: Future()}
+        mock_dlmgr = Mock(dht_health_manager=Mock(get_health=Mock(side_effect=lambda infohash, **_: lookups[infohash])))
+        self.session = FakeDHTSession(mock_dlmgr, 10)
+        self.session.add_infohash(b"a" * 20)
+        self.session.add_infohash(b"b" * 20)
+
+        task = ensure_future(self.session.connect_to_tracker())
+        await sleep(0)
+        self.assertEqual(2, mock_dlmgr.dht_health_manager.get_health.call_count)
+        lookups[b"b" * 20].set_result(HealthInfo(b"b" * 20, seeders=1))
+        lookups[b"a" * 20].set_exception(TimeoutError())
+        response = await task
+
+        self.assertEqual([b"b" * 20], [health.infohash for health in response.torrent_health_list])
+
+    async def test_connect_to_tracker_bep33_unavailable(self) -> None:
+        """
+        Test if the DHT session fails without a DHT health manager.
+        """
+        self.session = FakeDHTSession(Mock(dht_health_manager=None), 10)
+        self.session.add_infohash(b"a" * 20)
+
+        with self.assertRaises(ValueError):
+            await self.session.connect_to_tracker()
+
+
+class TestUdpTrackerCache(TestBase):
+    """
+    Tests for the UdpTrackerCache class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new cache.
+        """
+        super().setUp()
+        self.cache = UdpTrackerCache(connection_id_lifetime=60, address_lifetime=300)
+
+    def test_connection_id_valid(self) -> None:
+        """
+        Test if a connection ID can be retrieved during its lifetime.
+        """
+        self.cache.set_connection_id((None, ("localhost", 1234)), 42, 100)
+
+        self.assertEqual(42, self.cache.get_connection_id((None, ("localhost", 1234)), 159))
+        self.assertIsNone(self.cache.get_connection_id((("127.0.0.1", 1080), ("localhost", 1234)), 159))
+
+    def test_connection_id_expired(self) -> None:
+        """
+        Test if a connection ID can no longer be retrieved after its lifetime.
+        """
+        self.cache.set_connection_id((None, ("localhost", 1234)), 42, 100)
+
+        self.assertIsNone(self.cache.get_connection_id((None, ("localhost", 1234)), 160))
+        self.assertEqual({}, self.cache.connection_ids)
+
+    def test_connection_id_invalidate(self) -> None:
+        """
+        Test if an invalidated connection ID can no longer be retrieved.
+        """
+        self.cache.set_connection_id((None, ("localhost", 1234)), 42, 100)
+
+        self.cache.invalidate((None, ("localhost", 1234)))
+
+        self.assertIsNone(self.cache.get_connection_id((None, ("localhost", 1234)), 100))
+
+    def test_address(self) -> None:
+        """
+        Test if a resolved address can be retrieved during its lifetime only.
+        """
+        self.cache.set_address("localhost", "127.0.0.1", 100)
+
+        self.assertEqual("127.0.0.1", self.cache.get_address("localhost", 399))
+        self.assertIsNone(self.cache.get_address("localhost", 400))
+
+
+class TestHttpClientPool(TestBase):
+    """
+    Tests for the HttpClientPool class.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a new pool.
+        """
+        super().setUp()
+        self.pool = HttpClientPool(idle_timeout=300)
+
+    async def tearDown(self) -> None:
+        """
+        Close the clients of the pool.
+        """
+        await self.pool.close()
+        await super().tearDown()
+
+    async def test_get_reuse(self) -> None:
+        """
+        Test if the same client is given out for the same proxy.
+        """
+        self.assertIs(self.pool.get(None), self.pool.get(None))
+
+    async def test_get_proxies(self) -> None:
+        """
+        Test if different proxies get different clients.
+        """
+        self.assertIsNot(self.pool.get(None), self.pool.get(("127.0.0.1", 1080)))
+
+    async def test_get_closed(self) -> None:
+        """
+        Test if a closed client is replaced.
+        """
+        client = self.pool.get(None)
+        await client.close()
+
+        self.assertIsNot(client, self.pool.get(None))
+
+    async def test_evict_idle(self) -> None:
+        """
+        Test if only clients that have not been used for a while are closed.
+        """
+        idle = self.pool.get(None)
+        used = self.pool.get(("127.0.0.1", 1080))
+        self.pool.last_used[None] -= 301
+
+        await self.pool.evict_idle()
+
+        self.assertTrue(idle.closed)
+        self.assertFalse(used.closed)
+        self.assertEqual([("127.0.0.1", 1080)], list(self.pool.clients))
@@ -61,6 +61,7 @@ class DatabaseConfig(TypedDict):
     """
 
     enabled: bool
+    wal_mode: bool
 
 
 class VersioningConfig(TypedDict):
@@ -124,6 +125,7 @@ class TorrentCheckerConfig(TypedDict):
     """
 
     enabled: bool
+    checks_per_second: float
 
 
 class TunnelCommunityConfig(TypedDict):
@@ -188,7 +190,7 @@ DEFAULT_CONFIG = {
     "statistics": False,
 
     "content_discovery_community": ContentDiscoveryCommunityConfig(enabled=True),
-    "database": DatabaseConfig(enabled=True),
+    "database": DatabaseConfig(enabled=True, wal_mode=True),
     "dht_discovery": DHTDiscoveryCommunityConfig(enabled=True),
     "knowledge_community": KnowledgeCommunityConfig(enabled=True),
     "libtorrent": LibtorrentConfig(
@@ -218,7 +220,7 @@ DEFAULT_CONFIG = {
             add_download_to_channel=False)
         ),
     "rendezvous": RendezvousConfig(enabled=True),
-    "torrent_checker": TorrentCheckerConfig(enabled=True),
+    "torrent_checker": TorrentCheckerConfig(enabled=True, checks_per_second=1.0),
     "tunnel_community": TunnelCommunityConfig(enabled=True, min_circuits=3, max_circuits=8),
     "user_activity": UserActivityConfig(enabled=True, max_query_history=500, health_check_interval=5.0),
     "versioning": VersioningConfig(enabled=True),
@@ -83,6 +83,7 @@ export interface Settings {
     },
     torrent_checker: {
         enabled: boolean;
+        checks_per_second: number;
     },
     tunnel_community: {
         enabled: boolean;
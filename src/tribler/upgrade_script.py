@@ -18,6 +18,8 @@ from typing import TYPE_CHECKING
 
 from configobj import ConfigObj
 
+from tribler.core.database.ranks import tokenize_title
+
 if TYPE_CHECKING:
     from tribler.tribler_config import TriblerConfigManager
 
@@ -105,7 +107,9 @@ def _inject_7_14_tables(src_db: str, dst_db: str) -> None:
     src_con.close()
 
     from pony.orm import db_session
+
     dst_con = sqlite3.connect(os.path.abspath(dst_db))
+    dst_con.create_function("title_tokens", 1, tokenize_title, deterministic=True)  # Used by the metadata triggers
     with db_session:
         for line in insert_script:
             try: